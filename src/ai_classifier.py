@@ -1,14 +1,145 @@
 import openai
 import os
-import json
 import asyncio
 import re
+import time
+import inspect
+from collections import deque
 from datetime import datetime
 import pytz
 
+from classification_cache import ClassificationCache, is_cache_enabled
+from response_parser import StreamingResponseParser
+from schedule_filter import FALSE_POSITIVE_PATTERNS
+from rule_based_extractor import RuleBasedExtractor, is_fastpath_enabled
+
+# 토큰 수 측정은 선택 사항 (tiktoken 설치 시 정확한 값 사용)
+try:
+    import tiktoken
+    TOKEN_ENCODING = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    TOKEN_ENCODING = None
+
+# OpenAI 호출 설정
+OPENAI_MODEL = "gpt-3.5-turbo"
+RESPONSE_MAX_TOKENS = 2500
+OPENAI_MAX_RETRIES = 3
+
+# 토큰 예산: 모델 컨텍스트 길이, 응답 항목당 고정 토큰 (JSON 키/분류 이유 등, 내용 반복은 별도)
+OPENAI_CONTEXT_TOKENS = 16385
+RESPONSE_TOKENS_PER_MESSAGE = 120
+
+# 프롬프트/검증 기준을 바꾸면 올려서 이전 캐시를 무효화
+PROMPT_VERSION = "precision-v1"
+
+# 캐시에 저장하지 않고 현재 메시지에서 다시 채우는 식별 필드
+MESSAGE_IDENTITY_FIELDS = ('message_id', 'content', 'author', 'channel', 'created_at')
+SYSTEM_PROMPT = "당신은 정밀한 일정 분류 전문가입니다. 확신도 92% 이상인 명확한 일정만 분류하세요."
+
+def get_int_env(name, default):
+    """정수 환경변수 읽기 (없거나 잘못되면 기본값)"""
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+def is_streaming_enabled():
+    """응답을 스트리밍으로 받아 항목 단위로 처리할지 여부 (OPENAI_STREAM, 기본 true)"""
+    return os.getenv('OPENAI_STREAM', 'true').lower() == 'true'
+
+def estimate_tokens(text):
+    """토큰 수 추정 (tiktoken이 있으면 정확히, 없으면 영문 4자/한글 1자당 1토큰으로 근사)"""
+    if TOKEN_ENCODING is not None:
+        return len(TOKEN_ENCODING.encode(text))
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + 1
+
+class TokenBucketRateLimiter:
+    """분당 요청 수(RPM)와 분당 토큰 수(TPM)를 함께 지키는 토큰 버킷"""
+    
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_requests = float(requests_per_minute)
+        self.available_tokens = float(tokens_per_minute)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    def refill(self):
+        """지난 시간만큼 버킷 채우기 (최대 1분치)"""
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        self.available_requests = min(self.requests_per_minute, self.available_requests + elapsed * self.requests_per_minute / 60)
+        self.available_tokens = min(self.tokens_per_minute, self.available_tokens + elapsed * self.tokens_per_minute / 60)
+    
+    async def acquire(self, tokens):
+        """요청 1회 + tokens개를 쓸 수 있을 때까지 대기 후 차감"""
+        # 한 요청이 분당 한도보다 크면 한도만큼만 기다림 (무한 대기 방지)
+        tokens = min(tokens, self.tokens_per_minute)
+        
+        async with self.lock:
+            while True:
+                self.refill()
+                if self.available_requests >= 1 and self.available_tokens >= tokens:
+                    self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+                
+                request_wait = max(0, 1 - self.available_requests) * 60 / self.requests_per_minute
+                token_wait = max(0, tokens - self.available_tokens) * 60 / self.tokens_per_minute
+                await asyncio.sleep(max(request_wait, token_wait, 0.01))
+
+class BatchPacker:
+    """토큰 예산에 맞춰 메시지를 배치로 채우는 누적기
+
+    요청 한 번에 (시스템 프롬프트 + 지시문 + 메시지들)이 프롬프트 예산을,
+    예상 응답(메시지당 고정 오버헤드 + 내용 반복)이 max_tokens를 넘지 않도록
+    최대한 채운다. 예산보다 큰 메시지도 버리지 않고 단독 배치로 보낸다.
+    메시지가 하나씩 도착하는 파이프라인에서도 그대로 쓸 수 있다.
+    """
+    
+    def __init__(self, classifier):
+        self.classifier = classifier
+        self.prompt_budget = get_int_env('OPENAI_PROMPT_TOKEN_BUDGET', OPENAI_CONTEXT_TOKENS - RESPONSE_MAX_TOKENS)
+        self.header_tokens = estimate_tokens(SYSTEM_PROMPT + classifier.create_prompt_header())
+        self.reset()
+    
+    def reset(self):
+        """빈 배치로 초기화"""
+        self.current = []
+        self.prompt_tokens = self.header_tokens
+        self.response_tokens = 0
+    
+    def add(self, msg):
+        """메시지 추가 → 예산이 차서 닫힌 이전 배치 (없으면 None)"""
+        entry_tokens = estimate_tokens(self.classifier.format_message_entry(len(self.current), msg))
+        response_tokens = RESPONSE_TOKENS_PER_MESSAGE + estimate_tokens(msg['content'])
+        
+        fits = (self.prompt_tokens + entry_tokens <= self.prompt_budget and
+                self.response_tokens + response_tokens <= RESPONSE_MAX_TOKENS)
+        
+        full_batch = None
+        if self.current and not fits:
+            full_batch = self.flush()
+        
+        if not self.current and (self.header_tokens + entry_tokens > self.prompt_budget or response_tokens > RESPONSE_MAX_TOKENS):
+            print(f"  ⚠️ 토큰 예산보다 큰 메시지 → 단독 배치로 전송: {msg['content'][:30]}...")
+        
+        self.current.append(msg)
+        self.prompt_tokens += entry_tokens
+        self.response_tokens += response_tokens
+        return full_batch
+    
+    def flush(self):
+        """채우던 배치를 닫아서 반환 (비어 있으면 None)"""
+        batch = self.current or None
+        self.reset()
+        return batch
+
 class ScheduleClassifier:
-    def __init__(self):
-        """AI 일정 분류기 초기화"""
+    def __init__(self, on_schedule=None):
+        """AI 일정 분류기 초기화 (on_schedule: 검증된 일정이 나올 때마다 호출, 코루틴 함수도 가능)"""
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OPENAI_API_KEY 환경변수가 설정되지 않았습니다.")
@@ -18,9 +149,13 @@ class ScheduleClassifier:
         
         self.schedules = []
         self.non_schedules = []
+        self.on_schedule = on_schedule
         
-    def create_classification_prompt(self, messages):
-        """메시지 분류를 위한 프롬프트 생성 (정밀 조정 버전)"""
+        # 명확한 일정은 규칙으로 바로 확정 (RULE_FASTPATH)
+        self.fast_path = RuleBasedExtractor() if is_fastpath_enabled() else None
+        
+    def create_prompt_header(self):
+        """모든 배치에 공통으로 들어가는 지시문 (정밀 조정 버전)"""
         
         kst = pytz.timezone('Asia/Seoul')
         now = datetime.now(kst)
@@ -101,133 +236,402 @@ JSON 형식으로 답변:
 **분석할 메시지들**:
 """
         
-        # 메시지 목록 추가
-        for i, msg in enumerate(messages[:10]):
-            context_info = f" [맥락그룹: {msg.get('message_count', 1)}개 메시지]" if msg.get('is_context_grouped', False) else ""
-            
-            # 특수문자 제거하여 JSON 오류 방지
-            content = msg['content'].replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
-            content = ''.join(char for char in content if ord(char) >= 32 or char in '\n\r\t')
-            
-            prompt += f"""
-{i+1}. ID: {msg['id']}
+        return prompt
+    
+    def format_message_entry(self, index, msg):
+        """프롬프트에 들어갈 메시지 한 개 항목"""
+        context_info = f" [맥락그룹: {msg.get('message_count', 1)}개 메시지]" if msg.get('is_context_grouped', False) else ""
+        
+        # 특수문자 제거하여 JSON 오류 방지
+        content = msg['content'].replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
+        content = ''.join(char for char in content if ord(char) >= 32 or char in '\n\r\t')
+        
+        return f"""
+{index+1}. ID: {msg['id']}
    내용: "{content}"
    작성자: {msg['author']}
    채널: {msg['channel']}
    시간: {msg['created_at'].strftime('%Y-%m-%d %H:%M')}
    맥락: {context_info}
 """
+    
+    def create_classification_prompt(self, messages):
+        """메시지 분류를 위한 프롬프트 생성 (지시문 + 배치의 모든 메시지, 잘라내지 않음)"""
+        prompt = self.create_prompt_header()
+        
+        # 메시지 목록 추가
+        for i, msg in enumerate(messages):
+            prompt += self.format_message_entry(i, msg)
         
         return prompt
     
+    def pack_batches(self, messages):
+        """토큰 예산에 맞춰 메시지를 배치로 묶기 (BatchPacker 참고)"""
+        packer = BatchPacker(self)
+        batches = []
+        
+        for msg in messages:
+            full_batch = packer.add(msg)
+            if full_batch:
+                batches.append(full_batch)
+        
+        last_batch = packer.flush()
+        if last_batch:
+            batches.append(last_batch)
+        
+        return batches
+    
+    def validate_schedules(self, schedules):
+        """AI가 일정으로 분류한 항목들의 엄격한 후처리 검증"""
+        validated_schedules = []
+        
+        for schedule in schedules:
+            confidence = schedule.get('confidence', 0)
+            content = schedule.get('content', '').lower()
+            
+            # 확신도 기준 상향: 92% 이상
+            if confidence < 0.92:
+                print(f"    ⚠️ 낮은 확신도로 제외: {confidence:.1%} - {content[:30]}...")
+                continue
+            
+            # 엄격한 후처리 필터링
+            is_false_positive = False
+            for pattern in FALSE_POSITIVE_PATTERNS:
+                if re.search(pattern, content):
+                    print(f"    ⚠️ False Positive 필터로 제외: {pattern} - {content[:30]}...")
+                    is_false_positive = True
+                    break
+            
+            if not is_false_positive:
+                validated_schedules.append(schedule)
+        
+        return validated_schedules
+    
+    async def create_completion(self, prompt, stream=False):
+        """OpenAI 비동기 호출 (레이트 리밋 초과 시 지수 백오프로 재시도)"""
+        for attempt in range(OPENAI_MAX_RETRIES + 1):
+            try:
+                return await openai.ChatCompletion.acreate(
+                    model=OPENAI_MODEL,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.1,  # 낮춰서 더 정확하게
+                    max_tokens=RESPONSE_MAX_TOKENS,
+                    presence_penalty=0,
+                    frequency_penalty=0,
+                    stream=stream
+                )
+            
+            except openai.error.RateLimitError:
+                if attempt == OPENAI_MAX_RETRIES:
+                    raise
+                wait_seconds = 2 ** attempt * 2
+                print(f"  ⏳ 레이트 리밋 - {wait_seconds}초 후 재시도 ({attempt + 1}/{OPENAI_MAX_RETRIES})")
+                await asyncio.sleep(wait_seconds)
+    
+    async def request_completion(self, prompt):
+        """응답 전체를 한 번에 받기"""
+        response = await self.create_completion(prompt)
+        return response.choices[0].message.content.strip()
+    
+    async def stream_completion(self, prompt):
+        """응답을 토큰 조각 단위로 받기 (async generator)"""
+        response = await self.create_completion(prompt, stream=True)
+        async for chunk in response:
+            text = chunk.choices[0].delta.get('content')
+            if text:
+                yield text
+    
+    async def emit_schedule(self, schedule):
+        """검증된 일정을 다음 단계(on_schedule)로 바로 전달 (최종 목록은 merge_results에서 순서대로)"""
+        if self.on_schedule is not None:
+            result = self.on_schedule(schedule)
+            if inspect.isawaitable(result):
+                await result
+    
+    async def record_verdict(self, verdict, item, batch_result):
+        """분류 결과 항목 하나를 배치 결과에 넣기 (AI 응답, 캐시 적중, 규칙 확정이 같은 경로를 씀)
+
+        일정은 on_schedule로 바로 흘려보내고, 최종 목록은 모든 배치가 끝난 뒤
+        merge_results가 배치 순서대로 만든다 (배치 완료 순서와 무관한 결정적 결과).
+        """
+        validated_schedules, non_schedules, rejected_schedules = batch_result
+        {'schedule': validated_schedules, 'non_schedule': non_schedules,
+         'rejected': rejected_schedules}[verdict].append(item)
+        
+        if verdict == 'schedule':
+            await self.emit_schedule(item)
+    
+    def merge_results(self, batch_results):
+        """배치별 결과를 배치 순서대로 최종 목록에 합치기
+
+        검증에서 제외된 일정(rejected)도 최종 결과는 일정 아님이므로 non_schedules에 넣는다.
+        그래야 동기화 모드가 수정/재게시로 일정이 아니게 된 메시지의 이벤트를 지울 수 있다.
+        """
+        for validated_schedules, non_schedules, rejected_schedules in batch_results:
+            self.schedules.extend(validated_schedules)
+            self.non_schedules.extend(non_schedules)
+            self.non_schedules.extend(rejected_schedules)
+    
+    async def handle_response_item(self, key, item, batch_result, messages_by_id):
+        """파싱된 응답 항목 하나를 검증해서 즉시 결과에 반영"""
+        if key == 'schedules':
+            # 엄격한 후처리 검증 (항목 단위, AI가 돌려준 내용 기준)
+            verdict = 'schedule' if self.validate_schedules([item]) else 'rejected'
+        elif key == 'non_schedules':
+            verdict = 'non_schedule'
+        else:
+            return
+        
+        # 식별 정보는 캐시 적중과 똑같이 배치의 원본 메시지에서 채움
+        msg = messages_by_id.get(str(item.get('message_id')))
+        if msg is not None:
+            item = {**item, **self.message_identity(msg)}
+        await self.record_verdict(verdict, item, batch_result)
+    
+    async def classify_batch(self, batch_num, total_batches, batch_messages, semaphore, rate_limiter):
+        """배치 하나 분류 → (검증된 일정들, 일정 아닌 것들, 검증에서 제외된 일정들)
+
+        응답 항목은 도착하는 대로 하나씩 파싱/검증해서 배치 결과에 넣고, 일정은 바로 on_schedule로 보낸다.
+        잘못된 항목이나 중간에 끊긴 응답은 그 부분만 잃고, 이미 처리한 항목은 유지된다.
+        """
+        batch_result = ([], [], [])
+        parser = StreamingResponseParser()
+        messages_by_id = {str(msg['id']): msg for msg in batch_messages}
+        
+        try:
+            prompt = self.create_classification_prompt(batch_messages)
+            
+            async with semaphore:
+                # 요청 토큰 = 프롬프트 + 최대 응답 (OpenAI TPM 계산 방식)
+                await rate_limiter.acquire(estimate_tokens(SYSTEM_PROMPT + prompt) + RESPONSE_MAX_TOKENS)
+                
+                try:
+                    if is_streaming_enabled():
+                        async for text in self.stream_completion(prompt):
+                            for key, item in parser.feed(text):
+                                await self.handle_response_item(key, item, batch_result, messages_by_id)
+                    else:
+                        response_text = await self.request_completion(prompt)
+                        for key, item in parser.feed(response_text):
+                            await self.handle_response_item(key, item, batch_result, messages_by_id)
+                except Exception as api_error:
+                    print(f"  ❌ 배치 {batch_num + 1}/{total_batches} OpenAI API 호출 오류: {api_error}")
+                    return batch_result
+            
+            validated_schedules, non_schedules, _ = batch_result
+            error_info = f", 파싱 실패 {parser.errors}개" if parser.errors else ""
+            print(f"  ✅ 배치 {batch_num + 1}/{total_batches}: 검증된 일정 {len(validated_schedules)}개, 일정 아님 {len(non_schedules)}개{error_info}")
+            return batch_result
+            
+        except Exception as e:
+            print(f"  ❌ 배치 {batch_num + 1}/{total_batches} 처리 오류: {e}")
+            return batch_result
+    
+    def create_rate_controls(self):
+        """동시 요청 수 제한(세마포어)과 토큰 버킷 생성"""
+        max_concurrency = get_int_env('OPENAI_MAX_CONCURRENCY', 5)
+        rate_limiter = TokenBucketRateLimiter(
+            requests_per_minute=get_int_env('OPENAI_RPM', 500),
+            tokens_per_minute=get_int_env('OPENAI_TPM', 90000),
+        )
+        print(f"⚡ 동시 요청: 최대 {max_concurrency}개 (분당 {rate_limiter.requests_per_minute}회 / {rate_limiter.tokens_per_minute:,} 토큰 제한)")
+        return asyncio.Semaphore(max_concurrency), rate_limiter
+    
     async def classify_messages(self, messages):
-        """메시지들을 AI로 분류 (정밀 조정 버전)"""
+        """메시지들을 AI로 분류 (동시 요청 + 토큰 버킷 레이트 리밋)"""
         print(f"🤖 AI 분석 시작: {len(messages)}개 메시지")
         
         if not messages:
             print("❌ 분류할 메시지가 없습니다.")
             return
         
-        batch_size = 10
-        total_batches = (len(messages) + batch_size - 1) // batch_size
+        # 규칙으로 확정되는 일정과 캐시 적중은 로컬에서 채우고, 나머지만 API로 보냄
+        cache = ClassificationCache() if is_cache_enabled() else None
+        local_result = ([], [], [])
+        pending_messages = []
         
-        print(f"📊 배치 처리: {total_batches}개 배치 (배치당 {batch_size}개씩)")
+        for msg in messages:
+            if await self.apply_fast_path(msg, local_result):
+                continue
+            cached = cache.get(self.cache_key(msg)) if cache else None
+            if cached is None:
+                pending_messages.append(msg)
+            else:
+                await self.apply_cached_result(msg, *cached, local_result)
+        
+        if self.fast_path:
+            print(self.fast_path.stats_line())
+        if cache:
+            print(f"🗃️  분류 캐시: 적중 {cache.hits}개 → API 요청 대상 {len(pending_messages)}개")
+        
+        # 토큰 예산 기준으로 배치 구성 (고정 개수 대신 요청당 최대한 채움)
+        batches = self.pack_batches(pending_messages)
+        total_batches = len(batches)
+        
+        semaphore, rate_limiter = self.create_rate_controls()
+        
+        average_size = len(pending_messages) / total_batches if total_batches else 0
+        print(f"📊 배치 처리: {total_batches}개 배치 (토큰 예산 기준, 배치당 평균 {average_size:.1f}개)")
         print(f"💰 예상 비용: 약 {total_batches * 6:,}원")
         
-        for batch_num in range(total_batches):
-            start_idx = batch_num * batch_size
-            end_idx = min(start_idx + batch_size, len(messages))
-            batch_messages = messages[start_idx:end_idx]
+        tasks = [
+            self.classify_batch(batch_num, total_batches, batch_messages, semaphore, rate_limiter)
+            for batch_num, batch_messages in enumerate(batches)
+        ]
+        
+        # 일정은 도착하는 대로 on_schedule로 나감 → 여기서는 배치 순서대로 합치고 캐시에 저장
+        results = await asyncio.gather(*tasks)
+        self.merge_results([local_result, *results])
+        
+        if cache:
+            for batch_messages, (validated_schedules, non_schedules, rejected_schedules) in zip(batches, results):
+                self.store_cached_results(cache, batch_messages, validated_schedules, non_schedules, rejected_schedules)
+            self.close_cache(cache)
+        
+        self.print_results()
+    
+    async def classify_stream(self, queue, end_marker=None, flush_seconds=2.0):
+        """큐로 도착하는 메시지를 분류 (파이프라인용)
+
+        토큰 예산이 찬 배치는 바로 요청을 보내고, 입력이 flush_seconds 동안
+        끊기면 채우던 배치도 보낸다. end_marker를 받으면 남은 배치를 보내고
+        모든 요청이 끝날 때까지 기다린다. 실시간 모드처럼 끝나지 않는 입력에서도
+        캐시는 배치마다 저장하고, 끝난 배치 결과는 순서대로 합친 뒤 바로 버린다.
+        """
+        print(f"🤖 AI 분석 시작: 파이프라인 모드 (맥락 그룹이 도착하는 대로 분류)")
+        
+        cache = ClassificationCache() if is_cache_enabled() else None
+        semaphore, rate_limiter = self.create_rate_controls()
+        packer = BatchPacker(self)
+        batch_count = 0
+        received = 0
+        
+        # 도착 순서대로의 결과 자리: 배치 요청(Task) 또는 그 사이에 로컬로 확정된 결과
+        # (앞에서부터 끝난 것은 merge_ready가 합치고 꺼내므로 진행 중인 것만 남음)
+        ordered_results = deque()
+        
+        def local_result():
+            if not ordered_results or isinstance(ordered_results[-1], asyncio.Task):
+                ordered_results.append(([], [], []))
+            return ordered_results[-1]
+        
+        def merge_ready(final=False):
+            while ordered_results:
+                entry = ordered_results[0]
+                if isinstance(entry, asyncio.Task):
+                    # 실패한 배치는 남겨두고 마지막 gather에서 오류를 올림
+                    if not entry.done() or entry.cancelled() or entry.exception() is not None:
+                        return
+                    entry = entry.result()
+                elif len(ordered_results) == 1 and not final:
+                    return  # 아직 결과가 추가될 수 있는 로컬 자리
+                ordered_results.popleft()
+                self.merge_results([entry])
+        
+        async def run_batch(batch_num, batch_messages):
+            result = await self.classify_batch(batch_num, '?', batch_messages, semaphore, rate_limiter)
+            if cache:
+                self.store_cached_results(cache, batch_messages, *result)
+                cache.commit()
+            return result
+        
+        def dispatch(batch_messages):
+            nonlocal batch_count
+            if batch_messages:
+                task = asyncio.create_task(run_batch(batch_count, batch_messages))
+                task.add_done_callback(lambda _: merge_ready())
+                batch_count += 1
+                ordered_results.append(task)
+        
+        while True:
+            try:
+                timeout = flush_seconds if packer.current else None
+                msg = await asyncio.wait_for(queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                # 입력이 잠시 끊김 → 기다리지 말고 채우던 배치 전송
+                dispatch(packer.flush())
+                continue
             
-            print(f"\n📊 배치 {batch_num + 1}/{total_batches}: {len(batch_messages)}개 메시지 분석 중...")
+            if msg is end_marker:
+                break
             
-            try:
-                prompt = self.create_classification_prompt(batch_messages)
-                
-                try:
-                    response = openai.ChatCompletion.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "system", "content": "당신은 정밀한 일정 분류 전문가입니다. 확신도 92% 이상인 명확한 일정만 분류하세요."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.1,  # 낮춰서 더 정확하게
-                        max_tokens=2500,
-                        presence_penalty=0,
-                        frequency_penalty=0
-                    )
-                    
-                    response_text = response.choices[0].message.content.strip()
-                    
-                except Exception as api_error:
-                    print(f"  ❌ OpenAI API 호출 오류: {api_error}")
-                    await asyncio.sleep(2)
-                    continue
-                
-                # JSON 추출 및 정리
-                if "```json" in response_text:
-                    json_start = response_text.find("```json") + 7
-                    json_end = response_text.find("```", json_start)
-                    response_text = response_text[json_start:json_end].strip()
-                
-                # JSON 파싱 오류 방지
-                response_text = ''.join(char for char in response_text if ord(char) >= 32 or char in '\n\r\t')
-                
-                try:
-                    result = json.loads(response_text)
-                except json.JSONDecodeError as json_error:
-                    print(f"  ❌ JSON 파싱 실패: {json_error}")
-                    continue
-                
-                # 엄격한 후처리 검증
-                validated_schedules = []
-                if 'schedules' in result:
-                    for schedule in result['schedules']:
-                        confidence = schedule.get('confidence', 0)
-                        content = schedule.get('content', '').lower()
-                        
-                        # 확신도 기준 상향: 92% 이상
-                        if confidence < 0.92:
-                            print(f"    ⚠️ 낮은 확신도로 제외: {confidence:.1%} - {content[:30]}...")
-                            continue
-                        
-                        # 엄격한 후처리 필터링
-                        false_positive_patterns = [
-                            r'.*끝나고.*드실',        # "합주끝나고 드실 안주랑"
-                            r'.*은\s*합니다$',       # "합주연습은합니다"  
-                            r'.*시간\s*있.*\?',      # "시간 있나요?"
-                            r'.*순서대로',           # "순서대로"
-                            r'.*은\s*\d+시간',       # "서곡은 2시간"
-                            r'.*은\s*\d+분',         # "인터미션은 15분"
-                            r'안주', r'드실', r'먹을',  # 식사 관련
-                        ]
-                        
-                        is_false_positive = False
-                        for pattern in false_positive_patterns:
-                            if re.search(pattern, content):
-                                print(f"    ⚠️ False Positive 필터로 제외: {pattern} - {content[:30]}...")
-                                is_false_positive = True
-                                break
-                        
-                        if not is_false_positive:
-                            validated_schedules.append(schedule)
-                
-                # 검증된 일정만 저장
-                self.schedules.extend(validated_schedules)
-                print(f"  ✅ 검증된 일정: {len(validated_schedules)}개")
-                
-                if 'non_schedules' in result:
-                    self.non_schedules.extend(result['non_schedules'])
-                    print(f"  ❌ 일정 아님: {len(result['non_schedules'])}개")
-                
-                await asyncio.sleep(1.5)
-                
-            except Exception as e:
-                print(f"  ❌ 배치 처리 오류: {e}")
+            received += 1
+            if await self.apply_fast_path(msg, local_result()):
                 continue
+            cached = cache.get(self.cache_key(msg)) if cache else None
+            if cached is not None:
+                await self.apply_cached_result(msg, *cached, local_result())
+            else:
+                dispatch(packer.add(msg))
+        
+        dispatch(packer.flush())
+        await asyncio.gather(*(entry for entry in ordered_results if isinstance(entry, asyncio.Task)))
+        merge_ready(final=True)
+        
+        print(f"📊 배치 처리: {batch_count}개 배치 (입력 {received:,}개" +
+              (f", 규칙 확정 {self.fast_path.extracted}개" if self.fast_path else "") +
+              (f", 캐시 적중 {cache.hits}개)" if cache else ")"))
+        if cache:
+            self.close_cache(cache)
         
         self.print_results()
     
+    async def apply_fast_path(self, msg, batch_result):
+        """규칙으로 확정되는 명확한 일정은 AI 없이 바로 결과에 추가 → 처리 여부"""
+        if self.fast_path is None:
+            return False
+        
+        schedule = self.fast_path.extract(msg)
+        if schedule is None:
+            return False
+        
+        await self.record_verdict('schedule', schedule, batch_result)
+        return True
+    
+    def close_cache(self, cache):
+        """캐시 통계 출력 후 닫기"""
+        stats = cache.stats()
+        cache.close()
+        print(f"\n🗃️  분류 캐시: 적중 {stats['hits']}개 / 미스 {stats['misses']}개 (적중률 {stats['hit_rate']:.1%}), "
+              f"저장 {stats['stores']}개, 정리 {stats['evictions']}개, 보관 {stats['entries']:,}개")
+    
+    @staticmethod
+    def cache_key(msg):
+        """메시지 내용 + 모델 + 프롬프트 버전 캐시 키"""
+        return ClassificationCache.make_key(msg['content'], OPENAI_MODEL, PROMPT_VERSION)
+    
+    @staticmethod
+    def message_identity(msg):
+        """분류 결과에 채울 현재 메시지의 식별 정보 (AI 응답과 같은 형식)"""
+        return {
+            'message_id': str(msg['id']),
+            'content': msg['content'],
+            'author': msg['author'],
+            'channel': msg['channel'],
+            'created_at': msg['created_at'].strftime('%Y-%m-%d %H:%M'),
+        }
+    
+    async def apply_cached_result(self, msg, verdict, payload, batch_result):
+        """캐시된 분류 결과를 현재 메시지 정보로 채워서 AI 응답과 같은 방식으로 결과에 반영"""
+        await self.record_verdict(verdict, {**payload, **self.message_identity(msg)}, batch_result)
+    
+    def store_cached_results(self, cache, batch_messages, validated_schedules, non_schedules, rejected_schedules):
+        """AI 응답 항목을 message_id로 원본 메시지와 맞춰서 캐시에 저장"""
+        messages_by_id = {str(msg['id']): msg for msg in batch_messages}
+        
+        for verdict, items in (('schedule', validated_schedules),
+                               ('non_schedule', non_schedules),
+                               ('rejected', rejected_schedules)):
+            for item in items:
+                msg = messages_by_id.get(str(item.get('message_id')))
+                if msg is None:
+                    continue  # AI가 ID를 바꿔 쓴 항목은 캐시하지 않음
+                payload = {key: value for key, value in item.items() if key not in MESSAGE_IDENTITY_FIELDS}
+                cache.put(self.cache_key(msg), verdict, payload)
+    
     def print_results(self):
         """분석 결과 출력"""
         total_messages = len(self.schedules) + len(self.non_schedules)
@@ -0,0 +1,157 @@
+# src/batch_client.py
+import discord
+import os
+import asyncio
+import time
+from abc import ABC, abstractmethod
+
+import yarl
+
+def is_rest_only_enabled():
+    """배치 수집을 게이트웨이 접속 없이 REST 로그인만으로 실행할지 여부 (BATCH_REST_ONLY, 기본 true)"""
+    return os.getenv('BATCH_REST_ONLY', 'true').lower() == 'true'
+
+def get_api_base():
+    """Discord REST API 기본 URL 재지정 (DISCORD_API_BASE, 예: 로컬 가짜 서버 http://127.0.0.1:8765/api/v10)"""
+    return os.getenv('DISCORD_API_BASE', '').rstrip('/')
+
+def get_gateway_url():
+    """Discord 게이트웨이 주소 재지정 (DISCORD_GATEWAY_URL, 예: ws://127.0.0.1:8765/gateway)"""
+    return os.getenv('DISCORD_GATEWAY_URL', '')
+
+def apply_api_base():
+    """DISCORD_API_BASE / DISCORD_GATEWAY_URL이 있으면 discord.py의 REST 요청과 게이트웨이 접속을 그 주소로 보냄"""
+    api_base = get_api_base()
+    if api_base and discord.http.Route.BASE != api_base:
+        discord.http.Route.BASE = api_base
+        print(f'🧪 Discord API 주소 재지정: {api_base}')
+
+    gateway_url = get_gateway_url()
+    if gateway_url and str(discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY) != gateway_url:
+        discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(gateway_url)
+        print(f'🧪 Discord 게이트웨이 주소 재지정: {gateway_url}')
+
+def batch_client_options():
+    """배치 수집용 discord.Client 옵션 (히스토리는 REST로만 읽으므로 게이트웨이 상태를 최소로)"""
+    intents = discord.Intents.none()
+    intents.guilds = True           # 서버/채널 목록 (게이트웨이 모드)
+    intents.message_content = True  # 메시지 내용 읽기 권한
+
+    return {
+        'intents': intents,
+        'member_cache_flags': discord.MemberCacheFlags.none(),  # 멤버 캐시 없음 (봇 자신만)
+        'chunk_guilds_at_startup': False,                        # READY 후 멤버 청킹 대기 없음
+        'max_messages': None,                                    # 메시지 캐시 없음
+    }
+
+class StartupTimer:
+    """로그인 시작부터 첫 히스토리 요청까지의 단계별 경과 시간"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks = []
+        self.reported = False
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - self.started))
+
+    def report(self, mode):
+        self.reported = True
+        steps = ' → '.join(f'{label} {elapsed:.2f}초' for label, elapsed in self.marks)
+        print(f'⏱️  시작 지연 ({mode}): {steps}')
+
+class BatchClient(discord.Client, ABC):
+    """배치 수집기 공통 클라이언트 (최소 인텐트, 멤버/메시지 캐시 없음)
+
+    REST 전용(기본)이면 로그인 후 게이트웨이 없이 바로 run_batch를 실행하고,
+    BATCH_REST_ONLY=false면 기존처럼 게이트웨이 READY 후 on_ready에서 실행한다.
+    하위 클래스는 run_batch에 수집 작업을 구현한다.
+    """
+
+    def __init__(self, **options):
+        apply_api_base()
+        super().__init__(**{**batch_client_options(), **options})
+        self.startup = StartupTimer()
+
+    @abstractmethod
+    async def run_batch(self):
+        """로그인 후 실행할 수집 작업 (구현하지 않은 하위 클래스는 생성 시점에 TypeError)"""
+
+    async def on_ready(self):
+        """게이트웨이 모드: 봇이 로그인한 후 수집 시작"""
+        self.startup.mark('게이트웨이 READY')
+        print(f'🎉 봇 로그인 성공: {self.user}')
+
+        try:
+            await self.run_batch()
+        except Exception as e:
+            print(f"❌ 메시지 수집 중 오류: {e}")
+        finally:
+            # 수집 완료 후 봇 안전 종료
+            print("🔌 봇 연결을 종료합니다...")
+            await self.close()
+
+    async def start_batch(self, token):
+        """배치 실행 (REST 전용이면 게이트웨이 핸드셰이크/READY 대기 없이 바로 수집)"""
+        self.startup = StartupTimer()
+
+        if not is_rest_only_enabled():
+            await self.start(token)
+            return
+
+        await self.login(token)
+        self.startup.mark('REST 로그인')
+        print(f'🎉 봇 로그인 성공 (REST 전용): {self.user}')
+
+        try:
+            await self.run_batch()
+        except Exception as e:
+            print(f"❌ 메시지 수집 중 오류: {e}")
+        finally:
+            print("🔌 봇 연결을 종료합니다...")
+            await self.close()
+
+    async def close_batch(self):
+        """안전한 연결 종료 (게이트웨이를 썼을 때만 웹소켓 정리 대기)"""
+        try:
+            if not self.is_closed():
+                await self.close()
+            print("🔌 Discord 연결이 안전하게 종료되었습니다.")
+        except Exception as close_error:
+            print(f"⚠️ 연결 종료 중 오류 (무시 가능): {close_error}")
+
+        if not is_rest_only_enabled():
+            await asyncio.sleep(1)
+
+async def fetch_readable_channels(client, guild):
+    """REST로 서버 역할/채널/봇 멤버를 받아서 히스토리를 읽을 수 있는 텍스트 채널 목록"""
+    guild = await client.fetch_guild(guild.id, with_counts=False)
+    channels, me = await asyncio.gather(guild.fetch_channels(), guild.fetch_member(client.user.id))
+
+    text_channels = sorted(
+        (channel for channel in channels if isinstance(channel, discord.TextChannel)),
+        key=lambda channel: (channel.position, channel.id),
+    )
+    return guild, [ch for ch in text_channels if ch.permissions_for(me).read_message_history]
+
+async def list_readable_channels(client):
+    """서버별 히스토리를 읽을 수 있는 텍스트 채널 [(guild, [channel, ...])]
+
+    게이트웨이 READY를 받았으면 캐시에서, REST 전용이면 API로 조회한다.
+    """
+    if client.is_ready():
+        guild_channels = [
+            (guild, [ch for ch in guild.text_channels if ch.permissions_for(guild.me).read_message_history])
+            for guild in client.guilds
+        ]
+    else:
+        guilds = [guild async for guild in client.fetch_guilds(limit=None)]
+        guild_channels = await asyncio.gather(*(fetch_readable_channels(client, guild) for guild in guilds))
+
+    # 첫 히스토리 요청 직전까지의 시작 지연 (실행마다 한 번)
+    startup = getattr(client, 'startup', None)
+    if startup is not None and not startup.reported:
+        startup.mark('채널 목록')
+        startup.report('게이트웨이' if client.is_ready() else 'REST 전용')
+
+    return list(guild_channels)
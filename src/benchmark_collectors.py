@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Discord Schedule Bot - 수집기 전체 벤치마크 (가짜 Discord 서버 사용)
+fake_discord_server.py를 별도 프로세스로 띄우고 실제 수집 경로(run_consumers)를 그 서버에 연결해서
+수집 시간, 처리량, CPU 시간, 최대 메모리를 측정 (네트워크/토큰 불필요)
+"""
+
+import asyncio
+import math
+import os
+import resource
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+def find_free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for_port(port, process, timeout=30):
+    """가짜 서버가 요청을 받을 수 있을 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("가짜 Discord 서버가 시작 중에 종료되었습니다.")
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("가짜 Discord 서버 시작 대기 시간 초과")
+
+def start_server(port):
+    """FAKE_DISCORD_* 환경변수를 그대로 넘겨서 가짜 서버 프로세스 시작"""
+    env = {**os.environ, 'FAKE_DISCORD_PORT': str(port), 'FAKE_DISCORD_HOST': '127.0.0.1'}
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_discord_server.py')
+    process = subprocess.Popen([sys.executable, script], env=env)
+    wait_for_port(port, process)
+    return process
+
+def required_days(consumers):
+    """선택한 작업들의 기간을 모두 덮는 가짜 메시지 기간 (키워드/수동 검증은 고정 기간이라 60일로는 부족)"""
+    earliest = min(consumer.start for consumer in consumers)
+    return math.ceil((datetime.now(timezone.utc) - earliest).total_seconds() / 86400) + 1
+
+def stop_server(process):
+    """SIGINT로 종료해서 서버가 요청/429 통계를 출력하게 함"""
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def main():
+    port = find_free_port()
+
+    # 수집기를 가짜 서버에 연결 (실제 아카이브에 가짜 메시지가 쌓이지 않게 기본은 아카이브 끔)
+    os.environ['DISCORD_API_BASE'] = f'http://127.0.0.1:{port}/api/v10'
+    os.environ['DISCORD_GATEWAY_URL'] = f'ws://127.0.0.1:{port}/gateway'
+    os.environ['DISCORD_TOKEN'] = 'fake'
+    os.environ['OFFLINE_MODE'] = 'false'
+    os.environ.setdefault('ARCHIVE_MESSAGES', 'false')
+
+    # 실제 체크포인트를 읽거나 덮어쓰지 않도록 임시 파일 사용 (매번 전체 수집)
+    checkpoint_dir = tempfile.TemporaryDirectory(prefix='benchmark_checkpoint_')
+    os.environ['CHECKPOINT_PATH'] = os.path.join(checkpoint_dir.name, 'collection_checkpoint.json')
+
+    # 환경변수를 정한 뒤에 수집기 import
+    from collection_engine import run_consumers
+    from collection_main import JOB_FACTORIES, get_collection_jobs
+
+    consumers = [JOB_FACTORIES[job]() for job in get_collection_jobs()]
+    if not consumers:
+        print("❌ 실행할 수집 작업이 없습니다 (COLLECTION_JOBS 확인)")
+        checkpoint_dir.cleanup()
+        return
+
+    # 가짜 메시지가 모든 작업 기간에 흩어지도록 기간을 넓힘 (더 길게 지정했으면 그대로)
+    fake_days = os.getenv('FAKE_DISCORD_DAYS', '60')
+    days = max(int(fake_days) if fake_days.isdigit() else 60, required_days(consumers))
+    os.environ['FAKE_DISCORD_DAYS'] = str(days)
+    print(f"🧪 가짜 메시지 기간: 최근 {days}일 (체크포인트: {os.environ['CHECKPOINT_PATH']})")
+
+    process = start_server(port)
+    try:
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        asyncio.run(run_consumers(consumers))
+        elapsed = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+    finally:
+        stop_server(process)
+        checkpoint_dir.cleanup()
+
+    # 소비자 기간이 겹치므로 가장 많이 받은 소비자 기준 처리량
+    collected = max((consumer.received for consumer in consumers), default=0)
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print("=" * 70)
+    print("📈 수집기 벤치마크 결과 (가짜 Discord 서버)")
+    print("=" * 70)
+    print(f"   작업: {', '.join(consumer.name for consumer in consumers)}")
+    print(f"   경과 시간: {elapsed:.2f}초 (CPU {cpu:.2f}초)")
+    if collected:
+        print(f"   수집 메시지: {collected:,}개 ({collected / elapsed:,.0f}개/초)")
+    print(f"   최대 메모리 (RSS): {peak_mb:.1f}MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Discord Schedule Bot - 맥락 묶기 성능 벤치마크
+합성 메시지로 build_context_groups 처리 시간이 메시지 수에 비례하는지 확인
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from context_grouping import build_context_groups, make_context_group
+
+def make_synthetic_messages(count, authors=200, seed=42):
+    """60일 구간에 흩어진 합성 메시지 생성"""
+    rng = random.Random(seed)
+    start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    window_seconds = 60 * 24 * 3600
+
+    messages = []
+    for i in range(count):
+        messages.append({
+            'id': 1_000_000 + i,
+            'content': f'오늘 {rng.randint(1, 12)}시 합주',
+            'author': f'user{rng.randrange(authors)}',
+            'channel': '#general',
+            'created_at': start + timedelta(seconds=rng.randrange(window_seconds)),
+        })
+    return messages
+
+def legacy_group_context_messages(messages):
+    """비교용: 기존 이중 루프 구현 (O(n²))"""
+    all_messages_sorted = sorted(messages, key=lambda x: x['created_at'])
+    context_groups = []
+    processed_message_ids = set()
+
+    for msg in all_messages_sorted:
+        if msg['id'] in processed_message_ids:
+            continue
+        context_messages = [msg]
+        processed_message_ids.add(msg['id'])
+        for other_msg in all_messages_sorted:
+            if (other_msg['author'] == msg['author'] and
+                other_msg['id'] not in processed_message_ids and
+                (other_msg['created_at'] - msg['created_at']).total_seconds() <= 300):
+                context_messages.append(other_msg)
+                processed_message_ids.add(other_msg['id'])
+        context_groups.append(make_context_group(context_messages))
+
+    return context_groups
+
+def time_call(func, messages):
+    """함수 실행 시간(초)과 결과 반환"""
+    start = time.perf_counter()
+    result = func(messages)
+    return time.perf_counter() - start, result
+
+def main():
+    # BENCH_MAX_MESSAGES로 최대 크기 조절 (기본 100만)
+    max_messages = int(os.getenv('BENCH_MAX_MESSAGES', '1000000'))
+    legacy_limit = 5000  # 기존 구현은 이 이상에서 너무 느림
+
+    sizes = [n for n in (1_000, 5_000, 10_000, 100_000, 1_000_000) if n <= max_messages]
+
+    print("=" * 70)
+    print("🔗 맥락 묶기 벤치마크 (build_context_groups)")
+    print("=" * 70)
+    print(f"{'메시지 수':>12s} {'그룹 수':>10s} {'소요(초)':>10s} {'µs/메시지':>10s} {'기존(초)':>10s}")
+
+    for size in sizes:
+        messages = make_synthetic_messages(size)
+        elapsed, groups = time_call(build_context_groups, messages)
+
+        legacy_text = '-'
+        if size <= legacy_limit:
+            legacy_elapsed, legacy_groups = time_call(legacy_group_context_messages, messages)
+            if legacy_groups != groups:
+                print("❌ 기존 구현과 결과가 다릅니다!")
+                sys.exit(1)
+            legacy_text = f'{legacy_elapsed:.3f}'
+
+        per_message = elapsed / size * 1_000_000
+        print(f"{size:>12,d} {len(groups):>10,d} {elapsed:>10.3f} {per_message:>10.2f} {legacy_text:>10s}")
+
+    print("\n💡 µs/메시지가 크기와 무관하게 거의 일정하면 선형 확장입니다 (정렬 비용 제외).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Discord Schedule Bot - 히스토리 페이저 성능 벤치마크
+합성 API 응답으로 raw 페이저(JSON → MessageRecord)와 channel.history()(discord.Message 생성)의
+결과, CPU 시간, 최대 메모리 비교 (Discord 접속 없음)
+"""
+
+import asyncio
+import bisect
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import discord
+
+from raw_history import HISTORY_PAGE_SIZE, HistoryPager
+
+GUILD_ID = 800000000000000000
+CHANNEL_ID = 800000000000000001
+START_ID = 1100000000000000000  # 2023년 전후 스노우플레이크
+
+WORDS = ['내일', '오후', '3시', '합주', '리허설', '공연', '연습실', 'ㅋㅋㅋ', '저녁', '먹고', '가요',
+         '다음주', '금요일', '세팅', '확인', '부탁드립니다', '넵', '감사합니다', '곡', '순서']
+
+def make_user(rng, index, bot=False):
+    """API user 객체"""
+    return {
+        'id': str(700000000000000000 + index),
+        'username': f'user{index}',
+        'global_name': f'사용자{index}',
+        'discriminator': '0' if index % 4 else f'{1000 + index % 9000}',
+        'avatar': f'{rng.getrandbits(128):032x}',
+        'public_flags': 0,
+        'bot': bot,
+    }
+
+def make_payloads(count, authors=60, seed=42):
+    """GET /channels/{id}/messages 응답과 같은 모양의 메시지 JSON (오래된 순)"""
+    rng = random.Random(seed)
+    users = [make_user(rng, i, bot=(i % 20 == 0)) for i in range(authors)]
+
+    payloads = []
+    message_id = START_ID
+    for _ in range(count):
+        message_id += rng.randint(1, 1 << 30)
+        author = rng.choice(users)
+        payload = {
+            'id': str(message_id),
+            'type': 0,
+            'channel_id': str(CHANNEL_ID),
+            'content': ' '.join(rng.choices(WORDS, k=rng.randint(1, 12))),
+            'author': author,
+            'member': {
+                'roles': [str(900000000000000000 + rng.randrange(5))],
+                'joined_at': '2024-03-01T12:00:00.000000+00:00',
+                'deaf': False,
+                'mute': False,
+                'flags': 0,
+            },
+            'timestamp': '2025-06-01T12:00:00.000000+00:00',
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [rng.choice(users)] if rng.random() < 0.1 else [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'pinned': False,
+            'flags': 0,
+        }
+        if rng.random() < 0.05:
+            payload['attachments'].append({
+                'id': str(message_id + 1), 'filename': 'setlist.png', 'size': 123456,
+                'url': 'https://cdn.discordapp.com/attachments/a/b/setlist.png',
+                'proxy_url': 'https://media.discordapp.net/attachments/a/b/setlist.png',
+                'width': 1280, 'height': 720, 'content_type': 'image/png',
+            })
+        if rng.random() < 0.05:
+            payload['embeds'].append({
+                'type': 'link', 'url': 'https://youtu.be/example', 'title': '연습 영상',
+                'description': '합주 녹음', 'thumbnail': {'url': 'https://i.ytimg.com/vi/x/hq.jpg', 'width': 480, 'height': 360},
+            })
+        if rng.random() < 0.1:
+            payload['reactions'] = [{'count': rng.randint(1, 5), 'me': False, 'emoji': {'id': None, 'name': '👍'}}]
+        payloads.append(payload)
+    return payloads
+
+class FakeHistoryHTTP:
+    """logs_from만 흉내 내는 HTTP 클라이언트 (after 기준 다음 limit개를 최신순으로 반환)"""
+
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.ids = [int(payload['id']) for payload in payloads]
+        self.requests = 0
+
+    async def logs_from(self, channel_id, limit, before=None, after=None, around=None):
+        self.requests += 1
+        start = bisect.bisect_right(self.ids, int(after or 0))
+        return self.payloads[start:start + limit][::-1]
+
+def make_channel(fake_http):
+    """discord.py 모델 생성 경로와 같은 ConnectionState 위의 길드/채널 (로그인 없음)"""
+    client = discord.Client(intents=discord.Intents.default())
+    client.http.logs_from = fake_http.logs_from
+    state = client._connection
+    guild = discord.Guild(data={'id': str(GUILD_ID), 'name': '벤치마크 서버'}, state=state)
+    state._add_guild(guild)
+    channel = discord.TextChannel(state=state, guild=guild, data={
+        'id': str(CHANNEL_ID), 'name': 'general', 'type': 0, 'position': 0,
+        'guild_id': str(GUILD_ID), 'permission_overwrites': [],
+    })
+    return client, channel
+
+async def collect(client, channel, raw):
+    """페이저로 전체 히스토리를 받아서 레코드 목록 반환"""
+    pager = HistoryPager(client, channel, after=discord.Object(id=START_ID), raw=raw)
+    records = []
+    async for page in pager.pages():
+        records.extend(page)
+    return records, pager
+
+def measure(client, channel, raw):
+    """CPU 시간(process_time)과 tracemalloc 최대 메모리 측정 (tracemalloc이 느리게 하므로 따로 실행)"""
+    start = time.process_time()
+    records, pager = asyncio.run(collect(client, channel, raw))
+    elapsed = time.process_time() - start
+    del records
+
+    tracemalloc.start()
+    records, pager = asyncio.run(collect(client, channel, raw))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return records, pager, elapsed, peak
+
+def main():
+    # BENCH_MESSAGES로 메시지 수 조절 (기본 10만)
+    count = int(os.getenv('BENCH_MESSAGES', '100000'))
+    payloads = make_payloads(count)
+    fake_http = FakeHistoryHTTP(payloads)
+    client, channel = make_channel(fake_http)
+
+    print("=" * 70)
+    print(f"📥 히스토리 페이저 벤치마크 ({count:,}개 메시지, 페이지 {HISTORY_PAGE_SIZE}개)")
+    print("=" * 70)
+
+    model_records, model_pager, model_elapsed, model_peak = measure(client, channel, raw=False)
+    raw_records, raw_pager, raw_elapsed, raw_peak = measure(client, channel, raw=True)
+
+    def as_tuples(records):
+        return [(r.id, r.content, r.author, r.channel, r.channel_id, r.guild, r.guild_id, r.timestamp) for r in records]
+
+    if as_tuples(raw_records) != as_tuples(model_records) or raw_pager.newest_message_id != model_pager.newest_message_id:
+        print(f"❌ raw 페이저와 channel.history() 결과가 다릅니다 ({len(raw_records):,}개 / {len(model_records):,}개)")
+        sys.exit(1)
+
+    scale = 100_000 / count
+    print(f"   레코드 {len(raw_records):,}개 (봇 제외), 커서 {raw_pager.newest_message_id}")
+    print(f"   channel.history(): CPU {model_elapsed * scale:.3f}초 / 최대 메모리 {model_peak * scale / 1024 / 1024:.1f}MB (10만 개당)")
+    print(f"   raw 페이저:        CPU {raw_elapsed * scale:.3f}초 / 최대 메모리 {raw_peak * scale / 1024 / 1024:.1f}MB (10만 개당)")
+    print(f"   ✅ 결과 일치, CPU {model_elapsed / raw_elapsed:.1f}배, 최대 메모리 {model_peak / raw_peak:.1f}배")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Discord Schedule Bot - 날짜/시간 파서 성능 벤치마크
+합성 일정 표현으로 korean_datetime 엔진과 기존 if/elif 구현의 결과와 처리 시간 비교
+"""
+
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+
+from korean_datetime import KST, resolve_schedule_time
+
+WORDS = ['오늘', '내일', '모레', '낼모래', '다음주', '담주', '월요일', '화욜', '수요', '목요일', '금욜',
+         '토요일', '일요일', '오전', '오후', '저녁', '밤', 'pm', 'am', '합주', '리허설', '공연', '세팅']
+
+def make_synthetic_texts(count, seed=42):
+    """날짜/요일/시간 표현을 무작위로 섞은 합성 텍스트 생성"""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        parts = rng.sample(WORDS, rng.randint(0, 3))
+        if rng.random() < 0.3:
+            parts.append(f'{rng.randint(1, 13)}월 {rng.randint(1, 32)}일')
+        time_kind = rng.randrange(5)
+        if time_kind == 0:
+            parts.append(f'{rng.randint(0, 13)}시 {rng.randint(0, 59)}분')
+        elif time_kind == 1:
+            parts.append(f'{rng.randint(0, 13)}시')
+        elif time_kind == 2:
+            parts.append(f'{rng.randint(0, 23)}:{rng.randint(0, 59):02d}')
+        elif time_kind == 3:
+            parts.append(f'{rng.choice(["오전", "오후"])} {rng.randint(1, 11)}')
+        rng.shuffle(parts)
+        texts.append(' '.join(parts))
+    return texts
+
+def legacy_extract_time(when_text):
+    """비교용: 기존 extract_time_from_text (패턴 순서대로 매번 검색)"""
+    time_patterns = [
+        (r'(\d{1,2})시\s*(\d{1,2})분', 'hour_minute'),
+        (r'(\d{1,2})시', 'hour_only'),
+        (r'(\d{1,2}):(\d{2})', 'colon_format'),
+        (r'오전\s*(\d{1,2})시?', 'morning'),
+        (r'오후\s*(\d{1,2})시?', 'afternoon'),
+    ]
+    for pattern, pattern_type in time_patterns:
+        match = re.search(pattern, when_text)
+        if match:
+            if pattern_type in ('hour_minute', 'colon_format'):
+                return int(match.group(1)), int(match.group(2))
+            if pattern_type == 'morning':
+                return int(match.group(1)), 0
+            if pattern_type == 'afternoon':
+                return int(match.group(1)) + 12, 0
+            hour = int(match.group(1))
+            if 1 <= hour <= 12:
+                if any(word in when_text for word in ['오전', 'am']):
+                    pass
+                elif any(word in when_text for word in ['오후', 'pm', '밤', '저녁']):
+                    if hour != 12:
+                        hour += 12
+                elif 6 <= hour <= 12:
+                    if hour != 12:
+                        hour += 12
+            return hour, 0
+    return None, None
+
+def legacy_parse(when_text, base_time):
+    """비교용: 기존 parse_schedule_time (디버그 출력 제외)"""
+    when_text = when_text.lower().strip()
+    target_date = None
+    date_match = re.search(r'(\d{1,2})월\s*(\d{1,2})일', when_text)
+    if date_match:
+        try:
+            target_date = datetime(base_time.year, int(date_match.group(1)), int(date_match.group(2))).date()
+        except ValueError:
+            pass
+    if not target_date:
+        creation_date = base_time.date()
+        if '오늘' in when_text:
+            target_date = creation_date
+        elif '내일' in when_text:
+            target_date = creation_date + timedelta(days=1)
+        elif '모레' in when_text or '낼모래' in when_text:
+            target_date = creation_date + timedelta(days=2)
+        elif '다음주' in when_text or '담주' in when_text:
+            days_until_next_monday = (7 - creation_date.weekday()) % 7
+            if days_until_next_monday == 0:
+                days_until_next_monday = 7
+            target_date = creation_date + timedelta(days=days_until_next_monday)
+        else:
+            weekdays = {
+                '월요': 0, '월욜': 0, '월요일': 0, '화요': 1, '화욜': 1, '화요일': 1,
+                '수요': 2, '수욜': 2, '수요일': 2, '목요': 3, '목욜': 3, '목요일': 3,
+                '금요': 4, '금욜': 4, '금요일': 4, '토요': 5, '토욜': 5, '토요일': 5,
+                '일요': 6, '일욜': 6, '일요일': 6,
+            }
+            found_weekday = None
+            for day_name, day_num in weekdays.items():
+                if day_name in when_text:
+                    found_weekday = day_num
+                    break
+            if found_weekday is not None:
+                days_ahead = found_weekday - creation_date.weekday()
+                if days_ahead <= 0:
+                    days_ahead += 7
+                target_date = creation_date + timedelta(days=days_ahead)
+            else:
+                target_date = creation_date + timedelta(days=1)
+
+    hour, minute = legacy_extract_time(when_text)
+    if hour is None:
+        hour, minute = 18, 0
+    try:
+        start_time = KST.localize(datetime.combine(target_date, datetime.min.time().replace(hour=hour, minute=minute)))
+    except ValueError:
+        return None
+    return start_time
+
+def main():
+    # BENCH_TEXTS로 텍스트 수 조절 (기본 20만)
+    count = int(os.getenv('BENCH_TEXTS', '200000'))
+    texts = make_synthetic_texts(count)
+    base_time = KST.localize(datetime(2025, 8, 6, 21, 30))
+
+    print("=" * 70)
+    print(f"🕐 날짜/시간 파서 벤치마크 ({count:,}개 표현)")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    engine_results = [resolve_schedule_time(text, base_time, KST)['start'] for text in texts]
+    engine_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy_results = [legacy_parse(text, base_time) for text in texts]
+    legacy_elapsed = time.perf_counter() - start
+
+    mismatches = [(text, new, old) for text, new, old in zip(texts, engine_results, legacy_results) if new != old]
+    if mismatches:
+        print(f"❌ 기존 구현과 결과가 다른 표현 {len(mismatches)}개:")
+        for text, new, old in mismatches[:10]:
+            print(f"   '{text}': 엔진 {new} / 기존 {old}")
+        sys.exit(1)
+
+    print(f"   korean_datetime: {engine_elapsed:.3f}초 ({engine_elapsed / count * 1_000_000:.2f} µs/표현)")
+    print(f"   기존 if/elif:    {legacy_elapsed:.3f}초 ({legacy_elapsed / count * 1_000_000:.2f} µs/표현)")
+    print(f"   ✅ 결과 일치, {legacy_elapsed / engine_elapsed:.1f}배")
+
+if __name__ == "__main__":
+    main()
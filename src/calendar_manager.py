@@ -1,21 +1,91 @@
 import os
 import json
+import asyncio
+import hashlib
+import threading
 import pytz
-import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import httplib2
+import google_auth_httplib2
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from korean_datetime import resolve_schedule_time, resolve_time, scan_tokens
+
+# Google 배치 HTTP 요청 하나에 넣을 수 있는 최대 요청 수 (Calendar API 제한)
+CALENDAR_MAX_BATCH_SIZE = 50
+
+def get_batch_size():
+    """배치 insert 크기 (CALENDAR_BATCH_SIZE, 기본 50, 1이면 한 건씩 insert)"""
+    try:
+        size = int(os.getenv('CALENDAR_BATCH_SIZE', str(CALENDAR_MAX_BATCH_SIZE)))
+    except ValueError:
+        size = CALENDAR_MAX_BATCH_SIZE
+    return min(max(1, size), CALENDAR_MAX_BATCH_SIZE)
+
+# 스레드별 HTTP 연결 타임아웃 (초)
+CALENDAR_HTTP_TIMEOUT = 30
+
+def is_quiet_mode():
+    """시간 파싱 디버그 출력 생략 여부 (CALENDAR_QUIET, 기본 false)"""
+    return os.getenv('CALENDAR_QUIET', 'false').lower() == 'true'
+
+def get_calendar_concurrency():
+    """동시에 보낼 Calendar API 요청(배치) 수 (CALENDAR_CONCURRENCY, 기본 4)"""
+    try:
+        return max(1, int(os.getenv('CALENDAR_CONCURRENCY', '4')))
+    except ValueError:
+        return 4
+
+# 봇이 만든 이벤트 표시 (extendedProperties.private) - 중복 인덱스 조회 필터로 사용
+EVENT_SOURCE_KEY = 'source'
+EVENT_SOURCE_VALUE = 'discord-schedule-bot'
+EVENT_DEDUP_KEY = 'dedupKey'
+
+def get_sync_retention_days():
+    """동기화 모드에서 재분류/수정 대상 기존 이벤트를 찾는 기간 (CALENDAR_SYNC_RETENTION_DAYS, 기본 60 = 수집 기간)"""
+    try:
+        return max(1, int(os.getenv('CALENDAR_SYNC_RETENTION_DAYS', '60')))
+    except ValueError:
+        return 60
+
+def is_dedup_enabled():
+    """캘린더에 이미 있는 이벤트를 실행 간에도 건너뛸지 여부 (CALENDAR_DEDUP, 기본 true)"""
+    return os.getenv('CALENDAR_DEDUP', 'true').lower() == 'true'
+
+def is_sync_mode():
+    """insert만 하는 대신 기존 이벤트와 비교해 추가/수정/삭제할지 여부 (CALENDAR_SYNC_MODE, 기본 false)"""
+    return os.getenv('CALENDAR_SYNC_MODE', 'false').lower() == 'true'
+
 class CalendarManager:
     def __init__(self):
         """Google Calendar 연동 관리자 초기화"""
         self.service = None
         self.calendar_id = os.getenv('CALENDAR_ID')
         self.kst = pytz.timezone('Asia/Seoul')
-        self.added_events = set()  # 중복 방지용 세트
+        self.added_events = set()  # 중복 방지용 세트 (이전 실행에서 만든 이벤트 키 포함)
+        self.counts = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'skipped': 0, 'failed': 0}  # 캘린더 처리 결과
+        self.batch_size = get_batch_size()
+        self.sync_mode = is_sync_mode()
+        self.quiet = is_quiet_mode()
+        self.synced_events = {}    # 메시지 ID → 봇이 만든 기존 이벤트 (id, summary, private 속성)
+        self.synced_message_ids = {}  # 이번 실행에서 동기화한 메시지 ID → (이벤트 키, 제목)
+        self.lookup_enabled = is_dedup_enabled() or self.sync_mode
+        self.loaded_range = None   # 기존 이벤트를 불러온 시간 범위 (시작, 끝)
+        now = datetime.now(self.kst)
+        retention = timedelta(days=get_sync_retention_days())
+        self.retention_range = (now - retention, now + retention)  # 동기화 모드의 수정/삭제 대상 조회 범위
         
-        # Google 서비스 계정 인증
+        # 비동기 백엔드: 요청은 스레드 풀에서 실행, httplib2는 스레드 안전하지 않아 스레드마다 연결 유지
+        self.credentials = None
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.concurrency = get_calendar_concurrency()
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='calendar')
+        
+        # Google 서비스 계정 인증 (기존 이벤트는 일정 시간을 알게 된 뒤 필요한 범위만 조회)
         self.authenticate()
     
     def authenticate(self):
@@ -30,13 +100,13 @@ class CalendarManager:
             credentials_info = json.loads(credentials_json)
             
             # 서비스 계정 인증 정보 생성
-            credentials = service_account.Credentials.from_service_account_info(
+            self.credentials = service_account.Credentials.from_service_account_info(
                 credentials_info,
                 scopes=['https://www.googleapis.com/auth/calendar']
             )
             
-            # Calendar API 서비스 빌드
-            self.service = build('calendar', 'v3', credentials=credentials)
+            # Calendar API 서비스 빌드 (요청 객체 생성용, 실행은 스레드별 HTTP 세션으로)
+            self.service = build('calendar', 'v3', http=self.thread_http(), cache_discovery=False)
             
             print("✅ Google Calendar API 인증 완료")
             
@@ -47,56 +117,31 @@ class CalendarManager:
             print(f"❌ Google Calendar 인증 실패: {e}")
             raise
     
+    def thread_http(self):
+        """현재 스레드 전용 인증 HTTP 세션 (재사용하므로 keep-alive 연결 유지)"""
+        http = getattr(self.local, 'http', None)
+        if http is None:
+            http = google_auth_httplib2.AuthorizedHttp(
+                self.credentials, http=httplib2.Http(timeout=CALENDAR_HTTP_TIMEOUT)
+            )
+            self.local.http = http
+        return http
+    
+    def count(self, kind):
+        """결과 카운터 증가 (여러 스레드에서 호출)"""
+        with self.lock:
+            self.counts[kind] += 1
+    
+    def close(self):
+        """스레드 풀 종료"""
+        self.executor.shutdown(wait=True)
+    
     def extract_time_from_text(self, when_text):
-        """텍스트에서 시간 정보 추출"""
-        when_text = when_text.lower().strip()
-        
-        # 시간 패턴들
-        time_patterns = [
-            (r'(\d{1,2})시\s*(\d{1,2})분', 'hour_minute'),    # "2시 20분"
-            (r'(\d{1,2})시', 'hour_only'),                    # "8시"
-            (r'(\d{1,2}):(\d{2})', 'colon_format'),           # "14:30"
-            (r'오전\s*(\d{1,2})시?', 'morning'),              # "오전 9시"
-            (r'오후\s*(\d{1,2})시?', 'afternoon'),            # "오후 3시"
-        ]
-        
-        for pattern, pattern_type in time_patterns:
-            match = re.search(pattern, when_text)
-            if match:
-                if pattern_type == 'hour_minute':
-                    hour = int(match.group(1))
-                    minute = int(match.group(2))
-                elif pattern_type == 'colon_format':
-                    hour = int(match.group(1))
-                    minute = int(match.group(2))
-                elif pattern_type == 'morning':
-                    hour = int(match.group(1))
-                    minute = 0
-                elif pattern_type == 'afternoon':
-                    hour = int(match.group(1)) + 12
-                    minute = 0
-                else:  # hour_only
-                    hour = int(match.group(1))
-                    minute = 0
-                    
-                    # 시간 추론 로직
-                    if hour >= 1 and hour <= 12:
-                        if any(word in when_text for word in ['오전', 'am']):
-                            pass  # 오전 그대로
-                        elif any(word in when_text for word in ['오후', 'pm', '밤', '저녁']):
-                            if hour != 12:
-                                hour += 12
-                        elif hour >= 6 and hour <= 12:
-                            # 6-12시는 보통 오후 (합주/리허설 시간대)
-                            if hour != 12:
-                                hour += 12
-                
-                return hour, minute
-        
-        return None, None
+        """텍스트에서 시간 정보 추출 → (시, 분) 또는 (None, None)"""
+        return resolve_time(scan_tokens(when_text.lower().strip()))
     
-    def parse_schedule_time(self, schedule):
-        """일정 시간 정보를 파싱하여 datetime 객체 생성 (완전 수정 버전)"""
+    def resolve_schedule(self, schedule):
+        """일정의 when 텍스트를 작성 시간 기준으로 해석 → (when 텍스트, 작성 시간, resolve_schedule_time 결과)"""
         when_text = schedule.get('extracted_info', {}).get('when', '').lower().strip()
         created_at = schedule.get('created_at')
         
@@ -107,133 +152,119 @@ class CalendarManager:
         else:
             base_time = created_at.astimezone(self.kst) if created_at else datetime.now(self.kst)
         
-        print(f"      📝 원본: '{when_text}'")
-        print(f"      🕐 작성: {base_time.strftime('%Y-%m-%d %H:%M')}")
+        return when_text, base_time, resolve_schedule_time(when_text, base_time, self.kst)
+    
+    def parse_schedule_time(self, schedule):
+        """일정 시간 정보를 파싱하여 datetime 객체 생성 (korean_datetime 엔진 사용)"""
+        when_text, base_time, result = self.resolve_schedule(schedule)
         
-        # 🚨 핵심 수정: 절대적으로 간단한 날짜 로직
-        target_date = None
+        if not self.quiet:
+            print(f"      📝 원본: '{when_text}' (작성: {base_time.strftime('%Y-%m-%d %H:%M')})")
+            print(f"      ✅ {result['date_reason']} = {result['date']}, "
+                  f"{result['time_reason']} {result['hour']:02d}:{result['minute']:02d}")
         
-        # 1순위: 구체적 날짜 (예: 8월 8일) - 가장 명확함
-        date_match = re.search(r'(\d{1,2})월\s*(\d{1,2})일', when_text)
-        if date_match:
-            month = int(date_match.group(1))
-            day = int(date_match.group(2))
-            try:
-                target_date = datetime(base_time.year, month, day).date()
-                print(f"      ✅ 구체적 날짜: {target_date}")
-            except ValueError:
-                pass
-        
-        # 2순위: 상대적 날짜 (💡 핵심: 작성일 기준으로 절대 계산)
-        if not target_date:
-            # 작성일 기준으로 정확히 계산
-            creation_date = base_time.date()
-            
-            if '오늘' in when_text:
-                target_date = creation_date  # 🚨 작성일 그 자체
-                print(f"      ✅ 오늘 = {target_date} (작성일 기준)")
-                
-            elif '내일' in when_text:
-                target_date = creation_date + timedelta(days=1)  # 🚨 작성일 + 1일
-                print(f"      ✅ 내일 = {target_date} (작성일+1)")
-                
-            elif '모레' in when_text:
-                target_date = creation_date + timedelta(days=2)  # 🚨 작성일 + 2일
-                print(f"      ✅ 모레 = {target_date} (작성일+2)")
-                
-            elif '낼모래' in when_text:
-                target_date = creation_date + timedelta(days=2)  # 🚨 모레와 같음
-                print(f"      ✅ 낼모래 = {target_date} (작성일+2)")
-                
-            elif '다음주' in when_text or '담주' in when_text:
-                # 다음주 월요일로 계산
-                days_until_next_monday = (7 - creation_date.weekday()) % 7
-                if days_until_next_monday == 0:  # 월요일에 "다음주"라고 하면
-                    days_until_next_monday = 7   # 다다음주 월요일
-                target_date = creation_date + timedelta(days=days_until_next_monday)
-                print(f"      ✅ 다음주 = {target_date} (다음주 월요일)")
-                
-            else:
-                # 요일 체크
-                weekdays = {
-                    '월요': 0, '월욜': 0, '월요일': 0,
-                    '화요': 1, '화욜': 1, '화요일': 1,
-                    '수요': 2, '수욜': 2, '수요일': 2,
-                    '목요': 3, '목욜': 3, '목요일': 3,
-                    '금요': 4, '금욜': 4, '금요일': 4,
-                    '토요': 5, '토욜': 5, '토요일': 5,
-                    '일요': 6, '일욜': 6, '일요일': 6,
-                }
-                
-                found_weekday = None
-                for day_name, day_num in weekdays.items():
-                    if day_name in when_text:
-                        found_weekday = day_num
-                        break
-                
-                if found_weekday is not None:
-                    current_weekday = creation_date.weekday()
-                    days_ahead = found_weekday - current_weekday
-                    if days_ahead <= 0:
-                        days_ahead += 7  # 다음 주 해당 요일
-                    target_date = creation_date + timedelta(days=days_ahead)
-                    print(f"      ✅ 요일 계산 = {target_date}")
-                else:
-                    # 기본값: 내일
-                    target_date = creation_date + timedelta(days=1)
-                    print(f"      ✅ 기본값(내일) = {target_date}")
-        
-        # 시간 추출
-        extracted_hour, extracted_minute = self.extract_time_from_text(when_text)
-        
-        if extracted_hour is not None:
-            final_hour = extracted_hour
-            final_minute = extracted_minute
-            print(f"      ✅ 시간 추출: {final_hour:02d}:{final_minute:02d}")
+        if result['error']:
+            print(f"      ❌ 오류: {result['error']}")
+            return None, None
+        
+        if not self.quiet:
+            print(f"      🎯 최종: {result['start'].strftime('%Y-%m-%d %H:%M')} ~ {result['end'].strftime('%H:%M')}")
+        return result['start'], result['end']
+    
+    def lookup_range(self, schedules):
+        """기존 이벤트를 조회할 시간 범위 (일정들의 파싱된 시간 + 동기화 모드면 보존 기간) → (시작, 끝) 또는 None
+
+        중복 키는 파싱된 시작 시간을 포함하므로 같은 일정의 기존 이벤트는 이 범위 안에 있다.
+        동기화 모드의 수정/삭제 대상은 시간이 바뀌었을 수 있어서 보존 기간 전체를 함께 조회한다.
+        """
+        times = []
+        for schedule in schedules:
+            _, _, result = self.resolve_schedule(schedule)
+            if not result['error']:
+                times += [result['start'], result['end']]
+        
+        if self.sync_mode:
+            times += list(self.retention_range)
+        
+        if not times:
+            return None
+        return min(times), max(times)
+    
+    def ensure_events_loaded(self, schedules):
+        """일정들을 처리하기 전에 아직 조회하지 않은 범위의 기존 이벤트만 불러오기"""
+        if not self.lookup_enabled:
+            return
+        
+        requested = self.lookup_range(schedules)
+        if requested is None:
+            return
+        
+        time_min, time_max = requested
+        if self.loaded_range is None:
+            missing = [(time_min, time_max)]
         else:
-            final_hour = 18  # 기본값: 오후 6시
-            final_minute = 0
-            print(f"      ✅ 기본 시간: {final_hour:02d}:{final_minute:02d}")
+            loaded_min, loaded_max = self.loaded_range
+            missing = []
+            if time_min < loaded_min:
+                missing.append((time_min, loaded_min))
+            if time_max > loaded_max:
+                missing.append((loaded_max, time_max))
+            time_min, time_max = min(time_min, loaded_min), max(time_max, loaded_max)
         
-        # 최종 datetime 생성
+        for range_min, range_max in missing:
+            self.load_existing_events(range_min, range_max)
+        self.loaded_range = (time_min, time_max)
+    
+    def load_existing_events(self, time_min, time_max):
+        """봇이 만든 이벤트 중 time_min~time_max에 걸친 것을 한 번에 불러오기 (필요한 필드만 요청)"""
+        loaded = 0
+        page_token = None
         try:
-            start_time = datetime.combine(target_date, datetime.min.time().replace(
-                hour=final_hour, minute=final_minute
-            ))
-            start_time = self.kst.localize(start_time)
-            end_time = start_time + timedelta(hours=1)
-            
-            print(f"      🎯 최종: {start_time.strftime('%Y-%m-%d %H:%M')} ~ {end_time.strftime('%H:%M')}")
-            return start_time, end_time
+            while True:
+                response = self.service.events().list(
+                    calendarId=self.calendar_id,
+                    timeMin=time_min.isoformat(),
+                    timeMax=time_max.isoformat(),
+                    privateExtendedProperty=f'{EVENT_SOURCE_KEY}={EVENT_SOURCE_VALUE}',
+                    maxResults=2500,
+                    pageToken=page_token,
+                    fields='nextPageToken,items(id,summary,extendedProperties/private)',
+                ).execute(http=self.thread_http())
+                
+                for item in response.get('items', []):
+                    private = item.get('extendedProperties', {}).get('private', {})
+                    event_key = private.get(EVENT_DEDUP_KEY)
+                    if event_key:
+                        self.added_events.add(event_key)
+                        loaded += 1
+                    if private.get('messageId'):
+                        self.synced_events[private['messageId']] = item
+                
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
             
-        except ValueError as e:
-            print(f"      ❌ 오류: {e}")
-            return None, None
+            print(f"🗂️  기존 이벤트 중복 인덱스: {loaded}개 불러옴 "
+                  f"({time_min.strftime('%Y-%m-%d')} ~ {time_max.strftime('%Y-%m-%d')})")
+        except Exception as e:
+            # 조회 실패 시 이번 실행 안에서만 중복 체크
+            print(f"⚠️ 기존 이벤트 조회 실패 (이번 실행 안에서만 중복 체크): {e}")
     
-    def create_event_hash(self, schedule):
-        """중복 체크를 위한 일정 해시 생성"""
-        content = schedule.get('content', '')[:100]
-        author = schedule.get('author', '')
-        created_at = schedule.get('created_at', '')
-        hash_str = f"{content}_{author}_{created_at}"
-        return hash(hash_str)
+    def create_event_hash(self, schedule, start_time):
+        """중복 체크를 위한 일정 키 (메시지 ID + 파싱된 시작 시간의 SHA-256, 실행이 달라도 같은 값)"""
+        message_id = schedule.get('message_id')
+        if not message_id:
+            content = schedule.get('content', '')[:100]
+            author = schedule.get('author', '')
+            created_at = schedule.get('created_at', '')
+            message_id = f"{content}_{author}_{created_at}"
+        
+        hash_str = f"{message_id}|{start_time.isoformat()}"
+        return hashlib.sha256(hash_str.encode('utf-8')).hexdigest()
     
-    def create_event_from_schedule(self, schedule):
+    def create_event_from_schedule(self, schedule, start_time, end_time, event_key):
         """일정 정보를 바탕으로 Google Calendar 이벤트 생성"""
         try:
-            # 중복 체크
-            event_hash = self.create_event_hash(schedule)
-            if event_hash in self.added_events:
-                print(f"  ⚠️ 중복 건너뛰기: {schedule.get('content', '')[:50]}...")
-                return None
-            
-            # 시간 파싱
-            start_time, end_time = self.parse_schedule_time(schedule)
-            
-            if not start_time:
-                print(f"  ⚠️ 시간 파싱 실패: {schedule.get('content', '')[:50]}...")
-                return None
-            
             # 이벤트 제목 생성
             schedule_type = schedule.get('schedule_type', '일정')
             what = schedule.get('extracted_info', {}).get('what', '')
@@ -282,6 +313,13 @@ class CalendarManager:
                     'title': 'Discord Schedule Bot',
                     'url': 'https://github.com/AlwaysSincere/discord-schedule-bot'
                 },
+                'extendedProperties': {
+                    'private': {
+                        EVENT_SOURCE_KEY: EVENT_SOURCE_VALUE,
+                        EVENT_DEDUP_KEY: event_key,
+                        'messageId': str(schedule.get('message_id') or event_key),
+                    },
+                },
                 'colorId': '9',  # 파란색 (Discord 색상)
                 'reminders': {
                     'useDefault': False,
@@ -292,91 +330,291 @@ class CalendarManager:
                 },
             }
             
-            self.added_events.add(event_hash)
             return event
             
         except Exception as e:
             print(f"  ❌ 이벤트 생성 오류: {e}")
             return None
     
-    def add_schedules_to_calendar(self, schedules):
-        """추출된 일정들을 Google Calendar에 추가"""
-        if not self.service:
-            print("❌ Google Calendar 서비스가 초기화되지 않았습니다.")
-            return
+    def print_schedule_header(self, schedule, index, total):
+        """처리할 일정 정보 출력 (total이 None이면 전체 개수를 모르는 스트리밍 처리)"""
+        position = f"{index}/{total}" if total is not None else f"{index}"
+        print(f"\n📝 일정 {position}: {schedule.get('content', '')[:50]}...")
+        print(f"   👤 작성자: {schedule.get('author', 'Unknown')}")
+        print(f"   🎯 AI 추출: {schedule.get('extracted_info', {}).get('when', '미상')}")
+    
+    def prepare_schedule(self, schedule, index, total):
+        """일정 하나를 캘린더 이벤트로 변환 (중복/생성 실패는 카운터에 반영하고 None)"""
+        self.print_schedule_header(schedule, index, total)
         
-        if not schedules:
-            print("📝 추가할 일정이 없습니다.")
+        # 시간 파싱
+        start_time, end_time = self.parse_schedule_time(schedule)
+        if not start_time:
+            self.count('failed')
+            print(f"      ❌ 시간 파싱 실패")
+            return None
+        
+        # 중복 체크 (이번 실행 + 이전 실행에서 추가한 이벤트)
+        event_key = self.create_event_hash(schedule, start_time)
+        if event_key in self.added_events:
+            self.count('skipped')
+            print(f"      ⏭️ 중복으로 건너뛰기")
+            return None
+        
+        event = self.create_event_from_schedule(schedule, start_time, end_time, event_key)
+        if not event:
+            self.count('failed')
+            print(f"      ❌ 이벤트 생성 실패")
+            return None
+        
+        self.added_events.add(event_key)
+        return event
+    
+    def record_result(self, kind, event, response, error):
+        """요청 결과 하나를 출력하고 카운터 갱신 (단건/배치 공용, kind: added/updated/deleted)"""
+        if error is not None:
+            if isinstance(error, HttpError):
+                print(f"      ❌ Google API 오류 ({event.get('summary', '')}): {error}")
+            else:
+                print(f"      ❌ 예상치 못한 오류 ({event.get('summary', '')}): {error}")
+            self.count('failed')
             return
         
-        print(f"📅 {len(schedules)}개 일정을 Google Calendar에 추가합니다...")
-        print("=" * 70)
+        if kind == 'deleted':
+            print(f"      🗑️ 캘린더 삭제 완료: {event.get('summary', '')}")
+        else:
+            if self.sync_mode:
+                # 같은 메시지(맥락 그룹)가 실시간 수정으로 다시 오면 방금 만든/고친 이벤트를 수정하도록 기억
+                message_id = event['extendedProperties']['private']['messageId']
+                self.synced_events[message_id] = {
+                    'id': response['id'],
+                    'summary': event['summary'],
+                    'extendedProperties': event['extendedProperties'],
+                }
+            start_time_str = response['start'].get('dateTime', response['start'].get('date'))
+            action = "추가" if kind == 'added' else "수정"
+            print(f"      ✅ 캘린더 {action} 완료: {event['summary']} ({start_time_str})")
+        self.count(kind)
+    
+    def chunk_operations(self, operations):
+        """배치 크기만큼씩 나누기"""
+        return [operations[i:i + self.batch_size] for i in range(0, len(operations), self.batch_size)]
+    
+    def execute_chunk(self, chunk):
+        """요청 묶음 하나 실행 (1개면 단건, 여러 개면 배치 HTTP 요청) - 스레드 풀에서 호출"""
+        http = self.thread_http()
+        if len(chunk) == 1:
+            kind, event, request = chunk[0]
+            try:
+                self.record_result(kind, event, request.execute(http=http), None)
+            except Exception as e:
+                self.record_result(kind, event, None, e)
+        else:
+            print(f"\n📦 배치 요청: {len(chunk)}개")
+            self.run_batch(chunk, http)
+    
+    def run_operations(self, operations):
+        """(종류, 이벤트, HTTP 요청) 목록을 현재 스레드에서 순서대로 실행"""
+        for chunk in self.chunk_operations(operations):
+            self.execute_chunk(chunk)
+    
+    async def run_operations_async(self, operations):
+        """(종류, 이벤트, HTTP 요청) 목록을 스레드 풀에서 최대 concurrency개씩 동시에 실행 (이벤트 루프는 막지 않음)"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self.executor, self.execute_chunk, chunk)
+            for chunk in self.chunk_operations(operations)
+        ))
+    
+    def run_batch(self, operations, http=None):
+        """요청 최대 50개를 배치 HTTP 요청 한 번으로 실행 (항목별 결과는 콜백으로 집계)"""
+        batch = self.service.new_batch_http_request()
+        reported = set()
         
-        added_count = 0
-        failed_count = 0
-        skipped_count = 0
+        def make_callback(kind, event):
+            def callback(request_id, response, exception):
+                reported.add(request_id)
+                self.record_result(kind, event, response, exception)
+            return callback
+        
+        for i, (kind, event, request) in enumerate(operations):
+            batch.add(request, callback=make_callback(kind, event), request_id=str(i))
+        
+        try:
+            batch.execute(http=http)
+        except Exception as e:
+            # 배치 요청 자체가 실패 → 결과를 못 받은 항목은 모두 실패 처리
+            for i, (kind, event, _) in enumerate(operations):
+                if str(i) not in reported:
+                    self.record_result(kind, event, None, e)
+    
+    def insert_request(self, event):
+        """이벤트 insert 요청 객체 (실행은 run_operations에서)"""
+        return self.service.events().insert(calendarId=self.calendar_id, body=event)
+    
+    def plan_inserts(self, schedules, start_index=1, total=None):
+        """일정들을 이벤트로 변환 → insert 요청 목록"""
+        operations = []
+        for i, schedule in enumerate(schedules):
+            event = self.prepare_schedule(schedule, start_index + i, total)
+            if event:
+                operations.append(('added', event, self.insert_request(event)))
+        
+        return operations
+    
+    def plan_sync(self, schedules, start_index=1, total=None):
+        """기존 이벤트와 비교 → 새 일정은 insert, 시간/제목이 바뀐 일정은 patch 요청 목록"""
+        operations = []
         
         for i, schedule in enumerate(schedules):
-            print(f"\n📝 일정 {i+1}/{len(schedules)}: {schedule.get('content', '')[:50]}...")
-            print(f"   👤 작성자: {schedule.get('author', 'Unknown')}")
-            print(f"   🎯 AI 추출: {schedule.get('extracted_info', {}).get('when', '미상')}")
+            self.print_schedule_header(schedule, start_index + i, total)
             
-            try:
-                event = self.create_event_from_schedule(schedule)
-                if not event:
-                    if self.create_event_hash(schedule) in self.added_events:
-                        skipped_count += 1
-                        print(f"      ⏭️ 중복으로 건너뛰기")
-                    else:
-                        failed_count += 1
-                        print(f"      ❌ 이벤트 생성 실패")
-                    continue
-                
-                # Google Calendar에 이벤트 추가
-                created_event = self.service.events().insert(
-                    calendarId=self.calendar_id,
-                    body=event
-                ).execute()
-                
-                # 결과 출력
-                start_time_str = created_event['start'].get('dateTime', created_event['start'].get('date'))
-                print(f"      ✅ 캘린더 추가 완료!")
-                print(f"      📅 제목: {event['summary']}")
-                print(f"      🕐 시간: {start_time_str}")
-                
-                added_count += 1
-                
-            except HttpError as http_error:
-                print(f"      ❌ Google API 오류: {http_error}")
-                failed_count += 1
-                
-            except Exception as e:
-                print(f"      ❌ 예상치 못한 오류: {e}")
-                failed_count += 1
+            start_time, end_time = self.parse_schedule_time(schedule)
+            if not start_time:
+                self.count('failed')
+                print(f"      ❌ 시간 파싱 실패")
+                continue
+            
+            event_key = self.create_event_hash(schedule, start_time)
+            message_id = str(schedule.get('message_id') or event_key)
+            event = self.create_event_from_schedule(schedule, start_time, end_time, event_key)
+            if not event:
+                self.count('failed')
+                print(f"      ❌ 이벤트 생성 실패")
+                continue
+            
+            # 이번 실행에서 같은 내용으로 이미 동기화했으면 중복, 내용이 바뀌었으면(수정 후 재분류) 다시 비교
+            planned = (event_key, event['summary'])
+            if self.synced_message_ids.get(message_id) == planned:
+                self.count('skipped')
+                print(f"      ⏭️ 중복으로 건너뛰기")
+                continue
+            self.synced_message_ids[message_id] = planned
+            
+            current = self.synced_events.get(message_id)
+            if current is None:
+                operations.append(('added', event, self.insert_request(event)))
+                continue
+            
+            current_key = current.get('extendedProperties', {}).get('private', {}).get(EVENT_DEDUP_KEY)
+            if current_key == event_key and current.get('summary') == event['summary']:
+                self.count('unchanged')
+                print(f"      ⏸️ 변경 없음")
+                continue
+            
+            print(f"      🔁 변경 감지 → 수정 예정")
+            operations.append(('updated', event, self.service.events().patch(
+                calendarId=self.calendar_id, eventId=current['id'], body=event
+            )))
+        
+        return operations
+    
+    def plan_schedules(self, schedules, start_index=1, total=None):
+        """모드에 맞는 요청 목록 (동기화 모드: insert/patch, 기본: insert)
+
+        start_index/total은 진행 표시용이며, 파이프라인처럼 전체 개수를 모르면 total은 None.
+        """
+        self.ensure_events_loaded(schedules)
+        if self.sync_mode:
+            return self.plan_sync(schedules, start_index, total)
+        return self.plan_inserts(schedules, start_index, total)
+    
+    def plan_deletes(self, non_schedule_ids):
+        """이번 실행에서 일정이 아니라고 다시 분류된 메시지의 기존 이벤트 delete 요청 목록"""
+        self.ensure_events_loaded([])
+        operations = []
+        for message_id in non_schedule_ids:
+            message_id = str(message_id)
+            current = self.synced_events.get(message_id)
+            if current is None or message_id in self.synced_message_ids:
+                continue
+            print(f"\n🗑️ 일정 아님으로 재분류: {current.get('summary', '')}")
+            operations.append(('deleted', current, self.service.events().delete(
+                calendarId=self.calendar_id, eventId=current['id']
+            )))
+        
+        return operations
+    
+    def print_summary(self):
+        """지금까지의 캘린더 추가 결과 출력"""
+        added_count = self.counts['added']
+        total = sum(self.counts.values())
         
-        # 최종 결과
         print(f"\n" + "=" * 70)
         print(f"📊 캘린더 추가 완료!")
         print(f"   ✅ 성공: {added_count}개")
-        print(f"   ⏭️ 중복 건너뛰기: {skipped_count}개")
-        print(f"   ❌ 실패: {failed_count}개")
-        print(f"   📊 총 처리: {len(schedules)}개")
+        if self.sync_mode:
+            print(f"   🔁 수정: {self.counts['updated']}개")
+            print(f"   🗑️ 삭제: {self.counts['deleted']}개")
+            print(f"   ⏸️ 변경 없음: {self.counts['unchanged']}개")
+        print(f"   ⏭️ 중복 건너뛰기: {self.counts['skipped']}개")
+        print(f"   ❌ 실패: {self.counts['failed']}개")
+        print(f"   📊 총 처리: {total}개")
         
-        if len(schedules) > 0:
-            success_rate = (added_count / len(schedules)) * 100
+        if total > 0:
+            succeeded = added_count + self.counts['updated'] + self.counts['deleted'] + self.counts['unchanged']
+            success_rate = (succeeded / total) * 100
             print(f"   🎯 성공률: {success_rate:.1f}%")
         
         if added_count > 0:
             print(f"   📅 Google Calendar에서 확인하세요")
+    
+    def begin(self, schedules, non_schedules):
+        """처리 시작 안내 → 처리할 것이 없으면 False"""
+        if not self.service:
+            print("❌ Google Calendar 서비스가 초기화되지 않았습니다.")
+            return False
+        
+        if not schedules and not (self.sync_mode and non_schedules):
+            print("📝 추가할 일정이 없습니다.")
+            return False
+        
+        print(f"📅 {len(schedules)}개 일정을 Google Calendar에 {'동기화' if self.sync_mode else '추가'}합니다...")
+        print("=" * 70)
+        return True
+    
+    def plan_all(self, schedules, non_schedules):
+        """전체 요청 목록 (동기화 모드면 재분류된 메시지의 삭제 포함)"""
+        operations = self.plan_schedules(schedules, total=len(schedules))
+        if self.sync_mode:
+            operations += self.plan_deletes(item.get('message_id') for item in non_schedules or [])
+        return operations
+    
+    def add_schedules_to_calendar(self, schedules, non_schedules=None):
+        """추출된 일정들을 Google Calendar에 추가 (동기화 모드면 기존 이벤트와 비교해 추가/수정/삭제)"""
+        if not self.begin(schedules, non_schedules):
+            return
+        
+        self.run_operations(self.plan_all(schedules, non_schedules))
+        
+        # 최종 결과
+        self.print_summary()
+    
+    async def add_schedules_async(self, schedules, non_schedules=None):
+        """add_schedules_to_calendar의 비동기 버전 (요청은 스레드 풀에서 동시에 실행)"""
+        if not self.begin(schedules, non_schedules):
+            return
+        
+        # 기존 이벤트 조회가 포함될 수 있어서 요청 목록 만들기도 스레드에서 실행
+        operations = await asyncio.to_thread(self.plan_all, schedules, non_schedules)
+        await self.run_operations_async(operations)
+        
+        # 최종 결과
+        self.print_summary()
 
-async def add_schedules_to_google_calendar(schedules):
-    """일정들을 Google Calendar에 추가하는 메인 함수 (필수 함수)"""
+async def add_schedules_to_google_calendar(schedules, non_schedules=None):
+    """일정들을 Google Calendar에 추가하는 메인 함수 (필수 함수, 이벤트 루프를 막지 않음)"""
     print("📅 Google Calendar 연동을 시작합니다...")
     
+    calendar_manager = None
     try:
-        calendar_manager = CalendarManager()
-        calendar_manager.add_schedules_to_calendar(schedules)
+        # 인증도 네트워크 호출이라 스레드에서 실행
+        calendar_manager = await asyncio.to_thread(CalendarManager)
+        await calendar_manager.add_schedules_async(schedules, non_schedules)
         return True
     except Exception as e:
         print(f"❌ Google Calendar 연동 실패: {e}")
         return False
+    finally:
+        if calendar_manager:
+            calendar_manager.close()
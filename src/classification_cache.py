@@ -0,0 +1,120 @@
+# src/classification_cache.py
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import unicodedata
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS classifications (
+    key         TEXT PRIMARY KEY,
+    verdict     TEXT NOT NULL,   -- schedule | non_schedule | rejected
+    payload     TEXT NOT NULL,   -- AI 응답 항목 (JSON, 메시지 식별 정보 제외)
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_classifications_created_at ON classifications (created_at);
+CREATE INDEX IF NOT EXISTS idx_classifications_last_used ON classifications (last_used);
+"""
+
+def is_cache_enabled():
+    """AI 분류 캐시 사용 여부 (CLASSIFICATION_CACHE, 기본 true)"""
+    return os.getenv('CLASSIFICATION_CACHE', 'true').lower() == 'true'
+
+def normalize_content(content):
+    """캐시 키용 내용 정규화 (유니코드 NFC + 공백 정리)"""
+    content = unicodedata.normalize('NFC', content)
+    return re.sub(r'\s+', ' ', content).strip()
+
+class ClassificationCache:
+    """메시지 내용 해시 기반 AI 분류 결과 캐시 (SQLite)"""
+
+    def __init__(self, path=None, max_entries=None, max_age_days=None):
+        # 캐시 파일 경로와 용량/기간 제한 (환경변수로 변경 가능)
+        self.path = path or os.getenv('CLASSIFICATION_CACHE_PATH', 'classification_cache.db')
+        self.max_entries = max_entries or int(os.getenv('CLASSIFICATION_CACHE_MAX_ENTRIES', '20000'))
+        self.max_age_days = max_age_days or float(os.getenv('CLASSIFICATION_CACHE_MAX_AGE_DAYS', '90'))
+
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(SCHEMA)
+
+        # 이번 실행 통계
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(content, model, prompt_version):
+        """정규화된 내용 + 모델 + 프롬프트 버전의 SHA-256"""
+        material = f"{model}\x00{prompt_version}\x00{normalize_content(content)}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """캐시 조회 → (verdict, payload) 또는 None"""
+        row = self.connection.execute(
+            'SELECT verdict, payload FROM classifications WHERE key = ?', (key,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.connection.execute(
+            'UPDATE classifications SET last_used = ? WHERE key = ?', (time.time(), key)
+        )
+        return row[0], json.loads(row[1])
+
+    def put(self, key, verdict, payload):
+        """분류 결과 저장 (같은 키는 덮어씀)"""
+        now = time.time()
+        self.connection.execute(
+            'INSERT OR REPLACE INTO classifications (key, verdict, payload, created_at, last_used) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (key, verdict, json.dumps(payload, ensure_ascii=False, default=str), now, now),
+        )
+        self.stores += 1
+
+    def evict(self):
+        """기간이 지난 항목 삭제 후, 최대 개수를 넘으면 오래 안 쓴 것부터 삭제"""
+        cutoff = time.time() - self.max_age_days * 86400
+        expired = self.connection.execute(
+            'DELETE FROM classifications WHERE created_at < ?', (cutoff,)
+        ).rowcount
+
+        overflow = self.connection.execute(
+            'DELETE FROM classifications WHERE key IN ('
+            '  SELECT key FROM classifications ORDER BY last_used DESC LIMIT -1 OFFSET ?'
+            ')', (self.max_entries,)
+        ).rowcount
+
+        self.evictions += expired + overflow
+        return expired + overflow
+
+    def commit(self):
+        """지금까지 저장/조회한 내용을 디스크에 반영 (계속 실행되는 모드에서 배치마다 호출)"""
+        if self.connection:
+            self.connection.commit()
+
+    def stats(self):
+        """이번 실행의 적중/실패 통계"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': self.connection.execute('SELECT COUNT(*) FROM classifications').fetchone()[0],
+        }
+
+    def close(self):
+        """정리(eviction) 후 저장하고 연결 종료"""
+        if self.connection:
+            self.evict()
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,104 @@
+# src/collection_checkpoint.py
+import os
+import json
+from datetime import datetime
+
+def is_incremental_enabled():
+    """채널별 마지막 메시지 ID 이후만 수집할지 여부 (INCREMENTAL_COLLECTION, 기본 true - false면 전체 재수집)"""
+    return os.getenv('INCREMENTAL_COLLECTION', 'true').lower() == 'true'
+
+class CollectionCheckpoint:
+    """채널별 마지막 처리 메시지 ID와 보존 윈도우를 저장하는 로컬 체크포인트"""
+
+    VERSION = 1
+
+    def __init__(self, path=None):
+        # 체크포인트 파일 경로 (환경변수로 변경 가능)
+        self.path = path or os.getenv('CHECKPOINT_PATH', 'collection_checkpoint.json')
+        self.channels = {}
+        self.load()
+
+    @staticmethod
+    def channel_key(guild_id, channel_id):
+        """길드/채널 조합 키"""
+        return f"{guild_id}:{channel_id}"
+
+    def load(self):
+        """디스크에서 체크포인트 읽기 (없거나 깨졌으면 빈 상태로 시작)"""
+        if not os.path.exists(self.path):
+            print(f'   📂 체크포인트 없음 → 전체 수집 ({self.path})')
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f'   ⚠️ 체크포인트 읽기 실패 → 전체 수집: {e}')
+            return
+
+        if data.get('version') != self.VERSION:
+            print(f'   ⚠️ 체크포인트 버전 불일치 → 전체 수집')
+            return
+
+        self.channels = data.get('channels', {})
+        print(f'   📂 체크포인트 로드: {len(self.channels)}개 채널 ({self.path})')
+
+    def save(self):
+        """체크포인트를 원자적으로 저장 (임시 파일 → 교체)"""
+        data = {
+            'version': self.VERSION,
+            'saved_at': datetime.now().isoformat(),
+            'channels': self.channels,
+        }
+        tmp_path = f"{self.path}.tmp"
+
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            print(f'   💾 체크포인트 저장: {len(self.channels)}개 채널')
+        except OSError as e:
+            print(f'   ⚠️ 체크포인트 저장 실패 (다음 실행은 전체 수집): {e}')
+
+    def get_last_message_id(self, guild_id, channel_id):
+        """채널에서 마지막으로 처리한 메시지 ID (없으면 None)"""
+        entry = self.channels.get(self.channel_key(guild_id, channel_id))
+        return entry.get('last_message_id') if entry else None
+
+    def get_retained_messages(self, guild_id, channel_id, window_start):
+        """이전 실행에서 필터링된 메시지 중 윈도우 안에 남은 것들"""
+        entry = self.channels.get(self.channel_key(guild_id, channel_id))
+        if not entry:
+            return []
+        return self.load_messages(entry.get('messages', []), window_start)
+
+    def get_author_messages(self, author, window_start):
+        """모든 채널의 보존 메시지 중 한 작성자의 것 (맥락 그룹을 다시 만들 때 사용)"""
+        stored_messages = [
+            stored
+            for entry in self.channels.values()
+            for stored in entry.get('messages', [])
+            if stored.get('author') == author
+        ]
+        return self.load_messages(stored_messages, window_start)
+
+    @staticmethod
+    def load_messages(stored_messages, window_start):
+        """저장된 메시지의 시간을 datetime으로 되돌리고 윈도우 안의 것만 반환"""
+        retained = []
+        for stored in stored_messages:
+            message_data = dict(stored)
+            message_data['created_at'] = datetime.fromisoformat(stored['created_at'])
+            if message_data['created_at'] >= window_start:
+                retained.append(message_data)
+        return retained
+
+    def update_channel(self, guild_id, channel_id, last_message_id, messages):
+        """채널 커서와 보존 메시지 갱신"""
+        self.channels[self.channel_key(guild_id, channel_id)] = {
+            'last_message_id': last_message_id,
+            'messages': [
+                {**msg, 'created_at': msg['created_at'].isoformat()}
+                for msg in messages
+            ],
+        }
@@ -0,0 +1,398 @@
+# src/collection_engine.py
+import discord
+import os
+import asyncio
+from datetime import datetime, timedelta
+import pytz
+
+from batch_client import BatchClient, list_readable_channels
+from collection_checkpoint import CollectionCheckpoint
+from context_grouping import build_context_groups
+from keyword_analytics import KeywordAnalytics, keyword_analysis_period
+from manual_verification import ManualVerificationScorer, manual_test_period
+from message_archive import MessageArchive, is_archive_enabled, is_offline_mode
+from raw_history import HISTORY_PAGE_SIZE, HistoryPager, to_snowflake
+from schedule_filter import filter_schedule_records
+
+def get_collect_concurrency():
+    """동시에 수집할 채널 수 (COLLECT_CONCURRENCY 환경변수, 기본 4)"""
+    try:
+        return max(1, int(os.getenv('COLLECT_CONCURRENCY', '4')))
+    except ValueError:
+        return 4
+
+async def gather_with_concurrency(limit, coroutines):
+    """최대 limit개씩만 동시에 실행하고, 입력 순서대로 결과 반환"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines))
+
+class MessageConsumer:
+    """수집 엔진에 등록하는 소비자 기본 클래스
+
+    start~end(없으면 현재) 사이의 메시지만 페이지 단위로 받는다.
+    엔진은 모든 소비자의 기간을 합쳐서 채널마다 한 번만 훑고, 채널마다
+    start_channel → channel_window → add_page... → finish_channel 순서로 호출한다.
+    """
+
+    name = '소비자'
+
+    def __init__(self, start, end=None):
+        self.start = start
+        self.end = end
+        self.start_ms = int(start.timestamp() * 1000)
+        self.end_ms = int(end.timestamp() * 1000) if end is not None else None
+        self.received = 0
+
+    def covers(self, record):
+        """history(after=start, before=end)와 같은 기준 (양 끝 제외)"""
+        return record.timestamp > self.start_ms and (self.end_ms is None or record.timestamp < self.end_ms)
+
+    async def start_channel(self, guild, channel):
+        """채널 수집 시작 (기본: 아무것도 안 함)"""
+
+    def channel_window(self, guild, channel):
+        """이 채널에서 받을 구간 (after, before) - 기본은 소비자 기간"""
+        return self.start, self.end
+
+    async def add_page(self, records):
+        """기간 안의 메시지 한 페이지 반영 (기본: 한 개씩 add)"""
+        self.received += len(records)
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        """메시지 하나 반영 (기본: 아무것도 안 함 - add_page를 덮어쓴 소비자는 구현하지 않아도 됨)"""
+
+    async def finish_channel(self, guild, channel, newest_message_id, error):
+        """채널 수집 완료, newest_message_id는 받은 가장 최근 메시지 ID (봇 포함, 없으면 None)"""
+
+    async def finish(self):
+        """수집이 끝난 뒤 결과 정리/출력"""
+
+class SchedulePrefilterConsumer(MessageConsumer):
+    """일정 후보 필터 + 맥락 묶기 (운영 60일 수집 / 7일 테스트 샘플)
+
+    checkpoint가 있으면 채널별 커서와 보존 후보를 갱신하고, incremental이면 마지막으로
+    처리한 메시지 이후만 받아서 이전 실행에서 걸러 둔 후보(보존 윈도우)를 이어 붙인다.
+    grouper가 있으면 후보를 모아두지 않고 맥락 묶기(파이프라인)로 바로 흘려보낸다.
+    """
+
+    def __init__(self, days=60, name=None, checkpoint=None, incremental=True, grouper=None):
+        kst = pytz.timezone('Asia/Seoul')
+        super().__init__(datetime.now(kst) - timedelta(days=days))
+        self.name = name or f'일정 후보 필터 ({days}일)'
+        self.checkpoint = checkpoint
+        self.incremental = incremental
+        self.grouper = grouper
+        self.candidates = []
+        self.context_groups = []
+        self.filtered = 0
+        self.retained = 0
+        self.cursors = {}            # 채널 ID → 체크포인트 커서 (이 ID 이후만 받음)
+        self.channel_candidates = {} # 채널 ID → 보존 + 새 후보 (체크포인트 갱신용)
+        self.updated_channels = 0
+
+    async def start_channel(self, guild, channel):
+        """체크포인트에서 커서와 보존 후보를 가져오고, 파이프라인 모드면 채널 등록"""
+        cursor = self.checkpoint.get_last_message_id(guild.id, channel.id) if self.checkpoint and self.incremental else None
+        if cursor and discord.utils.snowflake_time(cursor) > self.start:
+            self.cursors[channel.id] = cursor
+            history_start = discord.utils.snowflake_time(cursor)
+            retained = self.checkpoint.get_retained_messages(guild.id, channel.id, self.start)
+        else:
+            history_start = self.start
+            retained = []
+
+        self.channel_candidates[channel.id] = list(retained)
+        self.retained += len(retained)
+        if self.grouper:
+            # 수집을 시작할 때 등록해야 아직 시작 안 한 채널 때문에 맥락 묶기가 멈추지 않음
+            key = CollectionCheckpoint.channel_key(guild.id, channel.id)
+            await self.grouper.register_channel(key, history_start, retained)
+        else:
+            self.candidates.extend(retained)
+
+    def channel_window(self, guild, channel):
+        cursor = self.cursors.get(channel.id)
+        if cursor is None:
+            return self.start, self.end
+        return discord.Object(id=cursor), self.end
+
+    def covers(self, record):
+        # 다른 소비자 구간과 합쳐서 받은 커서 이전 메시지는 이미 처리했으므로 제외
+        cursor = self.cursors.get(record.channel_id)
+        return super().covers(record) and (cursor is None or record.id > cursor)
+
+    async def add_page(self, records):
+        # 페이지 단위 배치 점수화 (메시지마다 점수화하지 않음)
+        self.received += len(records)
+        candidates = filter_schedule_records(records)
+        self.filtered += len(candidates)
+
+        channel_candidates = self.channel_candidates.get(records[0].channel_id)
+        if channel_candidates is not None:
+            channel_candidates.extend(candidates)
+
+        if self.grouper:
+            key = CollectionCheckpoint.channel_key(records[0].guild_id, records[0].channel_id)
+            await self.grouper.add(key, candidates, records[-1].created_at)
+        else:
+            self.candidates.extend(candidates)
+
+    async def finish_channel(self, guild, channel, newest_message_id, error):
+        """커서와 보존 후보 갱신 (오류가 나면 커서는 그대로 두고 다음 실행에서 재수집)"""
+        channel_candidates = self.channel_candidates.pop(channel.id, [])
+        if self.grouper:
+            await self.grouper.finish_channel(CollectionCheckpoint.channel_key(guild.id, channel.id))
+
+        # 봇 메시지만 받았어도 커서는 전진, 새 메시지가 없으면 기존 커서 유지
+        newest_message_id = max(newest_message_id or 0, self.cursors.get(channel.id) or 0)
+        if self.checkpoint and not error and newest_message_id:
+            self.checkpoint.update_channel(guild.id, channel.id, newest_message_id, channel_candidates)
+            self.updated_channels += 1
+
+    async def finish(self):
+        rate = f"{self.filtered / self.received * 100:.2f}%" if self.received else "0%"
+        print(f'\n🔍 {self.name}: {self.received:,}개 → {self.filtered:,}개 ({rate})')
+        if self.retained:
+            print(f'   📂 보존 윈도우: {self.retained:,}개 (이전 실행에서 필터링됨)')
+
+        if self.checkpoint and self.updated_channels:
+            self.checkpoint.save()
+
+        if self.candidates:
+            self.context_groups = build_context_groups(self.candidates)
+            print(f'   🔗 맥락 묶기 완료: {len(self.context_groups)}개 그룹')
+
+class KeywordStatsConsumer(MessageConsumer):
+    """키워드 분석 통계 (KeywordAnalytics에 스트리밍으로 누적)"""
+
+    name = '키워드 분석'
+
+    def __init__(self, analytics=None):
+        super().__init__(*keyword_analysis_period())
+        self.analytics = analytics or KeywordAnalytics()
+
+    def add(self, record):
+        self.analytics.add(record)
+
+    async def finish(self):
+        self.analytics.report()
+
+class ManualVerificationConsumer(MessageConsumer):
+    """데이터 기반 키워드 점수 필터의 수동 검증용 결과"""
+
+    name = '수동 검증'
+
+    def __init__(self, scorer=None):
+        super().__init__(*manual_test_period())
+        self.scorer = scorer or ManualVerificationScorer()
+
+    def add(self, record):
+        self.scorer.process_record(record)
+
+    async def finish(self):
+        self.scorer.print_filter_summary(self.received)
+        await self.scorer.analyze_for_manual_verification()
+
+def merge_windows(windows):
+    """구간 (after, before)들을 겹치는 것끼리 합친 목록 (before None = 현재까지)"""
+    windows = sorted(windows, key=lambda window: window[0])
+    merged = []
+    for start, end in windows:
+        if merged and (merged[-1][1] is None or start <= merged[-1][1]):
+            last_start, last_end = merged[-1]
+            merged[-1] = (last_start, None if last_end is None or end is None else max(last_end, end))
+        else:
+            merged.append((start, end))
+    return merged
+
+async def dispatch_page(page, consumers, archive=None):
+    """한 페이지를 아카이브에 한 번 저장하고, 기간이 맞는 소비자들에게 나눠 전달"""
+    if archive:
+        archive.add_records(page)
+    for consumer in consumers:
+        records = [record for record in page if consumer.covers(record)]
+        if records:
+            await consumer.add_page(records)
+
+def channel_windows(guild, channel, consumers):
+    """소비자별 채널 구간을 스노우플레이크 ID로 맞춰서 합친 수집 구간 목록"""
+    return merge_windows([
+        (to_snowflake(after, high=True), to_snowflake(before))
+        for after, before in (consumer.channel_window(guild, channel) for consumer in consumers)
+    ])
+
+async def crawl_channel(client, guild, channel, label, consumers, archive):
+    """채널 하나를 구간별로 한 번씩 훑어서 소비자들에게 전달 → (처리 개수, 오류)"""
+    processed = 0
+    error = None
+    newest_message_id = None
+
+    for consumer in consumers:
+        await consumer.start_channel(guild, channel)
+    windows = channel_windows(guild, channel, consumers)
+
+    # 진척도 표시: 메시지 시각이 수집 구간의 몇 %까지 왔는지 (추가 API 호출 없음)
+    window_start = discord.utils.snowflake_time(windows[0][0])
+    window_seconds = max((discord.utils.utcnow() - window_start).total_seconds(), 1)
+    next_progress_mark = 25
+
+    try:
+        for after, before in windows:
+            # 봇 메시지를 뺀 레코드가 Discord 한 페이지(100개) 단위로 옴
+            pager = HistoryPager(
+                client, channel,
+                after=discord.Object(id=after),
+                before=discord.Object(id=before) if before is not None else None,
+            )
+            async for page in pager.pages():
+                # 봇 메시지도 커서는 전진시킴
+                newest_message_id = max(newest_message_id or 0, pager.newest_message_id or 0) or None
+                if not page:
+                    continue
+
+                processed += len(page)
+                await dispatch_page(page, consumers, archive)
+
+                last_created_at = page[-1].created_at
+                progress_pct = (last_created_at - window_start).total_seconds() / window_seconds * 100
+                if progress_pct >= next_progress_mark:
+                    print(f'    📈 {label} 진행: {progress_pct:.0f}% ({last_created_at.strftime("%m-%d")}까지, {processed:,}개)', flush=True)
+                    next_progress_mark = (int(progress_pct) // 25 + 1) * 25
+
+    except discord.Forbidden:
+        error = '접근 권한 없음'
+    except Exception as e:
+        error = f'오류: {str(e)[:50]}...'
+
+    for consumer in consumers:
+        await consumer.finish_channel(guild, channel, newest_message_id, error)
+
+    return processed, error
+
+async def crawl(client, consumers):
+    """로그인한 클라이언트로 모든 서버/채널을 한 번 훑어서 소비자들에게 전달 → 처리한 메시지 수"""
+    concurrency = get_collect_concurrency()
+
+    print(f'\n📥 통합 수집: 소비자 {len(consumers)}개 → 채널당 1회 수집')
+    for consumer in consumers:
+        end = consumer.end.strftime("%Y-%m-%d") if consumer.end else '현재'
+        print(f'   • {consumer.name}: {consumer.start.strftime("%Y-%m-%d")} ~ {end}')
+    print(f'⚡ 동시 수집 채널 수: {concurrency}')
+
+    # 받은 메시지는 로컬 아카이브에도 저장 (소비자 수와 무관하게 한 번)
+    archive = MessageArchive() if is_archive_enabled() else None
+    total_processed = 0
+
+    try:
+        # 채널 접근 권한 확인 (게이트웨이 캐시 또는 REST 조회)
+        for guild, readable_channels in await list_readable_channels(client):
+            print(f'\n🏢 서버: {guild.name}')
+
+            labels = [
+                f'[{i+1:2d}/{len(readable_channels):2d}] #{channel.name}'
+                for i, channel in enumerate(readable_channels)
+            ]
+            results = await gather_with_concurrency(concurrency, [
+                crawl_channel(client, guild, channel, label, consumers, archive)
+                for channel, label in zip(readable_channels, labels)
+            ])
+
+            # 채널 순서대로 결과 출력 (결정적 결과)
+            for label, (processed, error) in zip(labels, results):
+                total_processed += processed
+                status = f'❌ {error} ({processed:,}개까지 반영)' if error else f'📊 {processed:4d}개 수집완료'
+                print(f'  📝 {label:<28s} {status}')
+    finally:
+        if archive:
+            archive.close()
+
+    print(f'\n📊 통합 수집 완료: {total_processed:,}개 메시지')
+    return total_processed
+
+async def crawl_archive(consumers):
+    """Discord 대신 로컬 아카이브를 한 번 읽어서 소비자들에게 전달 → 처리한 메시지 수"""
+    windows = merge_windows([(consumer.start, consumer.end) for consumer in consumers])
+    print(f'\n🗄️  오프라인 모드: 로컬 아카이브에서 메시지를 읽습니다... (소비자 {len(consumers)}개)')
+
+    total_processed = 0
+    with MessageArchive() as archive:
+        for after, before in windows:
+            page = []
+            for record in archive.iter_records(after=after, before=before):
+                total_processed += 1
+                page.append(record)
+                if len(page) >= HISTORY_PAGE_SIZE:
+                    await dispatch_page(page, consumers)
+                    page = []
+            if page:
+                await dispatch_page(page, consumers)
+
+    print(f'   📥 아카이브 메시지: {total_processed:,}개')
+    return total_processed
+
+async def finish_consumers(consumers):
+    """소비자들의 결과 정리/출력 (하나가 실패해도 나머지는 진행)"""
+    for consumer in consumers:
+        print(f'\n' + '=' * 70)
+        print(f'📋 {consumer.name} 결과')
+        print('=' * 70)
+        try:
+            await consumer.finish()
+        except Exception as e:
+            print(f'❌ {consumer.name} 결과 처리 오류: {e}')
+
+class CollectionEngine(BatchClient):
+    """한 번 로그인해서 등록된 소비자들을 위해 히스토리를 한 번만 훑는 수집기"""
+
+    def __init__(self, consumers, **options):
+        # Discord 봇 초기화 (배치 수집용 최소 인텐트/캐시, options로 덮어쓰기 가능)
+        super().__init__(**options)
+
+        self.consumers = consumers
+
+    async def run_batch(self):
+        """로그인 후 통합 수집"""
+        await crawl(self, self.consumers)
+
+async def run_consumers(consumers):
+    """소비자들을 위해 한 번 수집(또는 오프라인 아카이브 읽기)하고 결과 정리"""
+    if not consumers:
+        print("❌ 등록된 소비자가 없습니다.")
+        return consumers
+
+    if is_offline_mode():
+        await crawl_archive(consumers)
+        await finish_consumers(consumers)
+        return consumers
+
+    # 환경변수에서 Discord 토큰 가져오기
+    token = os.getenv('DISCORD_TOKEN')
+
+    if not token:
+        print("❌ 오류: DISCORD_TOKEN이 설정되지 않았습니다!")
+        return consumers
+
+    engine = CollectionEngine(consumers)
+
+    try:
+        await engine.start_batch(token)
+
+    except discord.LoginFailure:
+        print("❌ 로그인 실패: Discord 토큰이 잘못되었습니다!")
+
+    except Exception as e:
+        print(f"❌ 예상치 못한 오류 발생: {e}")
+
+    finally:
+        # 안전한 연결 종료
+        await engine.close_batch()
+
+    await finish_consumers(consumers)
+    return consumers
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Discord Schedule Bot - 통합 수집 실행 파일
+운영 일정 수집 / 키워드 분석 / 수동 검증 / 7일 테스트를 한 번의 히스토리 수집으로 같이 실행
+"""
+
+import asyncio
+import sys
+import os
+from datetime import datetime
+import pytz
+
+from collection_engine import (
+    KeywordStatsConsumer,
+    ManualVerificationConsumer,
+    SchedulePrefilterConsumer,
+    run_consumers,
+)
+from discord_collector import make_schedule_consumer
+
+# AI / Calendar 모듈은 조건부 import (분석 작업만 돌릴 때는 불필요)
+try:
+    from ai_classifier import classify_schedule_messages
+    AI_AVAILABLE = True
+except ImportError:
+    AI_AVAILABLE = False
+
+try:
+    from calendar_manager import add_schedules_to_google_calendar
+    CALENDAR_AVAILABLE = True
+except ImportError:
+    CALENDAR_AVAILABLE = False
+
+# 작업 이름 → 소비자 생성
+JOB_FACTORIES = {
+    'schedule': make_schedule_consumer,
+    'keywords': KeywordStatsConsumer,
+    'manual': ManualVerificationConsumer,
+    'test': lambda: SchedulePrefilterConsumer(days=7, name='7일 테스트 샘플'),
+}
+
+def get_collection_jobs():
+    """같이 실행할 작업 목록 (COLLECTION_JOBS, 쉼표 구분, 기본 schedule,keywords)"""
+    jobs = []
+    for job in os.getenv('COLLECTION_JOBS', 'schedule,keywords').split(','):
+        job = job.strip().lower()
+        if not job:
+            continue
+        if job not in JOB_FACTORIES:
+            print(f"⚠️  알 수 없는 작업 무시: {job} (가능: {', '.join(JOB_FACTORIES)})")
+            continue
+        if job not in jobs:
+            jobs.append(job)
+    return jobs
+
+async def process_schedule_groups(context_groups):
+    """운영 작업의 맥락 그룹 → AI 분류 → 캘린더 (main.py 순차 실행과 같은 흐름)"""
+    if not context_groups:
+        print("❌ 일정 후보 맥락 그룹이 없습니다.")
+        return
+
+    if not AI_AVAILABLE:
+        print("❌ AI 모듈을 불러올 수 없어 일정 분류를 건너뜁니다.")
+        return
+
+    print(f"\n" + "=" * 70)
+    print(f"🤖 AI 일정 분류: {len(context_groups):,}개 맥락 그룹")
+    print("=" * 70)
+
+    schedules, non_schedules = await classify_schedule_messages(context_groups)
+    print(f"   📅 일정 발견: {len(schedules)}개 / 💬 일정 아님: {len(non_schedules)}개")
+
+    if not schedules:
+        return
+
+    if not CALENDAR_AVAILABLE:
+        print("❌ Calendar 모듈을 불러올 수 없어 캘린더 연동을 건너뜁니다.")
+        return
+
+    calendar_success = await add_schedules_to_google_calendar(schedules, non_schedules)
+    if calendar_success:
+        print(f"\n✅ Google Calendar 연동 완료!")
+    else:
+        print(f"\n❌ Google Calendar 연동 실패")
+
+async def main():
+    """통합 수집 메인 함수"""
+    print("=" * 70)
+    print("📥 Discord Schedule Bot - 통합 수집 (히스토리 1회 수집)")
+    print("=" * 70)
+
+    jobs = get_collection_jobs()
+    if not jobs:
+        print("❌ 실행할 작업이 없습니다. COLLECTION_JOBS를 확인해주세요.")
+        return
+
+    print(f"🧩 작업: {', '.join(jobs)}")
+
+    kst = pytz.timezone('Asia/Seoul')
+    start_time = datetime.now(kst)
+    print(f"🕐 실행 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')} (KST)")
+
+    consumers = {job: JOB_FACTORIES[job]() for job in jobs}
+
+    try:
+        await run_consumers(list(consumers.values()))
+
+        # 운영 작업만 AI 분류/캘린더까지 진행 (7일 테스트 샘플은 수집 결과만 출력)
+        if 'schedule' in consumers:
+            await process_schedule_groups(consumers['schedule'].context_groups)
+
+    except KeyboardInterrupt:
+        print(f"\n⏸️  사용자에 의해 중단되었습니다.")
+
+    except Exception as e:
+        print(f"\n❌ 통합 수집 오류: {e}")
+        sys.exit(1)
+
+    duration = datetime.now(kst) - start_time
+    print(f"\n⏱️  소요: {duration.total_seconds():.1f}초")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+# src/context_grouping.py
+from datetime import timedelta
+
+# 같은 작성자의 메시지를 하나로 묶는 시간 범위 (첫 메시지 기준 5분)
+CONTEXT_WINDOW_SECONDS = 300
+
+def make_context_group(context_messages):
+    """묶인 메시지들로 맥락 그룹 딕셔너리 생성"""
+    first = context_messages[0]
+    combined_content = ' '.join([m['content'] for m in context_messages])
+
+    return {
+        'id': f"context_{first['id']}",
+        'content': combined_content,
+        'author': first['author'],
+        'channel': first['channel'],
+        'created_at': first['created_at'],
+        'message_count': len(context_messages),
+        'is_context_grouped': len(context_messages) > 1,
+        'total_length': len(combined_content),
+    }
+
+def group_context_messages(messages, window_seconds=CONTEXT_WINDOW_SECONDS):
+    """작성자별 슬라이딩 윈도우로 묶은 메시지 리스트들 (메시지당 한 번만 처리)
+
+    시간순으로 한 번 훑으면서 작성자마다 열린 그룹 하나만 유지한다.
+    그룹의 첫 메시지로부터 window_seconds 이내면 같은 그룹에 붙이고,
+    벗어나면 그 메시지로 새 그룹을 연다. (기존 이중 루프와 같은 결과)
+    """
+    window = timedelta(seconds=window_seconds)
+    all_messages_sorted = sorted(messages, key=lambda x: x['created_at'])
+
+    grouped_messages = []   # 그룹 생성 순서 = 첫 메시지 시간 순서
+    open_groups = {}        # 작성자 → (첫 메시지 시간, 그룹 메시지 리스트)
+    processed_message_ids = set()
+
+    for msg in all_messages_sorted:
+        if msg['id'] in processed_message_ids:
+            continue
+        processed_message_ids.add(msg['id'])
+
+        current = open_groups.get(msg['author'])
+        if current is not None and msg['created_at'] - current[0] <= window:
+            current[1].append(msg)
+        else:
+            context_messages = [msg]
+            open_groups[msg['author']] = (msg['created_at'], context_messages)
+            grouped_messages.append(context_messages)
+
+    return grouped_messages
+
+def build_context_groups(messages, window_seconds=CONTEXT_WINDOW_SECONDS):
+    """작성자별 슬라이딩 윈도우로 맥락 그룹 생성"""
+    return [make_context_group(context_messages) for context_messages in group_context_messages(messages, window_seconds)]
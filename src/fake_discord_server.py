@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Discord Schedule Bot - 가짜 Discord API 서버
+실제 Discord 없이 수집기를 대량 데이터/지연/레이트 리밋 조건에서 실행해 보기 위한 로컬 서버
+(DISCORD_API_BASE=http://127.0.0.1:8765/api/v10 으로 REST, DISCORD_GATEWAY_URL=ws://127.0.0.1:8765/gateway 로 게이트웨이 연결)
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+
+from aiohttp import WSMsgType, web
+
+from message_record import DISCORD_EPOCH_MS, ms_to_snowflake
+
+API_PREFIX = '/api/v10'
+GATEWAY_PATH = '/gateway'
+
+BOT_USER_ID = 500000000000000001
+APPLICATION_ID = 500000000000000002
+
+# 메시지 내용 조각 (일정 후보와 일반 대화가 섞이도록)
+SCHEDULE_PHRASES = ['내일 오후 3시 합주', '토요일 7시 리허설', '8월 9일 콘서트', '다음주 금요일 합주 있어요',
+                    '오늘 저녁 8시 연습', '콜타임 5시 30분', '모레 현합 잡을게요', '수요일 세팅 확인 부탁드립니다']
+CHAT_PHRASES = ['ㅋㅋㅋㅋ', '넵 확인했습니다', '밥 먹고 갈게요', '감사합니다!', '곡 순서 공유드려요', '오늘 고생하셨어요',
+                '주차 어디에 해요', '악보 올려주세요', '저 조금 늦어요', '좋아요']
+
+# @everyone 역할 권한: 채널 보기 + 메시지 보내기 + 히스토리 읽기 (관리자 권한은 없어서 채널 덮어쓰기가 적용됨)
+READ_MESSAGE_HISTORY = 1 << 16
+EVERYONE_PERMISSIONS = str((1 << 10) | (1 << 11) | READ_MESSAGE_HISTORY)
+
+def get_int_env(name, default):
+    """정수 환경변수 (없거나 잘못되면 기본값)"""
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+def get_float_env(name, default):
+    """실수 환경변수 (없거나 잘못되면 기본값)"""
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+def json_response(data, status=200, headers=None):
+    """JSON 응답 (discord.py는 Content-Type이 정확히 application/json일 때만 JSON으로 읽으므로 charset을 붙이지 않음)"""
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    return web.Response(body=body, status=status, headers=headers, content_type='application/json')
+
+class FakeDiscordConfig:
+    """가짜 서버 설정 (FAKE_DISCORD_* 환경변수)"""
+
+    def __init__(self):
+        self.seed = get_int_env('FAKE_DISCORD_SEED', 42)
+        self.guilds = get_int_env('FAKE_DISCORD_GUILDS', 2)
+        self.channels = get_int_env('FAKE_DISCORD_CHANNELS', 5)               # 서버당 텍스트 채널 수
+        self.messages = get_int_env('FAKE_DISCORD_MESSAGES', 2000)            # 채널당 메시지 수
+        self.days = get_int_env('FAKE_DISCORD_DAYS', 60)                      # 메시지가 흩어진 최근 기간
+        self.authors = get_int_env('FAKE_DISCORD_AUTHORS', 40)
+        self.bot_ratio = get_float_env('FAKE_DISCORD_BOT_RATIO', 0.05)        # 봇 작성자 비율
+        self.schedule_ratio = get_float_env('FAKE_DISCORD_SCHEDULE_RATIO', 0.1)
+        self.latency_ms = get_float_env('FAKE_DISCORD_LATENCY_MS', 50)        # 요청당 기본 지연
+        self.jitter_ms = get_float_env('FAKE_DISCORD_JITTER_MS', 20)          # 지연 흔들림 (0~jitter)
+        self.bucket_limit = get_int_env('FAKE_DISCORD_BUCKET_LIMIT', 50)      # 라우트 버킷당 허용 요청 수
+        self.bucket_seconds = get_float_env('FAKE_DISCORD_BUCKET_SECONDS', 1.0)
+        self.rate_limit_ratio = get_float_env('FAKE_DISCORD_429_RATIO', 0.0)  # 무작위 429 (서브 레이트 리밋) 비율
+        self.retry_after = get_float_env('FAKE_DISCORD_RETRY_AFTER', 0.2)     # 무작위 429의 retry_after
+
+class FakeDiscordData:
+    """시드로 재현 가능한 서버/채널/메시지 합성 데이터 (메시지는 채널별로 처음 요청될 때 생성)"""
+
+    def __init__(self, config):
+        self.config = config
+        self.now_ms = int(time.time() * 1000)
+        rng = random.Random(config.seed)
+
+        self.bot_user = {
+            'id': str(BOT_USER_ID), 'username': 'schedule-bot', 'discriminator': '0',
+            'global_name': None, 'avatar': None, 'bot': True, 'public_flags': 0,
+        }
+        self.users = [
+            {
+                'id': str(600000000000000000 + i), 'username': f'member{i}',
+                'discriminator': '0' if i % 5 else f'{1000 + i}',
+                'global_name': f'멤버{i}', 'avatar': None, 'public_flags': 0,
+                'bot': rng.random() < config.bot_ratio,
+            }
+            for i in range(config.authors)
+        ]
+
+        self.guilds = {}
+        self.channels = {}
+        for g in range(config.guilds):
+            guild_id = 700000000000000000 + g * 1000
+            channel_ids = []
+            for c in range(config.channels):
+                channel_id = guild_id + 1 + c
+                # 마지막 채널은 @everyone의 히스토리 읽기를 막아서 권한 필터를 확인
+                denied = config.channels > 1 and c == config.channels - 1
+                self.channels[channel_id] = {
+                    'id': str(channel_id), 'type': 0, 'guild_id': str(guild_id),
+                    'name': f'channel-{c}' if not denied else 'private-notes',
+                    'position': c, 'parent_id': None, 'topic': None, 'nsfw': False,
+                    'rate_limit_per_user': 0, 'last_message_id': None,
+                    'permission_overwrites': [
+                        {'id': str(guild_id), 'type': 0, 'allow': '0', 'deny': str(READ_MESSAGE_HISTORY)}
+                    ] if denied else [],
+                }
+                channel_ids.append(channel_id)
+            self.guilds[guild_id] = {'id': str(guild_id), 'name': f'가짜 서버 {g}', 'channel_ids': channel_ids}
+
+        self.messages = {}   # 채널 ID → 메시지 ID array (오름차순)
+
+    def guild_payload(self, guild_id):
+        guild = self.guilds[guild_id]
+        return {
+            'id': guild['id'], 'name': guild['name'], 'icon': None, 'owner_id': self.users[0]['id'],
+            'features': [], 'emojis': [], 'stickers': [], 'verification_level': 0,
+            'default_message_notifications': 0, 'explicit_content_filter': 0, 'mfa_level': 0,
+            'system_channel_flags': 0, 'premium_tier': 0, 'nsfw_level': 0, 'preferred_locale': 'ko',
+            'roles': [{
+                'id': guild['id'], 'name': '@everyone', 'permissions': EVERYONE_PERMISSIONS, 'position': 0,
+                'color': 0, 'hoist': False, 'managed': False, 'mentionable': False,
+            }],
+        }
+
+    def guild_create_payload(self, guild_id):
+        """게이트웨이 GUILD_CREATE 데이터 (채널 + 봇 자신의 멤버만)"""
+        guild = self.guilds[guild_id]
+        return {
+            **self.guild_payload(guild_id),
+            'unavailable': False, 'large': False, 'member_count': len(self.users) + 1,
+            'channels': [self.channels[channel_id] for channel_id in guild['channel_ids']],
+            'members': [self.member_payload(self.bot_user)],
+            'threads': [], 'presences': [], 'voice_states': [], 'stage_instances': [],
+            'guild_scheduled_events': [], 'joined_at': '2024-01-01T00:00:00+00:00',
+        }
+
+    @staticmethod
+    def member_payload(user):
+        return {
+            'user': user, 'roles': [], 'joined_at': '2024-01-01T00:00:00+00:00',
+            'deaf': False, 'mute': False, 'flags': 0, 'nick': None,
+        }
+
+    def channel_message_ids(self, channel_id):
+        """채널 메시지 ID 목록 (최근 days일에 흩어진 오름차순, 시드 + 채널 ID로 재현 가능)
+
+        100만 개 규모에서도 메모리를 적게 쓰도록 ID만 array로 들고 있고,
+        메시지 JSON은 페이지를 요청받을 때 ID로부터 만든다.
+        """
+        if channel_id not in self.messages:
+            rng = random.Random(self.config.seed * 1_000_003 + channel_id)
+            span_ms = self.config.days * 24 * 3600 * 1000
+            times = sorted(self.now_ms - rng.randrange(span_ms) for _ in range(self.config.messages))
+            # 같은 밀리초의 메시지도 ID가 겹치지 않도록 하위 비트에 순번
+            self.messages[channel_id] = array('q', (ms_to_snowflake(ms) + (i & 0xFFF) for i, ms in enumerate(times)))
+        return self.messages[channel_id]
+
+    def message_payload(self, channel_id, message_id):
+        """메시지 ID → API 메시지 JSON (같은 시드/ID면 항상 같은 내용)"""
+        rng = random.Random(self.config.seed ^ message_id)
+        phrases = SCHEDULE_PHRASES if rng.random() < self.config.schedule_ratio else CHAT_PHRASES
+        created_ms = (message_id >> 22) + DISCORD_EPOCH_MS
+        return {
+            'id': str(message_id), 'type': 0, 'channel_id': str(channel_id),
+            'content': rng.choice(phrases), 'author': rng.choice(self.users),
+            'timestamp': datetime.fromtimestamp(created_ms / 1000, tz=timezone.utc).isoformat(),
+            'edited_timestamp': None, 'tts': False, 'mention_everyone': False,
+            'mentions': [], 'mention_roles': [], 'attachments': [], 'embeds': [],
+            'pinned': False, 'flags': 0,
+        }
+
+class RateLimitBuckets:
+    """라우트별 고정 창 레이트 리밋 (Discord 헤더와 같은 형식)"""
+
+    def __init__(self, limit, seconds):
+        self.limit = max(1, limit)
+        self.seconds = seconds
+        self.windows = {}   # 버킷 키 → (창 시작 시각, 사용한 요청 수)
+
+    def hit(self, key):
+        """요청 하나 기록 → (허용 여부, 남은 요청 수, 창이 끝날 때까지 초)"""
+        now = time.monotonic()
+        started, used = self.windows.get(key, (now, 0))
+        if now - started >= self.seconds:
+            started, used = now, 0
+
+        reset_after = max(self.seconds - (now - started), 0.001)
+        if used >= self.limit:
+            self.windows[key] = (started, used)
+            return False, 0, reset_after
+
+        self.windows[key] = (started, used + 1)
+        return True, self.limit - used - 1, reset_after
+
+class FakeDiscordServer:
+    """aiohttp 기반 Discord REST API 흉내 (수집기가 쓰는 GET 엔드포인트만)"""
+
+    def __init__(self, config=None):
+        self.config = config or FakeDiscordConfig()
+        self.data = FakeDiscordData(self.config)
+        self.buckets = RateLimitBuckets(self.config.bucket_limit, self.config.bucket_seconds)
+        self.rng = random.Random(self.config.seed)
+        self.stats = {'requests': 0, 'rate_limited': 0, 'messages_served': 0, 'gateway_sessions': 0}
+
+    def make_app(self):
+        app = web.Application(middlewares=[self.middleware])
+        app.add_routes([
+            web.get(f'{API_PREFIX}/users/@me', self.get_me),
+            web.get(f'{API_PREFIX}/oauth2/applications/@me', self.get_application),
+            web.get(f'{API_PREFIX}/users/@me/guilds', self.get_my_guilds),
+            web.get(f'{API_PREFIX}/guilds/{{guild_id}}', self.get_guild),
+            web.get(f'{API_PREFIX}/guilds/{{guild_id}}/channels', self.get_guild_channels),
+            web.get(f'{API_PREFIX}/guilds/{{guild_id}}/members/{{user_id}}', self.get_member),
+            web.get(f'{API_PREFIX}/channels/{{channel_id}}/messages', self.get_messages),
+            web.get(GATEWAY_PATH, self.gateway),
+        ])
+        return app
+
+    @staticmethod
+    def bucket_key(request):
+        """레이트 리밋 버킷: 메서드 + 라우트 + 주요 파라미터 (채널/서버 ID)"""
+        info = request.match_info
+        major = info.get('channel_id') or info.get('guild_id') or ''
+        resource = info.route.resource
+        return f"{request.method} {resource.canonical if resource else request.path} {major}"
+
+    def rate_limit_headers(self, key, remaining, reset_after):
+        return {
+            'Via': '1.1 google',  # discord.py는 Via 없는 429를 Cloudflare 차단으로 봄
+            'X-RateLimit-Limit': str(self.buckets.limit),
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': f'{time.time() + reset_after:.3f}',
+            'X-RateLimit-Reset-After': f'{reset_after:.3f}',
+            'X-RateLimit-Bucket': f'{abs(hash(key.rsplit(" ", 1)[0])):x}',
+        }
+
+    @web.middleware
+    async def middleware(self, request, handler):
+        """지연, 인증, 레이트 리밋(버킷 초과 + 무작위 429)을 모든 요청에 적용"""
+        if request.path == GATEWAY_PATH:
+            return await handler(request)
+
+        self.stats['requests'] += 1
+        config = self.config
+
+        delay = (config.latency_ms + self.rng.random() * config.jitter_ms) / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if request.headers.get('Authorization', '') in ('', 'Bot invalid'):
+            return json_response({'message': '401: Unauthorized', 'code': 0}, status=401)
+
+        key = self.bucket_key(request)
+        allowed, remaining, reset_after = self.buckets.hit(key)
+        headers = self.rate_limit_headers(key, remaining, reset_after)
+
+        retry_after = None
+        if not allowed:
+            retry_after = reset_after
+        elif config.rate_limit_ratio > 0 and self.rng.random() < config.rate_limit_ratio:
+            retry_after = config.retry_after
+
+        if retry_after is not None:
+            self.stats['rate_limited'] += 1
+            headers['Retry-After'] = f'{retry_after:.3f}'
+            headers['X-RateLimit-Scope'] = 'user'
+            return json_response(
+                {'message': 'You are being rate limited.', 'retry_after': retry_after, 'global': False},
+                status=429, headers=headers,
+            )
+
+        try:
+            response = await handler(request)
+        except KeyError:
+            response = json_response({'message': 'Unknown Resource', 'code': 10003}, status=404)
+        response.headers.update(headers)
+        return response
+
+    async def get_me(self, request):
+        return json_response(self.data.bot_user)
+
+    async def get_application(self, request):
+        return json_response({
+            'id': str(APPLICATION_ID), 'name': 'schedule-bot', 'description': '', 'icon': None,
+            'bot_public': False, 'bot_require_code_grant': False, 'verify_key': '0' * 64,
+            'owner': self.data.users[0], 'flags': 0,
+        })
+
+    async def get_my_guilds(self, request):
+        guild_ids = sorted(self.data.guilds)
+        limit = min(int(request.query.get('limit', 200)), 200)
+        if 'before' in request.query:
+            before = int(request.query['before'])
+            guild_ids = [guild_id for guild_id in guild_ids if guild_id < before][-limit:]
+        else:
+            after = int(request.query.get('after', 0))
+            guild_ids = [guild_id for guild_id in guild_ids if guild_id > after][:limit]
+
+        return json_response([
+            {'id': str(guild_id), 'name': self.data.guilds[guild_id]['name'], 'icon': None,
+             'owner': False, 'permissions': EVERYONE_PERMISSIONS, 'features': []}
+            for guild_id in guild_ids
+        ])
+
+    async def get_guild(self, request):
+        return json_response(self.data.guild_payload(int(request.match_info['guild_id'])))
+
+    async def get_guild_channels(self, request):
+        guild = self.data.guilds[int(request.match_info['guild_id'])]
+        return json_response([self.data.channels[channel_id] for channel_id in guild['channel_ids']])
+
+    async def get_member(self, request):
+        guild_id = int(request.match_info['guild_id'])
+        self.data.guilds[guild_id]
+        user_id = int(request.match_info['user_id'])
+        user = self.data.bot_user if user_id == BOT_USER_ID else next(
+            user for user in self.data.users if int(user['id']) == user_id
+        )
+        return json_response(self.data.member_payload(user))
+
+    async def get_messages(self, request):
+        """GET /channels/{id}/messages - before/after/around + limit, 항상 최신순으로 반환"""
+        channel_id = int(request.match_info['channel_id'])
+        channel = self.data.channels[channel_id]
+        if channel['permission_overwrites']:
+            return json_response({'message': 'Missing Access', 'code': 50001}, status=403)
+
+        ids = self.data.channel_message_ids(channel_id)
+        query = request.query
+        limit = max(1, min(int(query.get('limit', 50)), 100))
+
+        if 'after' in query:
+            start = bisect_right(ids, int(query['after']))
+            page = ids[start:start + limit]
+        elif 'before' in query:
+            end = bisect_left(ids, int(query['before']))
+            page = ids[max(0, end - limit):end]
+        elif 'around' in query:
+            middle = bisect_left(ids, int(query['around']))
+            page = ids[max(0, middle - limit // 2):middle + (limit + 1) // 2]
+        else:
+            page = ids[-limit:]
+
+        self.stats['messages_served'] += len(page)
+        return json_response([self.data.message_payload(channel_id, message_id) for message_id in reversed(page)])
+
+    async def gateway(self, request):
+        """최소 게이트웨이 (HELLO → IDENTIFY/RESUME → READY + GUILD_CREATE, 하트비트 ACK)
+
+        BATCH_REST_ONLY=false로 READY 경로를 확인하기 위한 것이라 실시간 이벤트는 보내지 않는다.
+        discord.py는 압축되지 않은 텍스트 프레임도 그대로 읽으므로 zlib-stream 요청을 무시하고 JSON으로 보낸다.
+        """
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats['gateway_sessions'] += 1
+        sequence = 0
+
+        async def dispatch(event, data):
+            nonlocal sequence
+            sequence += 1
+            await ws.send_str(json.dumps({'op': 0, 't': event, 's': sequence, 'd': data}, ensure_ascii=False))
+
+        await ws.send_str(json.dumps({'op': 10, 'd': {'heartbeat_interval': 41250}}))
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            payload = json.loads(message.data)
+            op = payload.get('op')
+
+            if op == 1:    # 하트비트
+                await ws.send_str(json.dumps({'op': 11}))
+            elif op == 2:  # IDENTIFY
+                await dispatch('READY', {
+                    'v': 10, 'user': self.data.bot_user, 'session_id': f'fake-{self.config.seed}',
+                    'resume_gateway_url': f'ws://{request.host}{GATEWAY_PATH}',
+                    'guilds': [{'id': str(guild_id), 'unavailable': True} for guild_id in self.data.guilds],
+                    'application': {'id': str(APPLICATION_ID), 'flags': 0},
+                })
+                for guild_id in self.data.guilds:
+                    await dispatch('GUILD_CREATE', self.data.guild_create_payload(guild_id))
+            elif op == 6:  # RESUME
+                await dispatch('RESUMED', {})
+        return ws
+
+    def print_stats(self):
+        stats = self.stats
+        print(f"📊 가짜 Discord 서버: 요청 {stats['requests']:,}개, 429 응답 {stats['rate_limited']:,}개, "
+              f"메시지 {stats['messages_served']:,}개 전송, 게이트웨이 세션 {stats['gateway_sessions']}개")
+
+async def start_fake_server(host='127.0.0.1', port=0, config=None):
+    """현재 이벤트 루프에서 서버 시작 → (서버, runner, API 기본 URL, 게이트웨이 URL) - 점검 스크립트용"""
+    server = FakeDiscordServer(config)
+    runner = web.AppRunner(server.make_app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = runner.addresses[0][1]
+    return server, runner, f'http://{host}:{bound_port}{API_PREFIX}', f'ws://{host}:{bound_port}{GATEWAY_PATH}'
+
+def main():
+    config = FakeDiscordConfig()
+    host = os.getenv('FAKE_DISCORD_HOST', '127.0.0.1')
+    port = get_int_env('FAKE_DISCORD_PORT', 8765)
+    server = FakeDiscordServer(config)
+
+    total = config.guilds * config.channels * config.messages
+    print("=" * 70)
+    print(f"🧪 가짜 Discord API 서버: http://{host}:{port}{API_PREFIX} (게이트웨이 ws://{host}:{port}{GATEWAY_PATH})")
+    print("=" * 70)
+    print(f"   🏢 서버 {config.guilds}개 × 채널 {config.channels}개 × 메시지 {config.messages:,}개 = {total:,}개 (최근 {config.days}일, 시드 {config.seed})")
+    print(f"   ⏱️  지연 {config.latency_ms:.0f}ms (+0~{config.jitter_ms:.0f}ms), 버킷 {config.bucket_limit}회/{config.bucket_seconds:g}초, 무작위 429 {config.rate_limit_ratio:.0%}")
+    print(f"   💡 수집기 연결: DISCORD_API_BASE=http://{host}:{port}{API_PREFIX} DISCORD_GATEWAY_URL=ws://{host}:{port}{GATEWAY_PATH} DISCORD_TOKEN=fake")
+
+    try:
+        web.run_app(server.make_app(), host=host, port=port, access_log=None, print=None)
+    finally:
+        server.print_stats()
+
+if __name__ == "__main__":
+    sys.exit(main())
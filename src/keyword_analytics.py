@@ -0,0 +1,315 @@
+# src/keyword_analytics.py
+import re
+from collections import Counter
+from datetime import datetime
+import pytz
+
+# 실제 일정 날짜들 (사용자 제공 데이터, 분석/수동 검증 공용)
+ACTUAL_SCHEDULE_DATES = [
+    '2025-06-03', '2025-06-04', '2025-06-10', '2025-06-11',
+    '2025-06-17', '2025-06-18', '2025-06-20', '2025-06-25',
+    '2025-06-26', '2025-06-29', '2025-06-30', '2025-07-01',
+    '2025-07-02', '2025-07-08', '2025-07-09', '2025-07-11',
+    '2025-07-15', '2025-07-16', '2025-07-18', '2025-07-22',
+    '2025-07-23', '2025-07-25', '2025-07-29', '2025-07-30',
+    '2025-08-01', '2025-08-08', '2025-08-09'
+]
+
+# 실제 일정명들
+ACTUAL_SCHEDULE_NAMES = [
+    '라이트 합주', '더스트 합주', '라이트 현실합주', '더스트 현실합주',
+    '리허설', '콘서트'
+]
+
+# 일정 관련 메시지 판단용 넓은 키워드
+BROAD_SCHEDULE_KEYWORDS = [
+    '합주', '리허설', '연습', '콘서트', '공연', '라이트', '더스트',
+    '현실', '세팅', '사운드체크', '콜타임', '준비', '모임'
+]
+
+# 날짜/시간 키워드
+TIME_KEYWORDS = ['오늘', '내일', '모레', '언제', '몇시', '시간', '이번주', '다음주']
+
+# 시간 표현 감지 (숫자+시 패턴)
+TIME_EXPRESSION_PATTERN = r'\d{1,2}시\s*\d{0,2}분?|\d{1,2}:\d{2}|오전|오후'
+
+# 빈도를 셀 정확한 시간 패턴들 (패턴 순서대로 결과에 표시)
+PRECISE_TIME_PATTERNS = [
+    r'\d{1,2}시\s*\d{0,2}분?',  # "2시", "2시 30분", "14시 20분"
+    r'\d{1,2}:\d{2}',           # "14:30", "9:15"
+    r'오전\s*\d{1,2}시?',       # "오전 9시", "오전 9"
+    r'오후\s*\d{1,2}시?',       # "오후 3시", "오후 3"
+    r'\d{1,2}시\s*반',          # "2시 반"
+    r'\d{1,2}시경',             # "3시경"
+]
+
+# 단어 빈도에서 제외할 불용어
+STOP_WORDS = {
+    '그', '이', '저', '것', '수', '있', '는', '다', '하', '을', '를', '가', '에',
+    '와', '과', '도', '만', '까지', '부터', '으로', '로', '에서', '한테',
+    '더', '너무', '정말', '진짜', '완전', '좀', '잠깐', '근데', '그런데',
+    '아니', '네', '예', '응', '음', '어', '이제', '그냥', '일단', '하나',
+    '둘', '셋', '넷', '다섯', '여섯', '일곱', '여덟', '아홉', '열', '혹시',
+    '미르님', '제가', '역시', '여러분', '하는', '1325513395893702708'
+}
+
+# 기본 일정 키워드 (추천 키워드에 항상 포함 후보)
+CORE_KEYWORDS = ['합주', '리허설', '연습', '콘서트', '공연', '라이트', '더스트', '현실']
+
+# 시간 패턴 샘플 개수 (실제 일정일 / 기타 날짜)
+ACTUAL_SAMPLE_COUNT = 5
+OTHER_SAMPLE_COUNT = 3
+
+def keyword_analysis_period():
+    """키워드 분석 기간: 6월 1일~7월 31일"""
+    kst = pytz.timezone('Asia/Seoul')
+    start_date = datetime(2025, 6, 1, tzinfo=kst)
+    end_date = datetime(2025, 8, 1, tzinfo=kst)  # 7월 31일까지
+    return start_date, end_date
+
+class KeywordAnalytics:
+    """메시지가 도착할 때마다 키워드 통계를 갱신하는 스트리밍 분석기
+
+    메시지를 모아두지 않고 날짜별 카운터, 단어/2-gram 빈도표, 시간 패턴 빈도만
+    누적하므로 수집 기간이 길어져도 메모리가 메시지 수에 비례해 늘지 않는다.
+    (빈도표 크기는 어휘 수, 샘플은 고정 개수) 수집이 끝나면 report()로 바로 결과를 낸다.
+    """
+
+    def __init__(self, actual_schedule_dates=ACTUAL_SCHEDULE_DATES, actual_schedule_names=ACTUAL_SCHEDULE_NAMES):
+        self.actual_schedule_dates = set(actual_schedule_dates)
+        self.schedule_name_words = [
+            (name, name.lower().split()) for name in actual_schedule_names
+        ]
+
+        self.word_regex = re.compile(r'[가-힣a-z0-9]+')
+        self.time_expression_regex = re.compile(TIME_EXPRESSION_PATTERN)
+        self.precise_time_regexes = [re.compile(pattern) for pattern in PRECISE_TIME_PATTERNS]
+        self.leading_zero_regex = re.compile(r'0(\d)')
+
+        # 날짜별 카운터
+        self.messages_per_date = Counter()
+        self.related_per_date = Counter()
+
+        # 일정 관련 메시지 통계 (실제 일정일 / 기타 날짜)
+        self.total_messages = 0
+        self.related_messages = 0
+        self.actual_date_messages = 0
+        self.other_date_messages = 0
+        self.word_frequency = {True: Counter(), False: Counter()}
+        self.bigram_frequency = {True: Counter(), False: Counter()}
+
+        # 시간 패턴 빈도와 샘플
+        self.time_pattern_frequency = Counter()
+        self.time_samples = {True: [], False: []}
+
+    def add(self, record):
+        """메시지 하나 반영 (record: MessageRecord 또는 같은 키를 가진 딕셔너리)"""
+        date_str = record['date_str']
+        self.total_messages += 1
+        self.messages_per_date[date_str] += 1
+
+        content = record['content'].strip()
+        content_lower = content.lower()
+        is_actual_date = date_str in self.actual_schedule_dates
+
+        if not self.is_relevant(content_lower, is_actual_date):
+            return
+
+        self.related_messages += 1
+        self.related_per_date[date_str] += 1
+        if is_actual_date:
+            self.actual_date_messages += 1
+        else:
+            self.other_date_messages += 1
+
+        self.count_words(content_lower, is_actual_date)
+        self.count_time_patterns(content, content_lower, is_actual_date)
+
+    def is_relevant(self, content_lower, is_actual_date):
+        """일정 관련 메시지 판단 (일정명 / 일정키워드+시간표현 / 일정키워드+실제일정일)"""
+        for _, words in self.schedule_name_words:
+            if any(word in content_lower for word in words):
+                return True
+
+        if not any(keyword in content_lower for keyword in BROAD_SCHEDULE_KEYWORDS):
+            return False
+
+        if is_actual_date:
+            return True
+
+        return bool(self.time_expression_regex.search(content_lower)) or \
+            any(keyword in content_lower for keyword in TIME_KEYWORDS)
+
+    def count_words(self, content_lower, is_actual_date):
+        """단어(2글자 이상, 불용어 제외)와 2-gram 빈도 누적"""
+        words = self.word_regex.findall(content_lower)
+        word_frequency = self.word_frequency[is_actual_date]
+        bigram_frequency = self.bigram_frequency[is_actual_date]
+
+        for word in words:
+            if len(word) >= 2 and word not in STOP_WORDS:
+                word_frequency[word] += 1
+
+        for first, second in zip(words, words[1:]):
+            if first not in STOP_WORDS and second not in STOP_WORDS:
+                bigram = f"{first} {second}"
+                if len(bigram) >= 5:  # 너무 짧은 조합 제외
+                    bigram_frequency[bigram] += 1
+
+    def count_time_patterns(self, content, content_lower, is_actual_date):
+        """정확한 시간 패턴 빈도 누적 (앞자리 0은 정규화) + 샘플 보관"""
+        found_patterns = []
+        for regex in self.precise_time_regexes:
+            found_patterns.extend(regex.findall(content_lower))
+
+        if not found_patterns:
+            return
+
+        for pattern in found_patterns:
+            self.time_pattern_frequency[self.leading_zero_regex.sub(r'\1', pattern)] += 1
+
+        samples = self.time_samples[is_actual_date]
+        limit = ACTUAL_SAMPLE_COUNT if is_actual_date else OTHER_SAMPLE_COUNT
+        if len(samples) < limit:
+            samples.append((content[:60], found_patterns))
+
+    def high_precision_keywords(self):
+        """실제 일정일에 5회 이상, 기타 날짜보다 2배 이상 나온 단어 → [(단어, 빈도, 비율)]"""
+        other_words = self.word_frequency[False]
+        keywords = []
+        for word, freq in self.word_frequency[True].most_common():
+            if freq < 5:
+                break
+            ratio = freq / max(other_words.get(word, 0), 1)
+            if ratio >= 2.0:
+                keywords.append((word, freq, ratio))
+        return keywords
+
+    def final_keywords(self, high_precision_keywords):
+        """최종 추천 키워드 설명 문자열 목록"""
+        final_keywords = [
+            f"'{word}' (빈도:{freq}, 정확도:{ratio:.1f}배)"
+            for word, freq, ratio in high_precision_keywords if freq >= 10
+        ]
+
+        actual_words = self.word_frequency[True]
+        for keyword in CORE_KEYWORDS:
+            if actual_words.get(keyword, 0) >= 5:
+                final_keywords.append(f"'{keyword}' (핵심키워드:{actual_words[keyword]}회)")
+
+        return final_keywords
+
+    def report(self):
+        """누적된 통계로 분석 결과 출력 → 요약 딕셔너리"""
+        print(f'\n🔬 키워드 분석 결과')
+        print('=' * 70)
+        print(f'📅 분석 대상 날짜: {len(self.messages_per_date)}일')
+        print(f'📊 총 메시지: {self.total_messages:,}개')
+        print(f'🎯 실제 일정 날짜: {len(self.actual_schedule_dates)}일')
+
+        ratio = self.related_messages / self.total_messages * 100 if self.total_messages else 0
+        print(f'\n✅ 전체 메시지 분석 완료! (수집과 동시에 누적)')
+        print(f'   📊 일정 관련 메시지: {self.related_messages:,}개')
+        print(f'   📈 전체 대비 비율: {ratio:.2f}%')
+        print(f'   🎯 실제 일정일 메시지: {self.actual_date_messages}개')
+        print(f'   📅 기타 날짜 메시지: {self.other_date_messages}개 (False Negative 후보)')
+
+        print(f'\n📆 날짜별 일정 관련 메시지 (많은 순, 🎯 = 실제 일정일):')
+        for date_str, count in self.related_per_date.most_common(10):
+            marker = '🎯' if date_str in self.actual_schedule_dates else '📅'
+            print(f'   {marker} {date_str}: {count}개 (전체 {self.messages_per_date[date_str]}개 중)')
+
+        actual_words, other_words = self.word_frequency[True], self.word_frequency[False]
+        actual_bigrams, other_bigrams = self.bigram_frequency[True], self.bigram_frequency[False]
+
+        print(f'\n🔥 실제 일정일 상위 키워드 (빈도순):')
+        for i, (word, freq) in enumerate(actual_words.most_common(25)):
+            other_freq = other_words.get(word, 0)
+            print(f'   {i+1:2d}. {word:15s}: {freq:3d}회 (기타: {other_freq:3d}회, 비율: {freq / max(other_freq, 1):.1f}x)')
+
+        print(f'\n🔥 실제 일정일 상위 조합 키워드:')
+        for i, (bigram, freq) in enumerate(actual_bigrams.most_common(15)):
+            print(f'   {i+1:2d}. "{bigram:25s}": {freq:2d}회 (기타: {other_bigrams.get(bigram, 0)}회)')
+
+        high_precision_keywords = self.high_precision_keywords()
+        print(f'\n💎 고정밀도 일정 키워드 (실제 일정일 특화):')
+        for i, (word, freq, ratio) in enumerate(high_precision_keywords[:15]):
+            print(f'   {i+1:2d}. "{word}" - {freq}회, {ratio:.1f}배 차이')
+
+        final_keywords = self.final_keywords(high_precision_keywords)
+        print(f'\n💡 최종 추천 필터링 키워드:')
+        print('=' * 70)
+        print('✅ 최종 추천 키워드 (전체):')
+        for i, keyword in enumerate(final_keywords):
+            print(f'   {i+1:2d}. {keyword}')
+
+        self.print_keyword_categories(final_keywords)
+
+        print(f'\n🔍 시간 패턴 분석:')
+        print('=' * 70)
+        print('⏰ 발견된 정확한 시간 패턴:')
+        for i, (pattern, freq) in enumerate(self.time_pattern_frequency.most_common(15)):
+            print(f'   {i+1:2d}. "{pattern}": {freq}회')
+
+        print(f'\n⏰ 시간 패턴이 포함된 메시지 샘플:')
+        for is_actual_date, label in ((True, '🎯 실제 일정일'), (False, '📅 기타 날짜')):
+            samples = self.time_samples[is_actual_date]
+            print(f'   {label} 메시지 ({len(samples)}개 샘플):')
+            for i, (content, patterns) in enumerate(samples):
+                print(f'      {i+1}. "{content}..." → [{", ".join(patterns)}]')
+
+        print(f'\n📋 키워드 분석 최종 요약:')
+        print('=' * 70)
+        print(f'   📊 총 메시지: {self.total_messages:,}개')
+        print(f'   🎯 일정 관련 메시지: {self.related_messages:,}개')
+        print(f'   📅 실제 일정일 메시지: {self.actual_date_messages}개')
+        print(f'   📅 기타 날짜 메시지: {self.other_date_messages}개 (False Negative 후보)')
+        print(f'   🔥 고정밀도 키워드: {len(high_precision_keywords)}개')
+        print(f'   ⏰ 정확한 시간 패턴: {len(self.time_pattern_frequency)}개')
+        print(f'   💎 최종 추천 키워드: {len(final_keywords)}개')
+
+        print(f'\n💡 다음 단계 제안:')
+        print('=' * 70)
+        print('1. 🎯 위 "최종 추천 키워드"를 기존 필터링에 적용')
+        print('2. 📅 "기타 날짜 메시지"를 검토하여 놓친 일정 확인')
+        print('3. 🔧 시간 패턴을 활용한 정확도 개선')
+        print('4. 🧪 개선된 필터링으로 소규모 테스트')
+        print('5. 🚀 최종 시스템으로 전면 테스트')
+
+        return {
+            'total_messages': self.total_messages,
+            'related_messages': self.related_messages,
+            'actual_date_messages': self.actual_date_messages,
+            'other_date_messages': self.other_date_messages,
+            'high_precision_keywords': high_precision_keywords,
+            'final_keywords': final_keywords,
+        }
+
+    @staticmethod
+    def print_keyword_categories(final_keywords):
+        """추천 키워드를 카테고리별로 나눠 출력"""
+        print(f'\n📋 키워드 카테고리별 분류:')
+        print('=' * 70)
+
+        categories = [
+            ('🎯 핵심 일정 키워드:', ['합주', '리허설', '연습', '콘서트', '공연', '세팅'], []),
+            ('\n⏰ 시간 관련 키워드:', ['오늘', '내일', '이번', '언제', '시간'], []),
+            ('\n👥 팀/그룹 관련 키워드:', ['라이트', '더스트', '현실', '저희', '우리'], []),
+        ]
+        misc_words = []
+
+        for keyword in final_keywords:
+            # 키워드에서 실제 단어 추출 (따옴표와 설명 제거)
+            word = keyword.split("'")[1] if "'" in keyword else keyword
+            for _, words, matched in categories:
+                if word in words:
+                    matched.append(keyword)
+                    break
+            else:
+                misc_words.append(keyword)
+
+        for title, _, matched in categories + [('\n📝 기타 키워드:', [], misc_words)]:
+            if matched:
+                print(title)
+                for keyword in matched:
+                    print(f'   • {keyword}')
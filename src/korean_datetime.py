@@ -0,0 +1,183 @@
+# src/korean_datetime.py
+import re
+from datetime import date, datetime, timedelta
+import pytz
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 시간 정보가 없을 때 기본 시각 (오후 6시), 일정 길이
+DEFAULT_HOUR = 18
+DEFAULT_DURATION = timedelta(hours=1)
+
+# 토큰 종류 → 패턴 (같은 위치에서는 위에 있는 것이 우선)
+# 다른 토큰의 시작이 될 수 있는 부분은 lookahead로만 확인하고 소비하지 않는다
+# ("8월 7일요일"의 '일', "오후 3시"의 '3시'도 각각 토큰으로 잡히도록)
+TOKEN_PATTERNS = [
+    ('date', r'(?P<date_month>\d{1,2})월\s*(?P<date_day>\d{1,2})(?=일)'),       # "8월 8일"
+    ('hour_minute', r'(?P<hm_hour>\d{1,2})시\s*(?P<hm_minute>\d{1,2})분'),      # "2시 20분"
+    ('hour_only', r'(?P<h_hour>\d{1,2})시'),                                    # "8시"
+    ('colon', r'(?P<c_hour>\d{1,2}):(?P<c_minute>\d{2})'),                      # "14:30"
+    ('morning', r'오전(?:(?=\s*(?P<am_hour>\d{1,2})))?'),                       # "오전 9시" / "오전"
+    ('afternoon', r'오후(?:(?=\s*(?P<pm_hour>\d{1,2})))?'),                     # "오후 3시" / "오후"
+    ('relative', r'(?P<rel_word>낼모래|다음주|오늘|내일|모레|담주)'),
+    ('weekday', r'(?P<wd_char>[월화수목금토일])(?:요|욜)'),                     # "월요일", "금욜"
+    ('am_marker', r'am|아침'),
+    ('pm_marker', r'pm|밤|저녁'),
+]
+
+# 토큰이 시작될 수 있는 글자 - 나머지 위치는 대안들을 시도하지 않고 바로 건너뜀
+TOKEN_START_CHARS = r'\d오내모낼다담월화수목금토일ap밤저아'
+
+# 모든 토큰을 한 번에 찾는 단일 정규식
+TOKEN_REGEX = re.compile(
+    f'(?=[{TOKEN_START_CHARS}])(?:'
+    + '|'.join(f'(?P<{kind}>{pattern})' for kind, pattern in TOKEN_PATTERNS)
+    + ')'
+)
+
+# 상대 날짜 우선순위와 작성일 기준 일수 (다음주는 따로 계산)
+RELATIVE_DAYS = [('오늘', 0), ('내일', 1), ('모레', 2), ('낼모래', 2)]
+NEXT_WEEK_WORDS = ('다음주', '담주')
+WEEKDAY_NUMBERS = {name: number for number, name in enumerate('월화수목금토일')}
+
+def scan_tokens(text):
+    """텍스트를 한 번 훑어서 날짜/시간 토큰 수집 (text는 소문자)
+
+    종류별 첫 토큰만 남기고, 상대 날짜는 집합, 요일은 가장 이른 요일(월→일)만 남긴다.
+    """
+    found = {'relative': set(), 'weekday': None, 'am': False, 'pm': False}
+
+    for match in TOKEN_REGEX.finditer(text):
+        kind = match.lastgroup
+
+        if kind == 'relative':
+            found['relative'].add(match.group('rel_word'))
+        elif kind == 'weekday':
+            number = WEEKDAY_NUMBERS[match.group('wd_char')]
+            if found['weekday'] is None or number < found['weekday']:
+                found['weekday'] = number
+        elif kind == 'am_marker':
+            found['am'] = True
+        elif kind == 'pm_marker':
+            found['pm'] = True
+        elif kind == 'morning':
+            found['am'] = True
+            hour = match.group('am_hour')
+            if hour and 'morning' not in found:
+                found['morning'] = int(hour)
+        elif kind == 'afternoon':
+            found['pm'] = True
+            hour = match.group('pm_hour')
+            if hour and 'afternoon' not in found:
+                found['afternoon'] = int(hour)
+        elif kind not in found:
+            if kind == 'date':
+                found['date'] = (int(match.group('date_month')), int(match.group('date_day')))
+            elif kind == 'hour_minute':
+                found['hour_minute'] = (int(match.group('hm_hour')), int(match.group('hm_minute')))
+            elif kind == 'hour_only':
+                found['hour_only'] = int(match.group('h_hour'))
+            elif kind == 'colon':
+                found['colon'] = (int(match.group('c_hour')), int(match.group('c_minute')))
+
+    return found
+
+def resolve_date(found, creation_date):
+    """날짜 결정 → (날짜, 설명)
+
+    우선순위: 구체적 날짜 > 오늘 > 내일 > 모레 > 낼모래 > 다음주/담주 > 요일 > 기본값(내일)
+    """
+    # 1순위: 구체적 날짜 (작성 연도 기준, 잘못된 날짜면 상대 날짜로)
+    if 'date' in found:
+        month, day = found['date']
+        try:
+            return date(creation_date.year, month, day), '구체적 날짜'
+        except ValueError:
+            pass
+
+    # 2순위: 상대적 날짜 (작성일 기준)
+    relative = found['relative']
+    if relative:
+        for word, days in RELATIVE_DAYS:
+            if word in relative:
+                return creation_date + timedelta(days=days), f'{word} (작성일+{days})'
+
+        if any(word in relative for word in NEXT_WEEK_WORDS):
+            # 다음주 월요일 (월요일에 "다음주"라고 하면 7일 뒤)
+            days_until_next_monday = (7 - creation_date.weekday()) % 7 or 7
+            return creation_date + timedelta(days=days_until_next_monday), '다음주 월요일'
+
+    # 3순위: 요일 (오늘과 같은 요일이면 다음 주)
+    if found['weekday'] is not None:
+        days_ahead = found['weekday'] - creation_date.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        return creation_date + timedelta(days=days_ahead), '요일 계산'
+
+    return creation_date + timedelta(days=1), '기본값(내일)'
+
+def resolve_time(found):
+    """시각 결정 → (시, 분) 또는 (None, None)
+
+    우선순위: "N시 M분" > "N시"(오전/오후 추론) > "HH:MM" > "오전 N" > "오후 N"
+    """
+    if 'hour_minute' in found:
+        return found['hour_minute']
+
+    if 'hour_only' in found:
+        hour = found['hour_only']
+        if 1 <= hour <= 12 and hour != 12:
+            if found['am']:
+                pass  # 오전 그대로
+            elif found['pm'] or hour >= 6:
+                # 6-11시는 보통 오후 (합주/리허설 시간대)
+                hour += 12
+        return hour, 0
+
+    if 'colon' in found:
+        return found['colon']
+
+    if 'morning' in found:
+        return found['morning'], 0
+
+    if 'afternoon' in found:
+        return found['afternoon'] + 12, 0
+
+    return None, None
+
+def resolve_schedule_time(when_text, base_time, tz=KST):
+    """일정 시간 표현 + 작성 시각 → 결과 딕셔너리
+
+    start/end는 시간 생성에 실패하면 None. date_reason/time_reason은 디버그 출력용.
+    """
+    found = scan_tokens(when_text.lower().strip())
+    target_date, date_reason = resolve_date(found, base_time.date())
+
+    hour, minute = resolve_time(found)
+    time_reason = '시간 추출'
+    if hour is None:
+        hour, minute = DEFAULT_HOUR, 0
+        time_reason = '기본 시간'
+
+    result = {
+        'date': target_date,
+        'date_reason': date_reason,
+        'hour': hour,
+        'minute': minute,
+        'time_reason': time_reason,
+        'start': None,
+        'end': None,
+        'error': None,
+    }
+
+    try:
+        start_time = tz.localize(datetime.combine(target_date, datetime.min.time().replace(
+            hour=hour, minute=minute
+        )))
+    except ValueError as e:
+        result['error'] = str(e)
+        return result
+
+    result['start'] = start_time
+    result['end'] = start_time + DEFAULT_DURATION
+    return result
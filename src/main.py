@@ -12,10 +12,12 @@ import pytz
 
 # 프로젝트 모듈 import
 from discord_collector import collect_discord_messages
+from message_archive import is_offline_mode
 
 # AI 모듈은 조건부 import (키워드 분석 모드에서는 불필요)
 try:
     from ai_classifier import classify_schedule_messages
+    from pipeline import run_pipeline, is_pipeline_enabled
     AI_AVAILABLE = True
 except ImportError:
     AI_AVAILABLE = False
@@ -51,6 +53,35 @@ def print_environment_status():
         status = "✅ 설정됨" if os.getenv(var) else "❌ 없음"
         print(f"   {var}: {status} ({description})")
 
+async def run_pipeline_mode(start_time, kst):
+    """파이프라인 모드: 수집 → AI 분류 → 캘린더를 큐로 연결해 동시에 실행"""
+    print(f"\n" + "=" * 70)
+    print(f"🔀 수집 → AI 분류 → 캘린더 파이프라인 (단계 동시 실행)")
+    print("=" * 70)
+    
+    group_count, schedules, non_schedules, calendar_counts = await run_pipeline()
+    
+    total_analyzed = len(schedules) + len(non_schedules)
+    end_time = datetime.now(kst)
+    duration = end_time - start_time
+    
+    print(f"\n" + "=" * 70)
+    print(f"🎉 전체 시스템 실행 완료! (파이프라인 모드)")
+    print("=" * 70)
+    print(f"🕐 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🕐 종료: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"⏱️  소요: {duration.total_seconds():.1f}초 ({duration.total_seconds()/60:.1f}분)")
+    
+    print(f"\n📊 최종 성과:")
+    print(f"   📥 수집된 메시지: {group_count:,}개 그룹")
+    print(f"   🤖 AI 분석 완료: {total_analyzed:,}개")
+    print(f"   📅 발견된 일정: {len(schedules)}개")
+    if calendar_counts is not None:
+        print(f"   🗓️  캘린더 추가: {calendar_counts['added']}개 (중복 {calendar_counts['skipped']}개, 실패 {calendar_counts['failed']}개)")
+    else:
+        print(f"   🗓️  캘린더 연동: ❌ 실패 또는 사용 불가")
+    print("=" * 70)
+
 async def main():
     """메인 실행 함수 (개선된 버전)"""
     print("=" * 70)
@@ -79,6 +110,11 @@ async def main():
     print(f"🕐 실행 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')} (KST)")
     
     try:
+        # 파이프라인 모드: 단계들을 동시에 실행 (PIPELINE_MODE=false면 기존 순차 실행)
+        if not analysis_mode and AI_AVAILABLE and is_pipeline_enabled():
+            await run_pipeline_mode(start_time, kst)
+            return
+        
         # 1단계: Discord 메시지 수집
         print(f"\n" + "=" * 70)
         print(f"📥 1단계: Discord 메시지 수집 (60일 대용량 테스트)")
@@ -164,7 +200,7 @@ async def main():
             print(f"   ⏰ 기본 시간: 시간 불명확시 오전 6시로 설정")
             print(f"   📅 기본 날짜: 주간 일정은 일요일로 설정")
             
-            calendar_success = await add_schedules_to_google_calendar(schedules)
+            calendar_success = await add_schedules_to_google_calendar(schedules, non_schedules)
             
             if calendar_success:
                 print(f"\n✅ Google Calendar 연동 완료!")
@@ -240,6 +276,11 @@ def check_environment():
         print("🚀 전체 모드 - 모든 환경변수 확인")
         print("   → Discord → AI → Calendar 전체 파이프라인")
     
+    # 오프라인 모드: 로컬 아카이브에서 읽으므로 Discord 토큰 불필요
+    if is_offline_mode():
+        required_vars = [var for var in required_vars if var != 'DISCORD_TOKEN']
+        print("🗄️  오프라인 모드 - 로컬 메시지 아카이브 사용 (Discord 접속 없음)")
+    
     missing_vars = []
     present_vars = []
     
@@ -10,6 +10,8 @@ import os
 from datetime import datetime
 import pytz
 
+from message_archive import is_offline_mode
+
 # 테스트 모듈 import
 from manual_test_collector import test_data_based_filtering
 
@@ -101,6 +103,11 @@ def check_environment():
     # 테스트 모드: Discord Token만 필요
     required_vars = ['DISCORD_TOKEN']
     
+    # 오프라인 모드: 로컬 아카이브만 사용하므로 토큰 불필요
+    if is_offline_mode():
+        required_vars = []
+        print("🗄️  오프라인 모드 - 로컬 메시지 아카이브 사용 (Discord 접속 없음)")
+    
     missing_vars = []
     present_vars = []
     
@@ -0,0 +1,180 @@
+# src/manual_verification.py
+from datetime import datetime
+import pytz
+
+from keyword_analytics import ACTUAL_SCHEDULE_DATES
+from schedule_filter import DEFAULT_FILTER, KEYWORD_GROUPS, SCHEDULE_THRESHOLD, TIME_PATTERN_BONUS
+
+def manual_test_period():
+    """수동 검증 기간: 2월 1일~7월 31일 (6개월)"""
+    kst = pytz.timezone('Asia/Seoul')
+    start_date = datetime(2025, 2, 1, tzinfo=kst)
+    end_date = datetime(2025, 8, 1, tzinfo=kst)  # 7월 31일까지
+    return start_date, end_date
+
+class ManualVerificationScorer:
+    """데이터 기반 키워드 점수로 메시지를 거르고 수동 검증용 결과를 출력 (Discord 연결 없음)"""
+    
+    def __init__(self):
+        # 필터링된 메시지를 저장할 리스트
+        self.filtered_messages = []
+        
+        # 데이터 기반 키워드 (분석 결과) - 운영 필터와 같은 컴파일된 엔진 공유
+        self.keyword_filter = DEFAULT_FILTER
+        self.data_based_keywords = {
+            category: keywords for category, (_, _, keywords) in KEYWORD_GROUPS.items()
+        }
+        
+        # 실제 일정 날짜들 (검증용)
+        self.actual_schedule_dates = ACTUAL_SCHEDULE_DATES
+    
+    def evaluate_message_with_data_keywords(self, message_text):
+        """데이터 기반 키워드로 메시지 평가"""
+        # 스코어링 시스템 (텍스트를 한 번만 훑는 키워드 엔진)
+        score, hits, time_patterns = self.keyword_filter.evaluate(message_text)
+        
+        matched_keywords = [f"{label}:{keyword}" for _, label, _, keyword in hits]
+        match_reasons = []
+        
+        for category, (label, weight, _) in KEYWORD_GROUPS.items():
+            found = [keyword for hit_category, _, _, keyword in hits if hit_category == category]
+            if not found:
+                continue
+            
+            if category == 'time_related':
+                # 시간 관련 키워드는 한 줄로 묶어서 표시
+                match_reasons.append(f"{label}키워드 {found} ({weight*len(found)}점)")
+            else:
+                match_reasons.extend(f"{label}키워드 '{keyword}' ({weight}점)" for keyword in found)
+        
+        # 시간 패턴 보너스 (숫자+시)
+        if time_patterns:
+            matched_keywords.append(f"시간패턴:{time_patterns}")
+            match_reasons.append(f"시간패턴 {time_patterns} ({TIME_PATTERN_BONUS}점)")
+        
+        # 필터링 기준: 8점 이상 (데이터 기반 최적화)
+        is_schedule = score >= SCHEDULE_THRESHOLD
+        
+        return is_schedule, score, matched_keywords, match_reasons
+    
+    def process_record(self, record):
+        """공통 메시지 딕셔너리 하나를 평가해서 필터를 통과하면 저장 (통과 여부 반환)"""
+        is_schedule, score, matched_keywords, match_reasons = self.evaluate_message_with_data_keywords(record['content'])
+        
+        if not is_schedule:
+            return False
+        
+        # 실제 일정 날짜인지 확인
+        msg_date = record['date_str']
+        is_actual_schedule_date = msg_date in self.actual_schedule_dates
+        
+        # 메시지 정보 저장 (수동 검증용)
+        message_data = {
+            'id': record['id'],
+            'content': record['content'].strip(),
+            'author': record['author'],
+            'channel': record['channel'],
+            'created_at': record['created_at'],
+            'date_str': msg_date,
+            'score': score,
+            'matched_keywords': matched_keywords,
+            'match_reasons': match_reasons,
+            'is_actual_schedule_date': is_actual_schedule_date,
+            'message_length': len(record['content'])
+        }
+        self.filtered_messages.append(message_data)
+        return True
+    
+    def print_filter_summary(self, total_messages):
+        """필터링 전체 결과 출력"""
+        filtered_count = len(self.filtered_messages)
+        print(f'\n📊 6개월 데이터 기반 필터링 완료!')
+        print('=' * 70)
+        print(f'   📥 전체 메시지: {total_messages:,}개 (6개월)')
+        print(f'   🔍 필터링된 메시지: {filtered_count:,}개')
+        print(f'   📈 필터링 비율: {(filtered_count/total_messages*100):.2f}%' if total_messages > 0 else '   비율: 0%')
+    
+    async def analyze_for_manual_verification(self):
+        """수동 검증을 위한 결과 분석 및 출력"""
+        print(f'\n📋 수동 검증용 분석 결과:')
+        print('=' * 70)
+        
+        if not self.filtered_messages:
+            print("❌ 필터링된 메시지가 없습니다.")
+            return
+        
+        # 실제 일정 날짜 vs 기타 날짜 분류
+        actual_date_messages = [msg for msg in self.filtered_messages if msg['is_actual_schedule_date']]
+        other_date_messages = [msg for msg in self.filtered_messages if not msg['is_actual_schedule_date']]
+        
+        print(f'🎯 실제 일정일에 필터링된 메시지: {len(actual_date_messages)}개 (True Positive 후보)')
+        print(f'📅 기타 날짜에 필터링된 메시지: {len(other_date_messages)}개 (False Positive 후보)')
+        
+        # 점수별 분포
+        score_distribution = {}
+        for msg in self.filtered_messages:
+            score_range = f"{(msg['score']//5)*5}-{(msg['score']//5)*5+4}점"
+            score_distribution[score_range] = score_distribution.get(score_range, 0) + 1
+        
+        print(f'\n📊 점수별 분포:')
+        for score_range, count in sorted(score_distribution.items()):
+            print(f'   {score_range}: {count}개')
+        
+        # 수동 검증용 샘플 출력 (실제 일정일)
+        print(f'\n🎯 실제 일정일 샘플 (수동 검증용) - 상위 10개:')
+        print('-' * 70)
+        
+        # 점수 높은 순으로 정렬
+        actual_sorted = sorted(actual_date_messages, key=lambda x: x['score'], reverse=True)
+        
+        for i, msg in enumerate(actual_sorted[:10]):
+            print(f'\n{i+1:2d}. [점수: {msg["score"]:2d}점] {msg["date_str"]} {msg["channel"]:12s}')
+            print(f'    작성자: {msg["author"]:15s}')
+            print(f'    내용: "{msg["content"][:100]}..."')
+            print(f'    키워드: {", ".join(msg["matched_keywords"])[:80]}...')
+            print(f'    ✅ 실제 일정일: {msg["is_actual_schedule_date"]}')
+        
+        # False Positive 후보 출력
+        print(f'\n📅 False Positive 후보 (기타 날짜) - 상위 10개:')
+        print('-' * 70)
+        
+        other_sorted = sorted(other_date_messages, key=lambda x: x['score'], reverse=True)
+        
+        for i, msg in enumerate(other_sorted[:10]):
+            print(f'\n{i+1:2d}. [점수: {msg["score"]:2d}점] {msg["date_str"]} {msg["channel"]:12s}')
+            print(f'    작성자: {msg["author"]:15s}')
+            print(f'    내용: "{msg["content"][:100]}..."')
+            print(f'    키워드: {", ".join(msg["matched_keywords"])[:80]}...')
+            print(f'    ❓ 실제 일정일: {msg["is_actual_schedule_date"]}')
+        
+        # 키워드별 성능 분석
+        print(f'\n🔍 키워드별 성능 분석:')
+        print('-' * 70)
+        
+        keyword_stats = {}
+        for msg in self.filtered_messages:
+            for keyword in msg['matched_keywords']:
+                if keyword not in keyword_stats:
+                    keyword_stats[keyword] = {'total': 0, 'actual_date': 0}
+                keyword_stats[keyword]['total'] += 1
+                if msg['is_actual_schedule_date']:
+                    keyword_stats[keyword]['actual_date'] += 1
+        
+        # 정확도 기준으로 정렬
+        sorted_keywords = sorted(keyword_stats.items(), 
+                               key=lambda x: x[1]['actual_date']/x[1]['total'] if x[1]['total'] > 0 else 0, 
+                               reverse=True)
+        
+        print('키워드별 정확도 (실제 일정일 비율):')
+        for keyword, stats in sorted_keywords[:15]:
+            accuracy = stats['actual_date'] / stats['total'] * 100 if stats['total'] > 0 else 0
+            print(f'   {keyword:20s}: {accuracy:5.1f}% ({stats["actual_date"]}/{stats["total"]})')
+        
+        # 수동 검증 가이드
+        print(f'\n💡 수동 검증 가이드:')
+        print('=' * 70)
+        print('1. 🎯 "실제 일정일 샘플"을 확인하여 True Positive 비율 계산')
+        print('2. 📅 "False Positive 후보"를 확인하여 실제 오분류 파악') 
+        print('3. 🔍 키워드별 정확도를 보고 개선점 찾기')
+        print('4. 📊 전체적으로 만족스러우면 AI 단계로 진행')
+        print('5. 🛠️  개선이 필요하면 점수 기준이나 키워드 조정')
@@ -0,0 +1,105 @@
+# src/message_archive.py
+import os
+import sqlite3
+
+from message_record import MessageRecord
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id          INTEGER PRIMARY KEY,
+    guild_id    INTEGER NOT NULL,
+    guild       TEXT    NOT NULL,
+    channel_id  INTEGER NOT NULL,
+    channel     TEXT    NOT NULL,
+    author      TEXT    NOT NULL,
+    content     TEXT    NOT NULL,
+    created_at  INTEGER NOT NULL  -- UTC epoch 밀리초
+);
+CREATE INDEX IF NOT EXISTS idx_messages_guild_channel_time ON messages (guild, channel, created_at);
+CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages (created_at);
+CREATE INDEX IF NOT EXISTS idx_messages_author ON messages (author);
+"""
+
+def is_archive_enabled():
+    """수집 중 아카이브 저장 여부 (ARCHIVE_MESSAGES, 기본 true)"""
+    return os.getenv('ARCHIVE_MESSAGES', 'true').lower() == 'true'
+
+def is_offline_mode():
+    """Discord 대신 로컬 아카이브에서 읽을지 여부 (OFFLINE_MODE, 기본 false)"""
+    return os.getenv('OFFLINE_MODE', 'false').lower() == 'true'
+
+class MessageArchive:
+    """수집한 Discord 메시지를 보관하는 로컬 SQLite 아카이브"""
+
+    def __init__(self, path=None):
+        # 아카이브 파일 경로 (환경변수로 변경 가능)
+        self.path = path or os.getenv('MESSAGE_ARCHIVE_PATH', 'message_archive.db')
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """변경 사항 저장 후 연결 종료"""
+        if self.connection:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+    def add_records(self, records):
+        """메시지 레코드들 저장 (같은 ID는 최신 내용으로 덮어씀)"""
+        rows = [
+            (
+                record.id,
+                record.guild_id,
+                record.guild,
+                record.channel_id,
+                record.channel.lstrip('#'),
+                record.author,
+                record.content,
+                record.timestamp,
+            )
+            for record in records
+        ]
+        self.connection.executemany(
+            'INSERT OR REPLACE INTO messages '
+            '(id, guild_id, guild, channel_id, channel, author, content, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            rows,
+        )
+        self.connection.commit()
+        return len(rows)
+
+    def iter_records(self, after=None, before=None, guild=None, channel=None):
+        """기간/서버/채널 조건으로 메시지 레코드를 시간순으로 반환"""
+        conditions = []
+        params = []
+        if after is not None:
+            conditions.append('created_at > ?')
+            params.append(int(after.timestamp() * 1000))
+        if before is not None:
+            conditions.append('created_at < ?')
+            params.append(int(before.timestamp() * 1000))
+        if guild is not None:
+            conditions.append('guild = ?')
+            params.append(guild)
+        if channel is not None:
+            conditions.append('channel = ?')
+            params.append(channel.lstrip('#'))
+
+        query = 'SELECT id, guild_id, guild, channel_id, channel, author, content, created_at FROM messages'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY created_at, id'
+
+        for row in self.connection.execute(query, params):
+            message_id, guild_id, guild_name, channel_id, channel_name, author, content, created_ms = row
+            yield MessageRecord.create(
+                message_id, content, author, f'#{channel_name}', channel_id, guild_name, guild_id, created_ms
+            )
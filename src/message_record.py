@@ -0,0 +1,131 @@
+# src/message_record.py
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+import pytz
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 딕셔너리로 펼칠 때의 키 (기존 메시지 딕셔너리와 같은 구성)
+RECORD_KEYS = ('id', 'content', 'author', 'channel', 'channel_id', 'guild', 'guild_id', 'created_at')
+
+# Discord 스노우플레이크 기준 시각 (2015-01-01 UTC, epoch 밀리초)
+DISCORD_EPOCH_MS = 1420070400000
+
+def snowflake_to_ms(snowflake):
+    """스노우플레이크 ID → 작성 시각 (UTC epoch 밀리초)"""
+    return (int(snowflake) >> 22) + DISCORD_EPOCH_MS
+
+def ms_to_snowflake(ms, high=False):
+    """epoch 밀리초 → 그 시각의 스노우플레이크 경계값 (discord.utils.time_snowflake와 같음)"""
+    return ((ms - DISCORD_EPOCH_MS) << 22) + (2 ** 22 - 1 if high else 0)
+
+def payload_author_name(author):
+    """API author 딕셔너리 → str(discord.User)와 같은 표시 이름"""
+    discriminator = author.get('discriminator', '0')
+    if discriminator == '0':
+        return author['username']
+    return f"{author['username']}#{discriminator}"
+
+@dataclass
+class MessageRecord:
+    """수집기 공통 메시지 레코드 (메시지당 딕셔너리 대신 쓰는 작은 객체)
+
+    __slots__로 인스턴스 딕셔너리를 없애고, 시각은 UTC epoch 밀리초 정수 하나로 들고 있다.
+    작성자/채널/서버 이름은 intern해서 같은 문자열을 모든 메시지가 공유한다.
+    created_at(KST datetime), date_str, time_str 등은 필요할 때 계산하며,
+    record['created_at'] / record.get(...) / {**record} 처럼 기존 딕셔너리와 같이 읽을 수 있다.
+    """
+
+    # dataclass(slots=True)는 3.10 이상이라 직접 선언
+    __slots__ = ('id', 'content', 'author', 'channel', 'channel_id', 'guild', 'guild_id', 'timestamp')
+
+    id: int
+    content: str
+    author: str
+    channel: str
+    channel_id: int
+    guild: str
+    guild_id: int
+    timestamp: int  # UTC epoch 밀리초
+
+    @classmethod
+    def create(cls, message_id, content, author, channel, channel_id, guild, guild_id, timestamp):
+        """이름 문자열을 intern해서 레코드 생성"""
+        return cls(message_id, content, sys.intern(author), sys.intern(channel), channel_id,
+                   sys.intern(guild), guild_id, timestamp)
+
+    @classmethod
+    def from_message(cls, message):
+        """discord.Message → 레코드"""
+        return cls.create(
+            message.id,
+            message.content,
+            str(message.author),
+            f'#{message.channel.name}',
+            message.channel.id,
+            message.guild.name,
+            message.guild.id,
+            int(message.created_at.timestamp() * 1000),
+        )
+
+    @classmethod
+    def from_payload(cls, data, channel):
+        """Discord API 메시지 JSON(딕셔너리) → 레코드 (discord.Message를 만들지 않음)
+
+        작성 시각은 스노우플레이크 ID에서 계산하므로 discord.Message.created_at과 같다.
+        """
+        message_id = int(data['id'])
+        return cls.create(
+            message_id,
+            data['content'],
+            payload_author_name(data['author']),
+            f'#{channel.name}',
+            channel.id,
+            channel.guild.name,
+            channel.guild.id,
+            snowflake_to_ms(message_id),
+        )
+
+    @property
+    def created_at(self):
+        """작성 시각 (KST datetime)"""
+        return datetime.fromtimestamp(self.timestamp / 1000, tz=KST)
+
+    @property
+    def date_str(self):
+        """작성 날짜 'YYYY-MM-DD' (KST)"""
+        return self.created_at.strftime('%Y-%m-%d')
+
+    @property
+    def time_str(self):
+        """작성 시각 'HH:MM' (KST)"""
+        return self.created_at.strftime('%H:%M')
+
+    @property
+    def message_length(self):
+        return len(self.content)
+
+    @property
+    def has_mention(self):
+        return '@' in self.content
+
+    def __getitem__(self, key):
+        """기존 메시지 딕셔너리처럼 record['content'] 형태로 읽기"""
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        """{**record}, dict(record)로 펼칠 때의 키"""
+        return RECORD_KEYS
+
+    def __contains__(self, key):
+        return key in RECORD_KEYS
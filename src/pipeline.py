@@ -0,0 +1,274 @@
+# src/pipeline.py
+import asyncio
+import heapq
+import os
+from datetime import timedelta
+
+from context_grouping import CONTEXT_WINDOW_SECONDS, make_context_group
+from discord_collector import collect_archived_messages, collect_discord_messages
+from message_archive import is_offline_mode
+from ai_classifier import ScheduleClassifier
+
+# Calendar 모듈은 조건부 import
+try:
+    from calendar_manager import CalendarManager
+    CALENDAR_AVAILABLE = True
+except ImportError:
+    CALENDAR_AVAILABLE = False
+
+# 단계 사이 큐의 종료 표시
+PIPELINE_END = None
+
+def is_pipeline_enabled():
+    """수집 → 분류 → 캘린더를 동시에 실행할지 여부 (PIPELINE_MODE, 기본 true)"""
+    return os.getenv('PIPELINE_MODE', 'true').lower() == 'true'
+
+def get_queue_size():
+    """단계 사이 큐 크기 (PIPELINE_QUEUE_SIZE, 기본 200) - 최대 메모리 사용량을 결정"""
+    try:
+        return max(1, int(os.getenv('PIPELINE_QUEUE_SIZE', '200')))
+    except ValueError:
+        return 200
+
+async def drain(queue):
+    """다음 단계가 실패했을 때 앞 단계가 막히지 않도록 종료 표시까지 비우기"""
+    while await queue.get() is not PIPELINE_END:
+        pass
+
+class StreamingContextGrouper:
+    """채널별로 도착하는 일정 후보를 맥락 그룹으로 묶어서 완성되는 대로 큐에 넣기
+
+    build_context_groups와 같은 규칙(작성자별, 첫 메시지 기준 window_seconds)을 쓰되,
+    지금 수집 중인 채널들이 모두 지나간 시각(워터마크)까지의 메시지만 시간순으로 처리한다.
+    채널은 수집을 시작할 때 읽기 시작 시각으로 등록하므로 아직 시작 안 한 채널 때문에 멈추지 않는다.
+    채널은 오래된 메시지부터 읽으므로 워터마크 이전에는 더 올 메시지가 없고,
+    첫 메시지가 워터마크보다 window 이상 앞선 그룹은 더 커질 수 없어 바로 내보낸다.
+    """
+
+    def __init__(self, output_queue, window_seconds=CONTEXT_WINDOW_SECONDS, max_pending=None):
+        self.output = output_queue
+        self.window = timedelta(seconds=window_seconds)
+        self.max_pending = max_pending or get_queue_size()
+        self.positions = {}     # 수집 중인 채널 키 → 마지막으로 읽은 메시지 시각
+        self.pending = []       # 워터마크를 기다리는 메시지 힙 (시각, 순번, 메시지)
+        self.sequence = 0
+        self.open_groups = {}   # 작성자 → (첫 메시지 시간, 그룹 메시지 리스트)
+        self.released = None    # 마지막으로 처리한 워터마크
+        self.changed = asyncio.Condition()
+        self.processed_message_ids = set()
+        self.emitted = 0
+
+    async def register_channel(self, key, position, messages=()):
+        """수집을 시작하는 채널 등록, position은 이 채널이 읽기 시작하는 시각, messages는 보존 후보
+
+        이미 처리한 워터마크보다 앞에서 시작하는 채널이면 열린 그룹을 먼저 닫고
+        그 채널의 시작 시각부터 다시 묶는다 (채널 사이 묶기는 함께 수집되는 채널끼리만).
+        """
+        start = min([position, *(msg['created_at'] for msg in messages)])
+        closed = []
+        if self.released is not None and start <= self.released:
+            closed = [context_messages for _, context_messages in self.open_groups.values()]
+            self.open_groups.clear()
+            self.released = None
+
+        self.positions[key] = position
+        for context_messages in closed:
+            await self.emit(context_messages)
+        await self.add(key, messages)
+
+    async def add(self, key, messages, position=None):
+        """채널의 일정 후보 추가, position은 이 채널에서 지금까지 읽은 가장 최근 시각
+
+        대기 메시지가 max_pending을 넘으면 워터마크를 잡고 있는 채널이 따라올 때까지 기다린다.
+        """
+        for msg in messages:
+            heapq.heappush(self.pending, (msg['created_at'], self.sequence, msg))
+            self.sequence += 1
+
+        if position is not None and key in self.positions:
+            self.positions[key] = max(self.positions[key], position)
+
+        await self.release()
+
+        async with self.changed:
+            await self.changed.wait_for(lambda: len(self.pending) <= self.max_pending or self.holds_watermark(key))
+
+    def holds_watermark(self, key):
+        """이 채널이 워터마크를 잡고 있는지 (가장 뒤처진 채널은 기다리지 않고 계속 읽음)"""
+        return key not in self.positions or self.positions[key] <= min(self.positions.values())
+
+    async def finish_channel(self, key):
+        """채널 수집 완료 → 워터마크 계산에서 제외"""
+        self.positions.pop(key, None)
+        await self.release()
+
+    async def close(self):
+        """남은 메시지와 그룹을 모두 내보내고 종료 표시 전송"""
+        await self.release(final=True)
+        await self.output.put(PIPELINE_END)
+
+    async def release(self, final=False):
+        """워터마크까지 묶어서 완성된 그룹을 큐에 넣고, 기다리는 채널들을 깨우기
+
+        묶기는 동기적으로 끝내고 나서 큐에 넣으므로, 큐 대기 중에 다른 채널이
+        release를 호출해도 상태가 섞이지 않는다.
+        """
+        completed = self.collect_completed(final)
+        async with self.changed:
+            self.changed.notify_all()
+        for context_messages in completed:
+            await self.emit(context_messages)
+
+    def collect_completed(self, final=False):
+        """워터마크까지의 메시지를 시간순으로 묶고, 더 커질 수 없는 그룹들을 반환"""
+        watermark = None if final or not self.positions else min(self.positions.values())
+        self.released = watermark
+
+        completed = []
+        while self.pending and (watermark is None or self.pending[0][0] <= watermark):
+            _, _, msg = heapq.heappop(self.pending)
+            closed = self.sweep(msg)
+            if closed:
+                completed.append(closed)
+
+        for author, (first_time, context_messages) in list(self.open_groups.items()):
+            if watermark is None or watermark - first_time > self.window:
+                del self.open_groups[author]
+                completed.append(context_messages)
+
+        return completed
+
+    def sweep(self, msg):
+        """시간순 메시지 하나를 작성자의 열린 그룹에 붙이거나 새 그룹 시작 → 닫힌 그룹 (없으면 None)"""
+        if msg['id'] in self.processed_message_ids:
+            return None
+        self.processed_message_ids.add(msg['id'])
+
+        current = self.open_groups.get(msg['author'])
+        if current is not None and msg['created_at'] - current[0] <= self.window:
+            current[1].append(msg)
+            return None
+
+        self.open_groups[msg['author']] = (msg['created_at'], [msg])
+        return current[1] if current is not None else None
+
+    async def emit(self, context_messages):
+        """완성된 맥락 그룹을 다음 단계로 전달 (큐가 차면 대기 → 수집 속도 조절)"""
+        self.emitted += 1
+        await self.output.put(make_context_group(context_messages))
+
+async def collect_stage(grouper):
+    """1단계: 수집하면서 맥락 그룹을 큐로 흘려보내기"""
+    try:
+        if is_offline_mode():
+            # 아카이브는 이미 시간순 전체가 있으므로 한 번에 묶어서 흘려보냄
+            groups = await collect_archived_messages(days=60)
+            grouper.emitted += len(groups)
+            for group in groups:
+                await grouper.output.put(group)
+        else:
+            await collect_discord_messages(grouper=grouper)
+    finally:
+        await grouper.close()
+        print(f"📤 수집 단계 종료: 맥락 그룹 {grouper.emitted:,}개 전달")
+
+async def classify_stage(classifier, groups_queue, schedules_queue):
+    """2단계: 도착한 맥락 그룹을 배치로 분류, 검증된 일정은 on_schedule로 바로 전달"""
+    try:
+        await classifier.classify_stream(groups_queue, end_marker=PIPELINE_END)
+    except Exception as e:
+        print(f"❌ AI 분류 단계 오류: {e}")
+        await drain(groups_queue)
+    finally:
+        await schedules_queue.put(PIPELINE_END)
+
+async def calendar_stage(schedules_queue, classifier):
+    """3단계: 검증된 일정을 도착하는 대로 캘린더에 추가 (API 호출은 스레드에서)"""
+    if not CALENDAR_AVAILABLE:
+        print("❌ Calendar 모듈을 불러올 수 없습니다 - 일정은 결과에만 남깁니다.")
+        await drain(schedules_queue)
+        return None
+
+    try:
+        manager = await asyncio.to_thread(CalendarManager)
+    except Exception as e:
+        print(f"❌ Google Calendar 연동 실패: {e}")
+        await drain(schedules_queue)
+        return None
+
+    # 도착해 있는 일정은 배치 크기만큼 모아서 요청 목록으로 만들고, 실행은 스레드 풀에 맡김
+    # (요청이 끝나기를 기다리지 않고 다음 일정을 받으므로 분류/수집과 겹쳐서 진행)
+    # 진행 중인 쓰기 작업 (끝나면 스스로 빠지므로 실시간 모드에서도 쌓이지 않음)
+    index = 1
+    finished = False
+    pending_writes = set()
+
+    def write_done(task):
+        pending_writes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"❌ 캘린더 쓰기 오류: {task.exception()}")
+
+    def track(task):
+        pending_writes.add(task)
+        task.add_done_callback(write_done)
+
+    try:
+        while not finished:
+            chunk = [await schedules_queue.get()]
+            while len(chunk) < manager.batch_size and not schedules_queue.empty():
+                chunk.append(schedules_queue.get_nowait())
+
+            if chunk[-1] is PIPELINE_END:
+                chunk.pop()
+                finished = True
+            if not chunk:
+                continue
+
+            # 처음 보는 시간대의 일정이면 기존 이벤트 조회가 포함되므로 스레드에서 실행
+            # (한 묶음이 실패해도 큐는 계속 비워야 분류 단계가 막히지 않음)
+            try:
+                operations = await asyncio.to_thread(manager.plan_schedules, chunk, index)
+                track(asyncio.create_task(manager.run_operations_async(operations)))
+            except Exception as e:
+                print(f"❌ 캘린더 일정 처리 오류 (일정 {len(chunk)}개 건너뜀): {e}")
+                for _ in chunk:
+                    manager.count('failed')
+            index += len(chunk)
+
+        # 동기화 모드: 분류가 모두 끝난 뒤 일정 아님으로 재분류된 메시지의 이벤트 삭제
+        if manager.sync_mode:
+            non_schedule_ids = [item.get('message_id') for item in classifier.non_schedules]
+            operations = await asyncio.to_thread(manager.plan_deletes, non_schedule_ids)
+            track(asyncio.create_task(manager.run_operations_async(operations)))
+    except Exception as e:
+        print(f"❌ 캘린더 단계 오류: {e}")
+        if not finished:
+            await drain(schedules_queue)
+    finally:
+        # 오류가 나도 이미 보낸 요청은 끝까지 기다리고 스레드 풀 정리 + 결과 요약
+        await asyncio.gather(*pending_writes, return_exceptions=True)
+        manager.close()
+        manager.print_summary()
+
+    return manager.counts
+
+async def run_pipeline():
+    """수집 → AI 분류 → 캘린더를 제한된 큐로 연결해 동시에 실행
+
+    반환값: (전달된 맥락 그룹 수, 일정들, 일정 아닌 것들, 캘린더 결과 카운터 또는 None)
+    """
+    queue_size = get_queue_size()
+    groups_queue = asyncio.Queue(maxsize=queue_size)
+    schedules_queue = asyncio.Queue(maxsize=queue_size)
+    print(f"🔀 파이프라인 모드: 수집 → AI 분류 → 캘린더 동시 실행 (큐 크기 {queue_size})")
+
+    grouper = StreamingContextGrouper(groups_queue)
+    classifier = ScheduleClassifier(on_schedule=schedules_queue.put)
+
+    _, _, calendar_counts = await asyncio.gather(
+        collect_stage(grouper),
+        classify_stage(classifier, groups_queue, schedules_queue),
+        calendar_stage(schedules_queue, classifier),
+    )
+
+    return grouper.emitted, classifier.schedules, classifier.non_schedules, calendar_counts
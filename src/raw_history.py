@@ -0,0 +1,105 @@
+# src/raw_history.py
+import os
+from datetime import datetime
+
+from message_record import MessageRecord, ms_to_snowflake
+
+# Discord GET /channels/{id}/messages 한 번에 받을 수 있는 최대 개수
+HISTORY_PAGE_SIZE = 100
+
+def is_raw_history_enabled():
+    """히스토리를 discord.Message 없이 API JSON에서 바로 읽을지 여부 (RAW_HISTORY, 기본 true)"""
+    return os.getenv('RAW_HISTORY', 'true').lower() == 'true'
+
+def to_snowflake(value, high=False):
+    """datetime / discord.Object / 정수 → 스노우플레이크 ID (None은 그대로)"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return ms_to_snowflake(int(value.timestamp() * 1000), high=high)
+    return int(getattr(value, 'id', value))
+
+class HistoryPager:
+    """채널 히스토리를 오래된 순서의 레코드 페이지로 읽는 페이저
+
+    기본(raw)은 client.http.logs_from으로 받은 JSON에서 id/content/author만 꺼내서
+    MessageRecord를 바로 만든다. channel.history()처럼 메시지마다 discord.Message,
+    Member/User, 임베드, 첨부, 리액션 객체를 만들지 않는다. RAW_HISTORY=false면
+    channel.history()로 같은 페이지를 만든다. 두 방식 모두 봇 메시지는 페이지에서
+    빼지만 newest_message_id(체크포인트 커서)에는 반영한다.
+    """
+
+    def __init__(self, client, channel, after=None, before=None, raw=None):
+        self.client = client
+        self.channel = channel
+        self.after = after
+        self.before = before
+        self.raw = is_raw_history_enabled() if raw is None else raw
+        self.fetched = 0                # 받은 메시지 수 (봇 포함)
+        self.newest_message_id = None   # 지금까지 받은 가장 최근 메시지 ID (봇 포함)
+
+    def pages(self):
+        """오래된 순서의 MessageRecord 리스트(봇 제외)를 한 페이지씩 반환하는 async iterator"""
+        return self.raw_pages() if self.raw else self.model_pages()
+
+    async def raw_pages(self):
+        """GET /channels/{id}/messages?after=... 를 직접 페이징 (discord.py history의 after 전략과 같은 순서)"""
+        after_id = to_snowflake(self.after, high=True) or 0
+        before_id = to_snowflake(self.before)
+        channel = self.channel
+        from_payload = MessageRecord.from_payload
+
+        while True:
+            # after를 주면 after 바로 다음 100개가 최신순으로 옴 → 뒤집어서 오래된 순
+            data = await self.client.http.logs_from(channel.id, HISTORY_PAGE_SIZE, after=after_id)
+            if not data:
+                return
+            after_id = int(data[0]['id'])
+
+            records = []
+            for payload in reversed(data):
+                message_id = int(payload['id'])
+                if before_id is not None and message_id >= before_id:
+                    break
+                self.mark_fetched(1, message_id)
+                if payload['author'].get('bot'):
+                    continue
+                records.append(from_payload(payload, channel))
+
+            yield records
+
+            if len(data) < HISTORY_PAGE_SIZE or (before_id is not None and after_id >= before_id):
+                return
+
+    async def model_pages(self):
+        """channel.history()로 받은 discord.Message를 페이지 단위 레코드로 변환 (비교/대체 경로)"""
+        records = []
+        count = 0
+        newest_message_id = None
+
+        try:
+            async for message in self.channel.history(after=self.after, before=self.before, limit=None):
+                count += 1
+                newest_message_id = message.id
+                if not message.author.bot:
+                    records.append(MessageRecord.from_message(message))
+                if count >= HISTORY_PAGE_SIZE:
+                    self.mark_fetched(count, newest_message_id)
+                    yield records
+                    records = []
+                    count = 0
+        except Exception:
+            # 오류가 나도 이미 받은 메시지는 전달한 뒤 오류를 그대로 올림 (커서는 전달한 곳까지만)
+            if count:
+                self.mark_fetched(count, newest_message_id)
+                yield records
+            raise
+
+        if count:
+            self.mark_fetched(count, newest_message_id)
+            yield records
+
+    def mark_fetched(self, count, newest_message_id):
+        """전달한 메시지 수와 커서 갱신"""
+        self.fetched += count
+        self.newest_message_id = newest_message_id
@@ -0,0 +1,435 @@
+# src/realtime_collector.py
+import discord
+import os
+import asyncio
+import signal
+import time
+from datetime import datetime, timedelta, timezone
+import pytz
+
+from collection_checkpoint import CollectionCheckpoint
+from context_grouping import CONTEXT_WINDOW_SECONDS, group_context_messages, make_context_group
+from discord_collector import MessageCollector
+from message_archive import MessageArchive, is_archive_enabled
+from message_record import MessageRecord
+from schedule_filter import filter_schedule_records
+from pipeline import PIPELINE_END, calendar_stage, classify_stage, get_queue_size
+from ai_classifier import ScheduleClassifier
+
+# 체크포인트에 남겨두는 일정 후보 기간 (배치 수집과 같은 60일)
+RETENTION_DAYS = 60
+
+def get_float_env(name, default):
+    """실수 환경변수 (없거나 잘못되면 기본값)"""
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+def get_idle_seconds():
+    """작성자가 이만큼 조용하면 맥락 그룹을 닫고 바로 분류로 보냄 (REALTIME_IDLE_SECONDS, 기본 30초)"""
+    return get_float_env('REALTIME_IDLE_SECONDS', 30.0)
+
+def get_checkpoint_interval():
+    """실시간 수집 중 체크포인트 저장 간격 (REALTIME_CHECKPOINT_SECONDS, 기본 300초)"""
+    return get_float_env('REALTIME_CHECKPOINT_SECONDS', 300.0)
+
+def is_catchup_enabled():
+    """시작할 때 체크포인트 이후 밀린 메시지를 한 번 증분 수집할지 여부 (REALTIME_CATCHUP, 기본 true)"""
+    return os.getenv('REALTIME_CATCHUP', 'true').lower() == 'true'
+
+def to_candidate(record, reason):
+    """레코드 → 분류 단계로 보내는 메시지 딕셔너리 (filter_schedule_records 결과와 같은 형식)"""
+    return {
+        **record,
+        'filter_reason': reason,
+        'message_length': len(record.content),
+    }
+
+class RealtimeContextGrouper:
+    """실시간으로 도착하는 일정 후보를 작성자별 맥락 그룹으로 묶어서 큐로 전달
+
+    build_context_groups와 같은 규칙(작성자별, 첫 메시지 기준 window_seconds)으로 붙이되,
+    작성자가 idle_seconds 동안 조용하면 창이 끝나기 전이라도 그룹을 닫아서 바로 보낸다.
+    (idle_seconds를 창 길이 이상으로 두면 배치 수집과 같은 그룹이 만들어짐)
+    보낸 그룹은 보존 기간 동안 기억해 두었다가, 그 안의 메시지가 수정되면 같은 그룹 ID로 다시 보낸다.
+    """
+
+    def __init__(self, output_queue, window_seconds=CONTEXT_WINDOW_SECONDS, idle_seconds=None):
+        self.output = output_queue
+        self.window = timedelta(seconds=window_seconds)
+        self.idle_seconds = get_idle_seconds() if idle_seconds is None else idle_seconds
+        self.open_groups = {}   # 작성자 → {'first': 첫 메시지 시간, 'touched': 마지막 추가 시각(monotonic), 'messages': [...]}
+        self.sent_groups = {}   # 보낸 그룹의 메시지 ID → 그룹 메시지 리스트 (보낸 순서)
+        self.emitted = 0
+
+    async def add(self, msg):
+        """일정 후보 하나를 작성자의 열린 그룹에 붙이거나 새 그룹 시작"""
+        current = self.open_groups.get(msg['author'])
+        if current is not None and msg['created_at'] - current['first'] <= self.window:
+            current['messages'].append(msg)
+            current['touched'] = time.monotonic()
+            return
+
+        self.open_groups[msg['author']] = {
+            'first': msg['created_at'],
+            'touched': time.monotonic(),
+            'messages': [msg],
+        }
+        if current is not None:
+            await self.emit(current['messages'])
+
+    def update(self, msg):
+        """아직 열린 그룹에 있는 메시지가 수정되면 내용 교체 → 교체 여부"""
+        current = self.open_groups.get(msg['author'])
+        if current is None:
+            return False
+
+        for i, grouped in enumerate(current['messages']):
+            if grouped['id'] == msg['id']:
+                current['messages'][i] = msg
+                current['touched'] = time.monotonic()
+                return True
+        return False
+
+    def collect_expired(self):
+        """창이 지났거나 작성자가 조용해진 그룹들을 닫아서 반환"""
+        now = datetime.now(timezone.utc)
+        idle_before = time.monotonic() - self.idle_seconds
+
+        expired = []
+        for author, current in list(self.open_groups.items()):
+            if now - current['first'] > self.window or current['touched'] <= idle_before:
+                del self.open_groups[author]
+                expired.append(current['messages'])
+        return expired
+
+    async def tick(self):
+        """만료된 그룹 전달 (묶기를 끝낸 뒤 큐에 넣으므로 대기 중에 상태가 섞이지 않음)"""
+        for context_messages in self.collect_expired():
+            await self.emit(context_messages)
+
+    async def run_ticker(self, interval=1.0):
+        """종료될 때까지 주기적으로 만료된 그룹 전달"""
+        while True:
+            await asyncio.sleep(interval)
+            await self.tick()
+
+    async def close(self):
+        """남은 그룹을 모두 내보내고 종료 표시 전송"""
+        remaining = [current['messages'] for current in self.open_groups.values()]
+        self.open_groups.clear()
+        for context_messages in remaining:
+            await self.emit(context_messages)
+        await self.output.put(PIPELINE_END)
+
+    def find_sent(self, message_id):
+        """이미 보낸 그룹 중 이 메시지가 들어 있는 그룹의 메시지 리스트 (없으면 None)"""
+        return self.sent_groups.get(message_id)
+
+    async def resend(self, context_messages, msg):
+        """보낸 그룹의 메시지 하나를 수정된 내용으로 바꿔서 그룹 전체를 다시 전달
+
+        첫 메시지가 그대로이므로 그룹 ID가 같고, 동기화 모드에서 기존 이벤트가 수정/삭제된다.
+        """
+        context_messages[:] = [msg if grouped['id'] == msg['id'] else grouped for grouped in context_messages]
+        await self.emit(context_messages)
+
+    def remember(self, context_messages):
+        """보낸 그룹 기억 (보존 기간이 지난 그룹은 앞에서부터 정리)"""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)
+        while self.sent_groups:
+            oldest = next(iter(self.sent_groups.values()))
+            if oldest[0]['created_at'] >= cutoff:
+                break
+            for grouped in oldest:
+                self.sent_groups.pop(grouped['id'], None)
+
+        for grouped in context_messages:
+            self.sent_groups[grouped['id']] = context_messages
+
+    async def emit(self, context_messages):
+        """맥락 그룹을 분류 단계로 전달"""
+        self.emitted += 1
+        self.remember(context_messages)
+        await self.output.put(make_context_group(context_messages))
+
+class RealtimeCollector(MessageCollector):
+    """게이트웨이 이벤트(on_message / on_raw_message_edit)로 새 메시지를 바로 처리하는 상주 수집기
+
+    로그인 직후 한 번만 체크포인트 이후의 밀린 메시지를 증분 수집하고, 그 뒤로는
+    히스토리를 다시 훑지 않는다. 연결이 끊기면 discord.py가 세션을 재개(RESUME)해서
+    놓친 이벤트를 다시 받으며, 새 세션으로 on_ready가 다시 와도 수집은 반복하지 않는다.
+    """
+
+    def __init__(self, grouper):
+        # 배치 수집기와 달리 메시지 이벤트를 받아야 하므로 길드 메시지 인텐트와 메시지 캐시 사용
+        intents = discord.Intents.default()
+        intents.message_content = True  # 메시지 내용 읽기 권한
+        intents.guilds = True           # 서버 정보 접근 권한
+        super().__init__(intents=intents, max_messages=1000)
+        self.realtime_grouper = grouper
+        self.started = False
+        self.live = False          # 밀린 메시지 수집이 끝나서 실시간 처리를 시작했는지
+        self.backlog = []          # 밀린 메시지 수집 중에 도착한 이벤트 (수집 후 처리)
+        self.checkpoint = None
+        self.track_cursors = False  # 밀린 메시지를 다 받은 경우에만 채널 커서를 전진 (빈 구간이 생기지 않도록)
+        self.dirty_channels = set()  # 저장 후 바뀐 채널의 체크포인트 키
+        self.last_checkpoint_save = time.monotonic()
+        self.live_archive = MessageArchive() if is_archive_enabled() else None
+        self.counts = {'received': 0, 'candidates': 0, 'edited': 0}
+
+    async def on_ready(self):
+        """첫 로그인에서만 밀린 메시지를 수집하고 실시간 처리 시작 (재연결 시에는 반복하지 않음)"""
+        if self.started:
+            print(f'🔄 게이트웨이 재연결: {self.user} (히스토리 재수집 없음)')
+            return
+        self.started = True
+        print(f'🎉 봇 로그인 성공: {self.user} - 실시간 수집 모드')
+
+        try:
+            if is_catchup_enabled():
+                await self.catch_up()
+                self.track_cursors = True
+            else:
+                print(f'⏭️ 밀린 메시지 수집 안함 → 체크포인트 커서는 다음 배치 수집에 맡김')
+        except Exception as e:
+            print(f"❌ 밀린 메시지 수집 중 오류 (실시간 처리는 계속, 체크포인트 커서는 유지): {e}")
+
+        self.checkpoint = CollectionCheckpoint()
+        self.live = True
+
+        # 수집 중에 도착한 메시지 중 이미 수집된 것(커서 이전)은 건너뜀
+        backlog, self.backlog = self.backlog, []
+        for handler, record in backlog:
+            await self.dispatch_live(handler, record)
+
+        print(f'👂 실시간 수집 시작: 새 메시지를 바로 필터링 → 분류 → 캘린더로 전달')
+
+    async def on_resumed(self):
+        print(f'🔄 게이트웨이 세션 재개 (놓친 이벤트는 재전송됨)')
+
+    async def catch_up(self):
+        """체크포인트 이후 밀린 메시지 증분 수집 → 맥락 그룹을 분류 단계로 전달
+
+        보존 윈도우의 그룹도 함께 보내지만, 이미 분류한 것은 분류 캐시와
+        캘린더 중복 체크에서 걸러지므로 배치 실행과 같은 비용만 든다.
+        """
+        print(f'\n⏩ 밀린 메시지 증분 수집 (체크포인트 이후만)')
+        await self.collect_recent_messages_with_progress()
+
+        groups, self.collected_messages = self.collected_messages, []
+        for group in groups:
+            await self.realtime_grouper.output.put(group)
+        self.realtime_grouper.emitted += len(groups)
+
+    def is_already_collected(self, record):
+        """밀린 메시지 수집에서 이미 처리한 메시지인지 (채널 커서 이전)"""
+        last_message_id = self.checkpoint.get_last_message_id(record.guild_id, record.channel_id)
+        return last_message_id is not None and record.id <= last_message_id
+
+    async def on_message(self, message):
+        if message.guild is None or message.author.bot:
+            return
+        await self.dispatch_live(self.handle_new, MessageRecord.from_message(message))
+
+    async def on_raw_message_edit(self, payload):
+        data = payload.data
+        if payload.guild_id is None or 'content' not in data or 'author' not in data or not data.get('edited_timestamp'):
+            return  # DM, 임베드만 갱신된 경우 등
+
+        if data['author'].get('bot'):
+            return
+
+        cached = payload.cached_message
+        if cached is not None and cached.content == data['content']:
+            return
+
+        channel = self.get_channel(payload.channel_id)
+        if channel is None:
+            return
+
+        record = MessageRecord.from_payload(data, channel)
+        if record.created_at < datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS):
+            return  # 수집 기간보다 오래된 메시지 수정은 무시
+
+        await self.dispatch_live(self.handle_edit, record)
+
+    async def dispatch_live(self, handler, record):
+        """밀린 메시지 수집이 끝나기 전이면 미뤄두고, 아니면 바로 처리"""
+        if not self.live:
+            self.backlog.append((handler, record))
+            return
+
+        try:
+            await handler(record)
+        except Exception as e:
+            print(f"❌ 실시간 메시지 처리 오류: {e}")
+
+    async def handle_new(self, record):
+        """새 메시지: 아카이브 → 필터 → 맥락 묶기, 채널 커서 전진"""
+        if self.is_already_collected(record):
+            return
+
+        self.counts['received'] += 1
+        if self.live_archive:
+            self.live_archive.add_records([record])
+
+        candidates = filter_schedule_records([record])
+        if self.track_cursors:
+            self.update_channel_checkpoint(record, candidates)
+
+        for candidate in candidates:
+            self.counts['candidates'] += 1
+            print(f'  📨 일정 후보: {candidate["channel"]} {candidate["author"]}: {candidate["content"][:40]}')
+            await self.realtime_grouper.add(candidate)
+
+        self.save_checkpoint_if_due()
+
+    async def handle_edit(self, record):
+        """수정된 메시지: 아직 열린 그룹이면 내용 교체, 이미 보낸 그룹이면 그 그룹을 같은 ID로 재분류
+
+        후보였던 메시지가 후보에서 빠져도 그룹에 수정된 내용으로 남겨서 다시 분류한다
+        (그룹 ID가 바뀌지 않아야 동기화 모드에서 기존 이벤트가 수정/삭제됨).
+        """
+        self.counts['edited'] += 1
+        if self.live_archive:
+            self.live_archive.add_records([record])
+
+        candidates = filter_schedule_records([record])
+        candidate = candidates[0] if candidates else to_candidate(record, '수정 후 재분류')
+
+        grouped = self.realtime_grouper.update(candidate)
+        if not grouped:
+            # 보존 후보로 그룹을 다시 만들어야 하므로 보존 메시지를 교체하기 전에 찾음
+            context_messages = self.realtime_grouper.find_sent(record.id) or self.find_retained_group(record)
+            grouped = context_messages is not None
+            if grouped:
+                print(f'  ✏️ 수정된 메시지의 맥락 그룹 재분류: {candidate["channel"]} {candidate["author"]}: {candidate["content"][:40]}')
+                await self.realtime_grouper.resend(context_messages, candidate)
+            elif candidates:
+                print(f'  ✏️ 수정 후 일정 후보: {candidate["channel"]} {candidate["author"]}: {candidate["content"][:40]}')
+                await self.realtime_grouper.emit([candidate])
+
+        # 그룹에 들어 있는 메시지는 후보에서 빠져도 보존해서 다음 실행에서도 같은 그룹이 만들어지게 함
+        if self.track_cursors:
+            self.replace_retained(record, [candidate] if grouped else candidates)
+        self.save_checkpoint_if_due()
+
+    def find_retained_group(self, record):
+        """밀린 메시지 수집이나 이전 실행에서 보낸 그룹을 체크포인트 보존 후보로 다시 만들기 (없으면 None)
+
+        배치 수집과 같은 규칙으로 작성자의 보존 후보를 묶으므로 그때와 같은 그룹(같은 ID)이 나온다.
+        """
+        if self.checkpoint is None:
+            return None
+
+        window_start = datetime.now(pytz.timezone('Asia/Seoul')) - timedelta(days=RETENTION_DAYS)
+        messages = self.checkpoint.get_author_messages(record.author, window_start)
+        for context_messages in group_context_messages(messages):
+            if any(msg['id'] == record.id for msg in context_messages):
+                return context_messages
+        return None
+
+    def update_channel_checkpoint(self, record, candidates):
+        """채널 커서를 새 메시지로 전진시키고 일정 후보는 보존 메시지에 추가"""
+        window_start = datetime.now(pytz.timezone('Asia/Seoul')) - timedelta(days=RETENTION_DAYS)
+        retained = self.checkpoint.get_retained_messages(record.guild_id, record.channel_id, window_start)
+        last_message_id = max(self.checkpoint.get_last_message_id(record.guild_id, record.channel_id) or 0, record.id)
+
+        self.checkpoint.update_channel(record.guild_id, record.channel_id, last_message_id, retained + candidates)
+        self.dirty_channels.add(self.checkpoint.channel_key(record.guild_id, record.channel_id))
+
+    def replace_retained(self, record, candidates):
+        """체크포인트 보존 메시지 중 수정된 메시지 교체 (후보에서 빠졌으면 제거)"""
+        key = self.checkpoint.channel_key(record.guild_id, record.channel_id)
+        entry = self.checkpoint.channels.get(key)
+        if not entry:
+            return
+
+        stored = entry.get('messages', [])
+        kept = [msg for msg in stored if msg['id'] != record.id]
+        was_candidate = len(kept) != len(stored)
+        kept.extend({**msg, 'created_at': msg['created_at'].isoformat()} for msg in candidates)
+
+        if was_candidate or candidates:
+            entry['messages'] = kept
+            self.dirty_channels.add(key)
+
+    def save_checkpoint_if_due(self, force=False):
+        """바뀐 채널이 있고 저장 간격이 지났으면 체크포인트 저장"""
+        if self.checkpoint is None or not self.dirty_channels:
+            return
+        if not force and time.monotonic() - self.last_checkpoint_save < get_checkpoint_interval():
+            return
+
+        self.checkpoint.save()
+        self.dirty_channels.clear()
+        self.last_checkpoint_save = time.monotonic()
+
+    def close_realtime(self):
+        """종료 전 체크포인트 저장 + 아카이브 닫기"""
+        self.save_checkpoint_if_due(force=True)
+        if self.live_archive:
+            self.live_archive.close()
+            self.live_archive = None
+
+        print(f'\n📊 실시간 수집 요약: 메시지 {self.counts["received"]:,}개 → 일정 후보 {self.counts["candidates"]:,}개, '
+              f'수정 {self.counts["edited"]:,}개, 맥락 그룹 {self.realtime_grouper.emitted:,}개 전달')
+
+async def run_realtime():
+    """실시간 수집 → AI 분류 → 캘린더를 연결해 종료(Ctrl+C/SIGTERM)될 때까지 실행"""
+    token = os.getenv('DISCORD_TOKEN')
+    if not token:
+        print("❌ 오류: DISCORD_TOKEN이 설정되지 않았습니다!")
+        return
+
+    queue_size = get_queue_size()
+    groups_queue = asyncio.Queue(maxsize=queue_size)
+    schedules_queue = asyncio.Queue(maxsize=queue_size)
+
+    grouper = RealtimeContextGrouper(groups_queue)
+    classifier = ScheduleClassifier(on_schedule=schedules_queue.put)
+    collector = RealtimeCollector(grouper)
+
+    print(f"👂 실시간 모드: 맥락 그룹 창 {CONTEXT_WINDOW_SECONDS}초 / 조용해지면 {grouper.idle_seconds:.0f}초 후 전달 (큐 크기 {queue_size})")
+
+    # 분류/캘린더 단계는 파이프라인 모드와 같은 것을 종료 표시가 올 때까지 계속 실행
+    stages = asyncio.gather(
+        classify_stage(classifier, groups_queue, schedules_queue),
+        calendar_stage(schedules_queue, classifier),
+    )
+    ticker = asyncio.create_task(grouper.run_ticker())
+
+    # SIGTERM(서비스 종료)도 Ctrl+C처럼 연결을 닫고 남은 그룹을 처리한 뒤 종료
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(collector.close()))
+    except (NotImplementedError, RuntimeError):
+        pass  # Windows 등 시그널 핸들러를 지원하지 않는 환경
+
+    try:
+        await collector.start(token)
+
+    except discord.LoginFailure:
+        print("❌ 로그인 실패: Discord 토큰이 잘못되었습니다!")
+
+    except asyncio.CancelledError:
+        print(f"\n⏸️  실시간 수집을 종료합니다...")
+
+    except Exception as e:
+        print(f"❌ 예상치 못한 오류 발생: {e}")
+
+    finally:
+        ticker.cancel()
+        try:
+            if not collector.is_closed():
+                await collector.close()
+            print("🔌 Discord 연결이 안전하게 종료되었습니다.")
+        except Exception as close_error:
+            print(f"⚠️ 연결 종료 중 오류 (무시 가능): {close_error}")
+
+        collector.close_realtime()
+
+        # 남은 그룹을 보내고 분류/캘린더 단계가 끝날 때까지 대기
+        await grouper.close()
+        await stages
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Discord Schedule Bot - 실시간 모드 실행 파일
+게이트웨이로 새 메시지를 받는 즉시 필터링 → AI 분류 → Google Calendar 연동 (종료할 때까지 상주)
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+import pytz
+
+from realtime_collector import run_realtime
+
+async def main():
+    """실시간 모드 메인 함수"""
+    print("=" * 70)
+    print("👂 Discord Schedule Bot - 실시간 일정 추출 모드")
+    print("=" * 70)
+    print("💡 새 메시지/수정된 메시지를 몇 초 안에 분류해서 캘린더에 반영합니다")
+    print("   • 시작할 때 체크포인트 이후 밀린 메시지만 한 번 수집")
+    print("   • 재연결 시 히스토리 재수집 없음 (게이트웨이 세션 재개)")
+    print("   • 종료: Ctrl+C 또는 SIGTERM")
+
+    kst = pytz.timezone('Asia/Seoul')
+    start_time = datetime.now(kst)
+    print(f"🕐 실행 시작: {start_time.strftime('%Y-%m-%d %H:%M:%S')} (KST)")
+
+    await run_realtime()
+
+    duration = datetime.now(kst) - start_time
+    print(f"\n⏱️  실행 시간: {duration.total_seconds() / 3600:.1f}시간")
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print(f"\n⏸️  사용자에 의해 중단되었습니다.")
+        sys.exit(0)
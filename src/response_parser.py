@@ -0,0 +1,136 @@
+# src/response_parser.py
+import json
+
+# 스트리밍으로 꺼낼 배열 키 (AI 응답 형식: {"schedules": [...], "non_schedules": [...]})
+STREAM_ARRAY_KEYS = ('schedules', 'non_schedules')
+
+def clean_json_text(text):
+    """JSON 파싱 오류 방지용 제어 문자 제거 (줄바꿈/탭은 유지)"""
+    return ''.join(char for char in text if ord(char) >= 32 or char in '\n\r\t')
+
+class StreamingResponseParser:
+    """토큰이 도착하는 대로 배열 항목을 하나씩 꺼내는 점진적 JSON 파서
+
+    전체 응답을 기다리지 않고 중괄호 깊이만 추적하다가, 지정한 배열 안의
+    객체 하나가 닫히는 순간 그 객체만 json.loads 한다. 최상위 객체는 지정한 키로
+    시작하는 '{"schedules"' 형태에서만 시작하므로, 코드 펜스(```json)나 앞 설명 문장의
+    따옴표/중괄호는 무시된다. 잘못된 객체는 그 항목만 버린다.
+    """
+
+    def __init__(self, array_keys=STREAM_ARRAY_KEYS):
+        self.array_keys = set(array_keys)
+        self.buffer = ''
+        self.position = 0          # 다음에 검사할 buffer 위치
+
+        # 스캐너 상태
+        self.stack = []            # 열린 '{' / '['
+        self.in_string = False
+        self.escaped = False
+        self.string_start = None
+        self.last_key = None       # 최상위 객체에서 마지막으로 읽은 키
+        self.array_key = None      # 현재 열린 최상위 배열의 키
+        self.object_start = None   # 꺼낼 객체의 시작 위치
+        self.finished = False      # 최상위 객체가 닫혔는지
+
+        # 통계
+        self.items = 0
+        self.errors = 0
+
+    def feed(self, chunk):
+        """응답 조각 추가 → 이번 조각으로 완성된 (배열 키, 항목) 목록"""
+        self.buffer += chunk
+        completed = []
+
+        buffer = self.buffer
+        stack = self.stack
+        index = self.position
+
+        while index < len(buffer) and not self.finished:
+            char = buffer[index]
+
+            if not stack:
+                # 응답 본문 시작 전: 설명 문장은 건너뛰고 '{"배열 키"'에서 최상위 객체 시작
+                if char == '{':
+                    started = self._payload_starts_at(buffer, index)
+                    if started is None:
+                        break  # 조각이 시작 부분에서 끊김 → 다음 조각에서 다시 판단
+                    if started:
+                        stack.append('{')
+                index += 1
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    if len(stack) == 1:
+                        self.last_key = self._decode_key(buffer[self.string_start:index + 1])
+            elif char == '"':
+                self.in_string = True
+                self.string_start = index
+            elif char == '{':
+                stack.append('{')
+                if len(stack) == 3 and stack[1] == '[' and self.array_key in self.array_keys:
+                    self.object_start = index
+            elif char == '[':
+                stack.append('[')
+                if len(stack) == 2:
+                    self.array_key = self.last_key
+            elif char in '}]' and stack:
+                stack.pop()
+                if char == '}' and len(stack) == 2 and self.object_start is not None:
+                    item = self._decode_item(buffer[self.object_start:index + 1])
+                    if item is not None:
+                        completed.append((self.array_key, item))
+                    self.object_start = None
+                elif len(stack) == 1:
+                    self.array_key = None
+                elif not stack:
+                    self.finished = True
+
+            index += 1
+
+        self.position = index
+        return completed
+
+    def _payload_starts_at(self, buffer, index):
+        """buffer[index]의 '{'가 응답 본문(지정한 배열 키로 시작하는 객체)인지 → True / False / None(판단하려면 더 필요)"""
+        rest = buffer[index + 1:].lstrip()
+        if not rest:
+            return None
+        if rest[0] != '"':
+            return False
+
+        end = rest.find('"', 1)
+        if end == -1:
+            # 키가 아직 다 오지 않음 → 지정한 키의 앞부분이면 대기
+            name = rest[1:]
+            return None if any(key.startswith(name) for key in self.array_keys) else False
+        return rest[1:end] in self.array_keys
+
+    @staticmethod
+    def _decode_key(text):
+        """키 문자열 디코딩 (실패하면 None)"""
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
+
+    def _decode_item(self, text):
+        """객체 하나 파싱 (실패하면 그 항목만 버리고 None)"""
+        try:
+            item = json.loads(clean_json_text(text), strict=False)
+        except json.JSONDecodeError as json_error:
+            self.errors += 1
+            print(f"    ⚠️ 응답 항목 파싱 실패로 제외: {json_error} - {text[:40]}...")
+            return None
+
+        if not isinstance(item, dict):
+            self.errors += 1
+            return None
+
+        self.items += 1
+        return item
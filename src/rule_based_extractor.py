@@ -0,0 +1,153 @@
+# src/rule_based_extractor.py
+import os
+import re
+
+from korean_datetime import KST, RELATIVE_DAYS, NEXT_WEEK_WORDS, resolve_schedule_time, resolve_time, scan_tokens
+from schedule_filter import DEFAULT_FILTER, FALSE_POSITIVE_PATTERNS
+
+# 규칙으로 확정한 일정의 확신도 (AI 검증 기준 0.92 이상)
+RULE_CONFIDENCE = 0.95
+
+# 이보다 긴 메시지는 맥락 판단이 필요하다고 보고 AI로 보냄
+RULE_MAX_LENGTH = 60
+
+# 활동 키워드 → 일정 유형 (AI 응답의 schedule_type 값과 같게)
+ACTIVITY_TYPES = {
+    '합주': '합주',
+    '현합': '합주',
+    '리허설': '리허설',
+    '연습': '연습',
+    '공연': '공연',
+    '콘서트': '공연',
+    '콜타임': '콜타임',
+}
+
+# 규칙으로 판단하기 애매한 표현들 → AI로 보냄
+AMBIGUOUS_PATTERNS = [
+    r'\?',                 # 질문 ("시간 있나요?", "합주 맞죠?")
+    r'\d+\s*시간',         # 시간 길이 ("2시간 정도")
+    r'어제|지난|취소|미뤄|연기|말고|아니',  # 지난 일/변경/부정
+]
+
+WEEKDAY_NAMES = '월화수목금토일'
+
+# 오전/오후 표시 없이는 추론할 수 없는 "N시" (1-5시는 오전으로, 11시는 오후로 해석됨)
+AMBIGUOUS_HOURS = (1, 2, 3, 4, 5, 11)
+
+def is_fastpath_enabled():
+    """명확한 일정은 AI 없이 규칙으로 바로 확정할지 여부 (RULE_FASTPATH, 기본 true)"""
+    return os.getenv('RULE_FASTPATH', 'true').lower() == 'true'
+
+class RuleBasedExtractor:
+    """키워드 점수 + 날짜/시간 토큰으로 명확한 일정만 골라내는 결정적 추출기
+
+    날짜(구체적 날짜/상대 날짜/요일)와 시각이 모두 있고, 활동 키워드가 하나뿐이며,
+    애매한 표현이 없는 짧은 메시지만 일정으로 확정한다. 나머지는 None을 돌려주고
+    AI 분류에 맡긴다. 결과는 AI 응답 항목과 같은 형식이다.
+    """
+
+    def __init__(self, keyword_filter=DEFAULT_FILTER, max_length=RULE_MAX_LENGTH):
+        self.keyword_filter = keyword_filter
+        self.max_length = max_length
+        self.activity_regex = re.compile('|'.join(ACTIVITY_TYPES))
+        self.ambiguous_regex = re.compile('|'.join(AMBIGUOUS_PATTERNS + FALSE_POSITIVE_PATTERNS))
+
+        # 통계
+        self.extracted = 0
+        self.deferred = 0
+
+    def extract(self, msg):
+        """메시지 하나 판단 → 일정 딕셔너리 (애매하면 None)"""
+        schedule = self.match(msg)
+        if schedule is None:
+            self.deferred += 1
+        else:
+            self.extracted += 1
+        return schedule
+
+    def match(self, msg):
+        """규칙 판단 본체 (통계 없이)"""
+        content = msg['content']
+        text = content.lower().strip()
+
+        if len(text) > self.max_length or self.ambiguous_regex.search(text):
+            return None
+
+        # 활동이 정확히 한 종류여야 함 ("합주 끝나고 공연" 같은 메시지는 AI로)
+        activities = {ACTIVITY_TYPES[word] for word in self.activity_regex.findall(text)}
+        if len(activities) != 1:
+            return None
+
+        is_schedule, filter_reason = self.keyword_filter.is_likely_schedule(text)
+        if not is_schedule:
+            return None
+
+        found = scan_tokens(text)
+        when = self.describe_when(found)
+        if when is None:
+            return None
+
+        # 정리한 시간 표현이 원문과 같은 시각으로 해석되는지 확인 (캘린더에서 다시 파싱함)
+        # 잘못된 날짜("2월 30일")처럼 기본값(내일)으로 떨어지는 경우도 AI로 보냄
+        base_time = msg['created_at'].astimezone(KST)
+        resolved = resolve_schedule_time(when, base_time)
+        if resolved['error'] or resolved['date_reason'] == '기본값(내일)':
+            return None
+        if resolved['start'] != resolve_schedule_time(text, base_time)['start']:
+            return None
+
+        schedule_type = activities.pop()
+        return {
+            'message_id': str(msg['id']),
+            'content': content,
+            'author': msg['author'],
+            'channel': msg['channel'],
+            'created_at': msg['created_at'].strftime('%Y-%m-%d %H:%M'),
+            'schedule_type': schedule_type,
+            'confidence': RULE_CONFIDENCE,
+            'extracted_info': {
+                'when': when,
+                'what': schedule_type,
+                'where': '',
+            },
+            'reason': f"규칙 기반 확정: {when} {schedule_type} ({filter_reason})",
+        }
+
+    @staticmethod
+    def describe_when(found):
+        """토큰에서 "날짜 + 시각" 표현 생성 (날짜나 시각이 없거나 애매하면 None)
+
+        날짜는 korean_datetime과 같은 우선순위로 하나만 고르고,
+        시각은 오전/오후 추론을 마친 "H시 M분" 형태로 적는다.
+        """
+        hour, minute = resolve_time(found)
+        if hour is None:
+            return None
+
+        if 'hour_only' in found and 'hour_minute' not in found:
+            # "N시"는 6-10시만 오후로 추론해도 안전, 1-5시("3시" → 03:00)와
+            # 11시("11시" → 23:00)는 오전/오후/아침/저녁/밤 표시가 없으면 AI로
+            marked = found['am'] or found['pm']
+            if not marked and found['hour_only'] in AMBIGUOUS_HOURS:
+                return None
+        elif 1 <= hour < 12:
+            # "N시 M분", "H:MM"은 오전/오후를 반영하지 않으므로 12시 전이면 AI로
+            return None
+
+        if 'date' in found:
+            month, day = found['date']
+            date_text = f"{month}월 {day}일"
+        elif found['relative']:
+            words = [word for word, _ in RELATIVE_DAYS] + list(NEXT_WEEK_WORDS)
+            date_text = next(word for word in words if word in found['relative'])
+        elif found['weekday'] is not None:
+            date_text = f"{WEEKDAY_NAMES[found['weekday']]}요일"
+        else:
+            return None
+
+        return f"{date_text} {hour}시 {minute}분"
+
+    def stats_line(self):
+        """실행 통계 한 줄"""
+        total = self.extracted + self.deferred
+        return f"⚡ 규칙 기반 확정: {self.extracted}개 / {total}개 (나머지 {self.deferred}개는 AI 분류)"
@@ -0,0 +1,279 @@
+# src/schedule_filter.py
+import re
+
+# Aho-Corasick 오토마톤은 선택 사항 (pyahocorasick 설치 시 사용, 없으면 정규식 대체)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# 배치 점수 계산용 NumPy (없으면 순수 파이썬으로 계산)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 데이터 기반 키워드 (분석 결과): 카테고리 → (표시 이름, 점수, 키워드)
+KEYWORD_GROUPS = {
+    # 최고 효율 키워드 (정확도 7배 이상)
+    'high_precision': ('고효율', 10, ['합니다', '그래서', '공연', '연습', '세팅']),
+
+    # 핵심 일정 키워드 (높은 빈도)
+    'core_schedule': ('핵심', 5, ['합주', '리허설', '콘서트', '라이트', '더스트', '현합']),
+
+    # 시간 관련 키워드
+    'time_related': ('시간', 3, ['오늘', '내일', '이번', '언제', '몇시', '시간']),
+
+    # 보조 키워드 (낮은 우선순위)
+    'support': ('보조', 1, ['저희', 'mtr', '우리', 'everyone', '같습니다', '끝나고']),
+}
+
+# 명확히 일정이 아닌 패턴들 (강력한 제외 기준)
+EXCLUDE_PATTERNS = [
+    r'어제.*?어땠',     # "어제 연습 어땠어"
+    r'지난번.*?어땠',   # "지난번 공연 어땠어"
+    r'.*?었어$',        # "~했었어", "좋았어"
+    r'.*?했어$',        # "연습했어", "끝났어"
+    r'.*?어떻게\s*생각', # "어떻게 생각해"
+    r'.*?녹음.*?있',    # "녹음된 거 있어?"
+    r'.*?영상.*?봤',    # "영상 봤어?"
+    r'점심.*?뭐.*?먹',  # "점심 뭐 먹을까"
+    r'날씨.*?좋',       # "날씨 좋네"
+    r'고생.*?했',       # "고생했어"
+    r'수고.*?했',       # "수고했어"
+]
+
+# AI가 일정으로 분류했어도 제외하는 오탐 패턴 (후처리 검증)
+FALSE_POSITIVE_PATTERNS = [
+    r'.*끝나고.*드실',        # "합주끝나고 드실 안주랑"
+    r'.*은\s*합니다$',       # "합주연습은합니다"
+    r'.*시간\s*있.*\?',      # "시간 있나요?"
+    r'.*순서대로',           # "순서대로"
+    r'.*은\s*\d+시간',       # "서곡은 2시간"
+    r'.*은\s*\d+분',         # "인터미션은 15분"
+    r'안주', r'드실', r'먹을',  # 식사 관련
+]
+
+# 시간 패턴 ("2시", "2시 30분", "14:30")과 보너스 점수
+TIME_PATTERN = r'\d{1,2}시\s*\d{0,2}분?|\d{1,2}:\d{2}'
+TIME_PATTERN_BONUS = 5
+
+# 필터링 기준: 8점 이상
+SCHEDULE_THRESHOLD = 8
+
+# 배치 점수에서 제외 패턴에 걸린 메시지의 점수 (기준을 절대 넘지 못함)
+EXCLUDED_SCORE = -1
+
+class ScheduleKeywordFilter:
+    """한 번 컴파일해 두고 재사용하는 키워드 점수 엔진"""
+
+    def __init__(self, keyword_groups=None, exclude_patterns=None, threshold=SCHEDULE_THRESHOLD):
+        self.keyword_groups = keyword_groups or KEYWORD_GROUPS
+        self.exclude_patterns = exclude_patterns or EXCLUDE_PATTERNS
+        self.threshold = threshold
+
+        # (카테고리, 표시 이름, 점수, 키워드) - 설정 순서 그대로 유지
+        self.keyword_entries = []
+        for category, (label, weight, keywords) in self.keyword_groups.items():
+            for keyword in keywords:
+                self.keyword_entries.append((category, label, weight, keyword.lower()))
+
+        # 키워드 → 항목 번호들 (같은 키워드가 여러 카테고리에 있을 수 있음)
+        self.entry_indexes = {}
+        for index, (_, _, _, keyword) in enumerate(self.keyword_entries):
+            self.entry_indexes.setdefault(keyword, []).append(index)
+
+        # 제외 패턴은 하나의 정규식으로 합침 (앞의 '.*?'는 search에서 의미가 없어 제거)
+        self.exclude_regex = re.compile('|'.join(
+            f'(?:{self._strip_leading_wildcard(pattern)})' for pattern in self.exclude_patterns
+        ))
+        # 어떤 패턴에 걸렸는지는 제외된 경우에만 개별 패턴으로 확인
+        self.exclude_checks = [
+            (pattern, re.compile(self._strip_leading_wildcard(pattern)))
+            for pattern in self.exclude_patterns
+        ]
+
+        self.time_regex = re.compile(TIME_PATTERN)
+
+        # 키워드 매처: 텍스트를 한 번만 훑어서 모든 키워드 적중을 반환
+        keywords = list(self.entry_indexes)
+        if AHOCORASICK_AVAILABLE:
+            self.automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self.automaton.add_word(keyword, keyword)
+            self.automaton.make_automaton()
+        else:
+            self.automaton = None
+            # 위치마다 가장 긴 키워드를 찾는 lookahead 정규식 (겹치는 키워드도 모두 검출)
+            by_length = sorted(keywords, key=len, reverse=True)
+            self.keyword_regex = re.compile(
+                '(?=(' + '|'.join(re.escape(keyword) for keyword in by_length) + '))'
+            )
+            # 같은 위치에서 시작하는 더 짧은 키워드 (긴 키워드의 접두사)
+            self.prefix_keywords = {
+                keyword: [other for other in keywords if other != keyword and keyword.startswith(other)]
+                for keyword in keywords
+            }
+
+    @staticmethod
+    def _strip_leading_wildcard(pattern):
+        """search 기준으로 동일한 의미인 선행 '.*?' 제거 (역추적 비용 절감)"""
+        return pattern[3:] if pattern.startswith('.*?') else pattern
+
+    def find_exclusion(self, text):
+        """제외 패턴에 걸리면 해당 패턴 문자열, 아니면 None (text는 소문자)"""
+        if not self.exclude_regex.search(text):
+            return None
+        for pattern, regex in self.exclude_checks:
+            if regex.search(text):
+                return pattern
+        return None
+
+    def match_keyword_indexes(self, text):
+        """텍스트에 포함된 키워드 항목 번호들 (설정 순서, text는 소문자)"""
+        if self.automaton is not None:
+            found = {keyword for _, keyword in self.automaton.iter(text)}
+        else:
+            found = set()
+            for keyword in self.keyword_regex.findall(text):
+                found.add(keyword)
+                found.update(self.prefix_keywords[keyword])
+
+        return sorted(index for keyword in found for index in self.entry_indexes[keyword])
+
+    def match_keywords(self, text):
+        """텍스트에 포함된 키워드 항목들을 설정 순서대로 반환 (text는 소문자)"""
+        return [self.keyword_entries[index] for index in self.match_keyword_indexes(text)]
+
+    def find_time_patterns(self, text):
+        """시간 패턴 목록 ("2시", "14:30" 등)"""
+        return self.time_regex.findall(text)
+
+    def evaluate(self, message_text):
+        """제외 패턴 없이 키워드 점수만 계산 → (점수, 키워드 항목들, 시간 패턴들)"""
+        text = message_text.lower()
+        hits = self.match_keywords(text)
+        time_patterns = self.find_time_patterns(text)
+
+        score = sum(weight for _, _, weight, _ in hits)
+        if time_patterns:
+            score += TIME_PATTERN_BONUS
+
+        return score, hits, time_patterns
+
+    def format_reason(self, score, hits, time_patterns):
+        """점수와 상위 3개 적중 키워드로 필터링 이유 문자열 생성"""
+        matched_keywords = [f"{label}:{keyword}" for _, label, _, keyword in hits[:3]]
+        if time_patterns and len(matched_keywords) < 3:
+            matched_keywords.append(f"시간패턴:{time_patterns}")
+        return f"점수:{score} " + ", ".join(matched_keywords) + "..."
+
+    def is_likely_schedule(self, message_text):
+        """메시지가 일정일 가능성을 판단 → (일정 여부, 이유)"""
+        text = message_text.lower()
+
+        # 제외 패턴에 걸리면 일정이 아님
+        excluded = self.find_exclusion(text)
+        if excluded is not None:
+            return False, f"제외패턴: {excluded}"
+
+        score, hits, time_patterns = self.evaluate(text)
+        is_schedule = score >= self.threshold
+
+        return is_schedule, self.format_reason(score, hits, time_patterns)
+
+    def weight_vector(self):
+        """적중 행렬의 행 순서에 맞춘 점수 벡터 (키워드들 + 마지막 행은 시간 패턴)"""
+        weights = [weight for _, _, weight, _ in self.keyword_entries] + [TIME_PATTERN_BONUS]
+        return np.array(weights, dtype=np.int64) if NUMPY_AVAILABLE else weights
+
+    def hit_matrix(self, texts):
+        """(키워드 + 시간 패턴) × 메시지 적중 행렬 계산
+
+        반환값: (행렬, 메시지별 제외 패턴 또는 None, 메시지별 (키워드 번호들, 시간 패턴들))
+        행렬은 가중치만 바꿔 다시 점수를 낼 때 그대로 재사용할 수 있다.
+        """
+        time_row = len(self.keyword_entries)
+        if NUMPY_AVAILABLE:
+            matrix = np.zeros((time_row + 1, len(texts)), dtype=np.uint8)
+        else:
+            matrix = [[0] * len(texts) for _ in range(time_row + 1)]
+
+        exclusions = []
+        details = []
+        for column, message_text in enumerate(texts):
+            text = message_text.lower()
+            excluded = self.find_exclusion(text)
+            exclusions.append(excluded)
+            if excluded is not None:
+                details.append(((), []))
+                continue
+
+            indexes = self.match_keyword_indexes(text)
+            time_patterns = self.find_time_patterns(text)
+            details.append((indexes, time_patterns))
+
+            if NUMPY_AVAILABLE:
+                matrix[indexes, column] = 1
+                matrix[time_row, column] = 1 if time_patterns else 0
+            else:
+                for index in indexes:
+                    matrix[index][column] = 1
+                matrix[time_row][column] = 1 if time_patterns else 0
+
+        return matrix, exclusions, details
+
+    def score_batch(self, texts, weights=None):
+        """메시지 여러 개를 한 번에 점수화 → (점수들, 이유들)
+
+        점수는 가중치 벡터 · 적중 행렬 한 번의 내적으로 계산하며,
+        제외 패턴에 걸린 메시지는 EXCLUDED_SCORE가 된다.
+        """
+        if not texts:
+            return (np.zeros(0, dtype=np.int64) if NUMPY_AVAILABLE else []), []
+
+        matrix, exclusions, details = self.hit_matrix(texts)
+        if weights is None:
+            weights = self.weight_vector()
+
+        if NUMPY_AVAILABLE:
+            scores = np.asarray(weights, dtype=np.int64) @ matrix
+            scores[[excluded is not None for excluded in exclusions]] = EXCLUDED_SCORE
+        else:
+            scores = [
+                EXCLUDED_SCORE if exclusions[column] is not None else
+                sum(weight * row[column] for weight, row in zip(weights, matrix))
+                for column in range(len(texts))
+            ]
+
+        reasons = []
+        for column, (excluded, (indexes, time_patterns)) in enumerate(zip(exclusions, details)):
+            if excluded is not None:
+                reasons.append(f"제외패턴: {excluded}")
+            else:
+                hits = [self.keyword_entries[index] for index in indexes]
+                reasons.append(self.format_reason(int(scores[column]), hits, time_patterns))
+
+        return scores, reasons
+
+# 모듈 공용 기본 필터 (한 번만 컴파일)
+DEFAULT_FILTER = ScheduleKeywordFilter()
+
+def filter_schedule_records(records):
+    """메시지 딕셔너리들을 한 번에 점수화해서 일정 후보만 반환"""
+    scores, reasons = DEFAULT_FILTER.score_batch([record['content'] for record in records])
+    candidates = []
+
+    for record, score, reason in zip(records, scores, reasons):
+        if score < DEFAULT_FILTER.threshold:
+            continue
+
+        candidates.append({
+            **record,
+            'filter_reason': reason,
+            'message_length': len(record['content']),
+        })
+
+    return candidates
@@ -12,7 +12,9 @@ from datetime import datetime, timedelta
 import pytz
 
 # 기존 모듈들 import
-from discord_collector import MessageCollector
+from collection_engine import SchedulePrefilterConsumer, crawl
+from discord_collector import MessageCollector, collect_archived_messages
+from message_archive import is_offline_mode
 from ai_classifier import classify_schedule_messages
 from calendar_manager import add_schedules_to_google_calendar
 
@@ -32,59 +34,12 @@ class TestMessageCollector(MessageCollector):
         print(f'💰 예상 비용: 약 500-1,000원')
         print(f'⏱️ 예상 시간: 3-5분')
         
-        total_processed = 0
-        total_filtered = 0
-        
-        # 모든 서버의 모든 채널에서 메시지 수집 (7일만)
-        for guild in self.guilds:
-            print(f'\n🏢 서버: {guild.name}')
-            
-            for channel in guild.text_channels:
-                try:
-                    if not channel.permissions_for(guild.me).read_message_history:
-                        continue
-                    
-                    print(f'  📝 #{channel.name:<20s} ', end='', flush=True)
-                    
-                    channel_processed = 0
-                    channel_filtered = 0
-                    
-                    # 7일간 메시지만 가져오기
-                    async for message in channel.history(after=seven_days_ago, limit=None):
-                        if message.author.bot:
-                            continue
-                        
-                        total_processed += 1
-                        channel_processed += 1
-                        
-                        # 필터링 적용
-                        is_schedule, reason = self.is_likely_schedule(message.content)
-                        
-                        if is_schedule:
-                            total_filtered += 1
-                            channel_filtered += 1
-                            
-                            # 메시지 정보 저장
-                            message_data = {
-                                'id': message.id,
-                                'content': message.content,
-                                'author': str(message.author),
-                                'channel': f'#{message.channel.name}',
-                                'guild': message.guild.name,
-                                'created_at': message.created_at.astimezone(kst),
-                                'filter_reason': reason,
-                                'message_length': len(message.content),
-                            }
-                            self.collected_messages.append(message_data)
-                    
-                    # 채널 결과 출력
-                    filter_rate = f"{(channel_filtered/channel_processed*100):.1f}%" if channel_processed > 0 else "0%"
-                    print(f'📊 {channel_processed:4d}개 → {channel_filtered:3d}개 ({filter_rate})')
-                    
-                except discord.Forbidden:
-                    print('❌ 접근 권한 없음')
-                except Exception as e:
-                    print(f'❌ 오류: {str(e)[:50]}...')
+        # 공용 수집 엔진으로 7일치만 수집 (페이지 단위 배치 점수화 + 맥락 묶기)
+        sampler = SchedulePrefilterConsumer(days=7, name='7일 테스트 샘플')
+        total_processed = await crawl(self, [sampler])
+        await sampler.finish()
+        total_filtered = len(sampler.candidates)
+        self.collected_messages = sampler.context_groups
         
         # 테스트 수집 결과
         print(f'\n📊 7일 테스트 수집 완료!')
@@ -93,16 +48,16 @@ class TestMessageCollector(MessageCollector):
         print(f'   🔍 필터링 결과: {total_filtered:,}개')
         print(f'   📈 필터링 비율: {(total_filtered/total_processed*100):.2f}%' if total_processed > 0 else '   비율: 0%')
         print(f'   💰 AI 분석 예상 비용: 약 {((total_filtered + 14) // 15 * 5):,}원')
-        
-        # 맥락 묶기
-        if self.collected_messages:
-            await self.group_context_messages()
-            print(f'   🔗 AI 분석 대상: {len(self.collected_messages)}개 맥락 그룹')
+        print(f'   🔗 AI 분석 대상: {len(self.collected_messages)}개 맥락 그룹')
 
 async def collect_test_messages():
     """7일 테스트용 메시지 수집"""
     print("🧪 7일 테스트 메시지 수집을 시작합니다...")
     
+    # 오프라인 모드: Discord 대신 로컬 아카이브 사용
+    if is_offline_mode():
+        return await collect_archived_messages(days=7)
+    
     token = os.getenv('DISCORD_TOKEN')
     if not token:
         print("❌ 오류: DISCORD_TOKEN이 설정되지 않았습니다!")
@@ -112,19 +67,14 @@ async def collect_test_messages():
     collected_messages = []
     
     try:
-        await collector.start(token)
+        await collector.start_batch(token)
         collected_messages = collector.collected_messages.copy()
         
     except Exception as e:
         print(f"❌ 오류: {e}")
         
     finally:
-        try:
-            if not collector.is_closed():
-                await collector.close()
-            await asyncio.sleep(1)
-        except:
-            pass
+        await collector.close_batch()
     
     return collected_messages
 
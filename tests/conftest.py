@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# src/ 모듈들은 서로 평면 import (python main.py를 src에서 실행하는 구조)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
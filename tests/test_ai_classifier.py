@@ -0,0 +1,145 @@
+# tests/test_ai_classifier.py
+import asyncio
+import json
+import re
+import sqlite3
+from datetime import datetime
+
+import pytest
+import pytz
+
+from ai_classifier import BatchPacker, ScheduleClassifier, classify_schedule_messages, estimate_tokens
+
+KST = pytz.timezone('Asia/Seoul')
+
+def test_missing_api_key_returns_empty_results(monkeypatch):
+    """API 키가 없으면 호출자가 그대로 풀 수 있는 (일정, 일정 아님) 빈 결과"""
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+
+    schedules, non_schedules = asyncio.run(classify_schedule_messages([{'id': 1, 'content': '내일 3시 합주'}]))
+
+    assert schedules == []
+    assert non_schedules == []
+
+def make_message(message_id, content):
+    return {
+        'id': message_id,
+        'content': content,
+        'author': 'member1',
+        'channel': '#general',
+        'created_at': datetime(2025, 7, 1, 12, 0, tzinfo=KST),
+    }
+
+def make_classifier(monkeypatch, tmp_path, response):
+    """캐시는 임시 파일, OpenAI 호출은 고정 응답으로 바꾼 분류기"""
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setenv('OPENAI_STREAM', 'false')
+    monkeypatch.setenv('RULE_FASTPATH', 'false')
+    monkeypatch.setenv('CLASSIFICATION_CACHE', 'true')
+    monkeypatch.setenv('CLASSIFICATION_CACHE_PATH', str(tmp_path / 'classification_cache.db'))
+
+    classifier = ScheduleClassifier()
+    classifier.api_calls = 0
+
+    async def request_completion(prompt):
+        classifier.api_calls += 1
+        return json.dumps(response, ensure_ascii=False)
+
+    classifier.request_completion = request_completion
+    return classifier
+
+@pytest.mark.parametrize('response_item', [
+    # AI가 일정 아님으로 분류
+    {'non_schedules': [{'message_id': '1', 'content': '합주 끝나고 드실 안주', 'reason': '안주이야기'}]},
+    # AI는 일정이라 했지만 확신도 검증에서 제외
+    {'schedules': [{'message_id': '1', 'content': '합주 끝나고 드실 안주', 'schedule_type': '합주', 'confidence': 0.5}]},
+])
+def test_cache_hit_matches_live_non_schedule_output(monkeypatch, tmp_path, response_item):
+    """캐시 적중도 AI 호출과 같은 non_schedules 항목을 현재 메시지 ID로 만든다 (동기화 삭제용)"""
+    response = {'schedules': [], 'non_schedules': [], **response_item}
+    content = '합주 끝나고 드실 안주'
+
+    live = make_classifier(monkeypatch, tmp_path, response)
+    asyncio.run(live.classify_messages([make_message(1, content)]))
+
+    # 수정/재게시된 같은 내용의 메시지 → 캐시 적중, API 호출 없음
+    cached = make_classifier(monkeypatch, tmp_path, response)
+    asyncio.run(cached.classify_messages([make_message(2, content)]))
+
+    assert live.api_calls == 1
+    assert cached.api_calls == 0
+    assert live.schedules == cached.schedules == []
+    assert [item['message_id'] for item in live.non_schedules] == ['1']
+    assert [item['message_id'] for item in cached.non_schedules] == ['2']
+    assert cached.non_schedules[0] == {**live.non_schedules[0], 'message_id': '2'}
+
+def test_cache_hit_matches_live_schedule_output(monkeypatch, tmp_path):
+    content = '내일 오후 3시 합주'
+    response = {
+        'schedules': [{'message_id': '1', 'content': content, 'schedule_type': '합주', 'confidence': 0.95,
+                       'extracted_info': {'when': '내일 오후 3시', 'what': '합주', 'where': ''}}],
+        'non_schedules': [],
+    }
+
+    live = make_classifier(monkeypatch, tmp_path, response)
+    asyncio.run(live.classify_messages([make_message(1, content)]))
+    cached = make_classifier(monkeypatch, tmp_path, response)
+    asyncio.run(cached.classify_messages([make_message(2, content)]))
+
+    assert cached.api_calls == 0
+    assert live.non_schedules == cached.non_schedules == []
+    assert cached.schedules == [{**live.schedules[0], 'message_id': '2'}]
+
+def test_results_merge_in_batch_order_while_streaming(monkeypatch, tmp_path):
+    """on_schedule는 도착 순서대로 받고, 최종 목록은 배치 순서 (늦게 끝난 첫 배치가 앞)"""
+    messages = [make_message(1, '내일 오후 3시 합주'), make_message(2, '토요일 오후 7시 리허설')]
+    classifier = make_classifier(monkeypatch, tmp_path, {})
+    monkeypatch.setenv('CLASSIFICATION_CACHE', 'false')
+
+    # 프롬프트 예산을 메시지 하나만 들어가게 → 배치 2개
+    entry_tokens = max(estimate_tokens(classifier.format_message_entry(0, msg)) for msg in messages)
+    monkeypatch.setenv('OPENAI_PROMPT_TOKEN_BUDGET', str(BatchPacker(classifier).header_tokens + entry_tokens))
+
+    async def request_completion(prompt):
+        message_id = re.search(r'ID: (\d+)', prompt).group(1)
+        msg = next(msg for msg in messages if str(msg['id']) == message_id)
+        if message_id == '1':
+            await asyncio.sleep(0.05)  # 첫 배치가 나중에 끝남
+        return json.dumps({'schedules': [{'message_id': message_id, 'content': msg['content'],
+                                          'schedule_type': '합주', 'confidence': 0.95}]}, ensure_ascii=False)
+
+    streamed = []
+    classifier.request_completion = request_completion
+    classifier.on_schedule = lambda schedule: streamed.append(schedule['message_id'])
+    asyncio.run(classifier.classify_messages(messages))
+
+    assert streamed == ['2', '1']
+    assert [schedule['message_id'] for schedule in classifier.schedules] == ['1', '2']
+
+def test_stream_commits_cache_and_merges_before_end(monkeypatch, tmp_path):
+    """끝나지 않는 스트림에서도 끝난 배치는 바로 합치고 캐시를 디스크에 반영한다"""
+    response = {'non_schedules': [{'message_id': '1', 'content': '합주 끝나고 드실 안주', 'reason': '잡담'}]}
+    classifier = make_classifier(monkeypatch, tmp_path, response)
+
+    async def run():
+        queue = asyncio.Queue()
+        stream = asyncio.create_task(classifier.classify_stream(queue, flush_seconds=0.01))
+        await queue.put(make_message(1, '합주 끝나고 드실 안주'))
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if classifier.non_schedules:
+                break
+
+        # 스트림이 아직 열려 있는 동안 다른 연결에서 캐시가 보여야 함
+        with sqlite3.connect(tmp_path / 'classification_cache.db') as connection:
+            stored = connection.execute('SELECT COUNT(*) FROM classifications').fetchone()[0]
+        merged = [item['message_id'] for item in classifier.non_schedules]
+
+        await queue.put(None)
+        await stream
+        return stored, merged
+
+    stored, merged = asyncio.run(run())
+
+    assert stored == 1
+    assert merged == ['1']
@@ -0,0 +1,14 @@
+# tests/test_batch_client.py
+import pytest
+
+pytest.importorskip('discord')
+
+from batch_client import BatchClient
+
+def test_run_batch_is_required_at_instantiation():
+    """run_batch를 구현하지 않은 수집기는 로그인 전에 생성 단계에서 실패한다"""
+    class IncompleteCollector(BatchClient):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteCollector()
@@ -0,0 +1,47 @@
+# tests/test_collection_engine.py
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('discord')
+
+from collection_checkpoint import CollectionCheckpoint
+from collection_engine import SchedulePrefilterConsumer
+from message_record import MessageRecord, ms_to_snowflake
+
+GUILD = SimpleNamespace(id=1, name='테스트 서버')
+CHANNEL = SimpleNamespace(id=10, name='general')
+
+def make_record(minutes_ago, content):
+    timestamp = int(time.time() * 1000) - minutes_ago * 60 * 1000
+    return MessageRecord.create(
+        ms_to_snowflake(timestamp), content, 'member1', '#general', CHANNEL.id, GUILD.name, GUILD.id, timestamp
+    )
+
+def test_schedule_consumer_resumes_from_checkpoint(tmp_path):
+    """운영 소비자는 커서 이후 메시지만 받고 보존 후보를 이어 붙인 뒤 커서를 갱신한다"""
+    old = make_record(120, '내일 3시 합주 어때요')
+    new = make_record(10, '모레 7시 정기 합주 일정 공지')
+
+    checkpoint = CollectionCheckpoint(path=str(tmp_path / 'checkpoint.json'))
+    checkpoint.update_channel(GUILD.id, CHANNEL.id, old.id, [{**old, 'filter_reason': '이전 실행'}])
+    consumer = SchedulePrefilterConsumer(days=60, checkpoint=checkpoint)
+
+    async def run():
+        await consumer.start_channel(GUILD, CHANNEL)
+        after, _ = consumer.channel_window(GUILD, CHANNEL)
+        records = [record for record in (old, new) if consumer.covers(record)]
+        await consumer.add_page(records)
+        await consumer.finish_channel(GUILD, CHANNEL, new.id, None)
+        await consumer.finish()
+        return after
+
+    after = asyncio.run(run())
+
+    assert after.id == old.id
+    assert consumer.received == 1
+    assert [msg['id'] for msg in consumer.candidates] == [old.id, new.id]
+    assert checkpoint.get_last_message_id(GUILD.id, CHANNEL.id) == new.id
+    assert (tmp_path / 'checkpoint.json').exists()
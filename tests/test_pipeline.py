@@ -0,0 +1,110 @@
+# tests/test_pipeline.py
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+pytest.importorskip('discord')
+
+import pipeline
+from pipeline import PIPELINE_END, StreamingContextGrouper, calendar_stage
+
+KST = pytz.timezone('Asia/Seoul')
+START = datetime(2025, 7, 1, 12, 0, tzinfo=KST)
+
+def make_message(message_id, author, minutes):
+    return {
+        'id': message_id,
+        'content': '내일 3시 합주',
+        'author': author,
+        'channel': '#general',
+        'created_at': START + timedelta(minutes=minutes),
+    }
+
+def test_groups_stream_before_later_channels_start():
+    """아직 시작 안 한 채널이 있어도 수집 중인 채널의 워터마크까지 그룹을 내보낸다"""
+    async def run():
+        queue = asyncio.Queue()
+        grouper = StreamingContextGrouper(queue, window_seconds=300)
+
+        await grouper.register_channel('a', START)
+        await grouper.register_channel('b', START)
+        await grouper.add('a', [make_message(1, 'member1', 0)], START + timedelta(minutes=30))
+        await grouper.add('b', [make_message(2, 'member1', 2)], START + timedelta(minutes=30))
+        return queue.qsize()
+
+    assert asyncio.run(run()) == 1
+
+def test_producer_waits_when_pending_is_full():
+    """대기 메시지가 한도를 넘으면 앞서간 채널은 워터마크 채널이 따라올 때까지 기다린다"""
+    async def run():
+        queue = asyncio.Queue()
+        grouper = StreamingContextGrouper(queue, window_seconds=300, max_pending=2)
+
+        await grouper.register_channel('slow', START)
+        await grouper.register_channel('fast', START)
+        fast = asyncio.create_task(grouper.add(
+            'fast',
+            [make_message(i, f'member{i}', 60 + i) for i in range(3)],
+            START + timedelta(minutes=70),
+        ))
+        await asyncio.sleep(0)
+        blocked = not fast.done()
+
+        await grouper.add('slow', [], START + timedelta(minutes=90))
+        await asyncio.wait_for(fast, timeout=1)
+        return blocked, len(grouper.pending)
+
+    blocked, pending = asyncio.run(run())
+
+    assert blocked
+    assert pending == 0
+
+class FailingCalendarManager:
+    """첫 묶음에서 요청 목록 만들기가 실패하는 캘린더 관리자"""
+
+    def __init__(self):
+        self.batch_size = 1
+        self.sync_mode = False
+        self.counts = {'added': 0, 'failed': 0}
+        self.totals = []
+        self.closed = False
+
+    def plan_schedules(self, schedules, start_index=1, total=None):
+        self.totals.append(total)
+        if start_index == 1:
+            raise RuntimeError('조회 실패')
+        return [('added', schedule, None) for schedule in schedules]
+
+    async def run_operations_async(self, operations):
+        self.counts['added'] += len(operations)
+
+    def count(self, kind):
+        self.counts[kind] += 1
+
+    def close(self):
+        self.closed = True
+
+    def print_summary(self):
+        pass
+
+def test_calendar_stage_keeps_draining_after_chunk_error(monkeypatch):
+    """한 묶음이 실패해도 남은 일정을 계속 처리하고 관리자를 닫는다"""
+    manager = FailingCalendarManager()
+    monkeypatch.setattr(pipeline, 'CALENDAR_AVAILABLE', True)
+    monkeypatch.setattr(pipeline, 'CalendarManager', lambda: manager, raising=False)
+
+    async def run():
+        queue = asyncio.Queue()
+        for item in ({'message_id': 1}, {'message_id': 2}, PIPELINE_END):
+            queue.put_nowait(item)
+        counts = await calendar_stage(queue, classifier=None)
+        return counts, queue.qsize()
+
+    counts, remaining = asyncio.run(run())
+
+    assert counts == {'added': 1, 'failed': 1}
+    assert remaining == 0
+    assert manager.closed
+    assert manager.totals == [None, None]
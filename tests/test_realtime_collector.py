@@ -0,0 +1,41 @@
+# tests/test_realtime_collector.py
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip('discord')
+
+from realtime_collector import RealtimeContextGrouper
+
+START = datetime.now(timezone.utc) - timedelta(hours=1)
+
+def make_message(message_id, content, minutes):
+    return {
+        'id': message_id,
+        'content': content,
+        'author': 'member1',
+        'channel': '#general',
+        'created_at': START + timedelta(minutes=minutes),
+    }
+
+def test_edit_of_sent_message_resends_whole_group_with_same_id():
+    """이미 보낸 그룹의 메시지가 수정되면 그룹 전체를 같은 ID로 다시 보낸다"""
+    async def run():
+        queue = asyncio.Queue()
+        grouper = RealtimeContextGrouper(queue, window_seconds=300, idle_seconds=0)
+
+        await grouper.add(make_message(1, '내일 합주 있어요', 0))
+        await grouper.add(make_message(2, '3시에 모여요', 1))
+        await grouper.tick()
+        first = queue.get_nowait()
+
+        edited = make_message(2, '7시에 모여요', 1)
+        await grouper.resend(grouper.find_sent(2), edited)
+        return first, queue.get_nowait()
+
+    first, resent = asyncio.run(run())
+
+    assert resent['id'] == first['id'] == 'context_1'
+    assert resent['message_count'] == 2
+    assert resent['content'] == '내일 합주 있어요 7시에 모여요'
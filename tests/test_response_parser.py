@@ -0,0 +1,36 @@
+# tests/test_response_parser.py
+from response_parser import StreamingResponseParser
+
+RESPONSE = (
+    '설명: 형식은 {schedules, non_schedules} 이고 "따옴표"도 있습니다.\n'
+    '```json\n'
+    '{"schedules": [{"message_id": "1", "content": "내일 {합주} 3시"}],\n'
+    ' "non_schedules": [{"message_id": "2", "reason": "단순대답"}]}\n'
+    '```\n'
+    '추가 설명 {끝}'
+)
+
+def collect(parser, chunks):
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    return items
+
+def test_prose_braces_before_payload_are_ignored():
+    """본문 앞 설명 문장의 {...}를 최상위 객체로 착각하지 않음"""
+    parser = StreamingResponseParser()
+
+    items = collect(parser, [RESPONSE])
+
+    assert items == [
+        ('schedules', {'message_id': '1', 'content': '내일 {합주} 3시'}),
+        ('non_schedules', {'message_id': '2', 'reason': '단순대답'}),
+    ]
+    assert parser.finished
+    assert parser.errors == 0
+
+def test_payload_start_split_across_chunks():
+    """'{"sche' 처럼 본문 시작이 조각 경계에서 끊겨도 같은 결과"""
+    whole = collect(StreamingResponseParser(), [RESPONSE])
+
+    assert collect(StreamingResponseParser(), list(RESPONSE)) == whole
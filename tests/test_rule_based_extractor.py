@@ -0,0 +1,42 @@
+# tests/test_rule_based_extractor.py
+from datetime import datetime
+
+import pytest
+import pytz
+
+from rule_based_extractor import RuleBasedExtractor
+
+KST = pytz.timezone('Asia/Seoul')
+
+def extract(content):
+    msg = {
+        'id': 1,
+        'content': content,
+        'author': 'member1',
+        'channel': '#general',
+        'created_at': KST.localize(datetime(2025, 7, 1, 12, 0)),
+    }
+    return RuleBasedExtractor().extract(msg)
+
+@pytest.mark.parametrize('content', [
+    '오늘 3시 합주',
+    '내일 2시 리허설입니다',
+    '토요일 4시 공연',
+    '오늘 11시 연습',
+])
+def test_ambiguous_hour_without_marker_goes_to_ai(content):
+    """오전/오후 표시 없는 1-5시, 11시는 규칙으로 확정하지 않는다"""
+    assert extract(content) is None
+
+@pytest.mark.parametrize('content, when', [
+    ('오늘 오후 3시 합주', '오늘 15시 0분'),
+    ('내일 밤 11시 연습', '내일 23시 0분'),
+    ('내일 아침 7시 합주', '내일 7시 0분'),
+    ('내일 7시 합주', '내일 19시 0분'),
+])
+def test_marked_or_evening_hour_is_extracted(content, when):
+    """표시가 있거나 6-10시(저녁 합주 시간대)면 규칙으로 확정한다"""
+    schedule = extract(content)
+
+    assert schedule is not None
+    assert schedule['extracted_info']['when'] == when